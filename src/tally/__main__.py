@@ -1,4 +1,11 @@
+import multiprocessing
+import sys
+
 if __name__ == "__main__":
-    from tally.cli import app
+    # Score workers of a frozen executable run this entry point again, and
+    # must run their task instead of the command line tool
+    multiprocessing.freeze_support()
+
+    from tally.main import main
 
-    app()
+    sys.exit(main())
@@ -6,7 +6,7 @@ from tally.models.db import Activity, Config
 from tally.utils.activity import get_activity_link, get_activity_active_seconds
 from tally.utils.file import prompt_save_file
 from tally.utils.date import format_duration, get_file_timestamp, get_local_date
-from tally.utils.user import get_user_link
+from tally.utils.user import get_user_link, get_user_time_zone
 
 
 def save_activities(activities: List[Activity], config: Config):
@@ -38,7 +38,7 @@ def save_activities(activities: List[Activity], config: Config):
                     activity.workout_type,
                     get_local_date(
                         datetime.datetime.fromisoformat(activity.start_time),
-                        config.time_zone,
+                        get_user_time_zone(activity.user, config.time_zone),
                     ).strftime("%Y-%m-%d"),
                     format_duration(get_activity_active_seconds(activity)),
                 ]
@@ -1,12 +1,54 @@
+from typing import List, Tuple, Type
 import logging
+from playhouse.migrate import SqliteMigrator, migrate
 
 from tally.services.db import db
-from tally.models.db import ALL_MODELS
+from tally.models.db import ALL_MODELS, Activity, Config, TrackCheckpoint, User
+from tally.models.db.base import BaseModel
+from tally.actions.recompute.recalculate import recalculate_activity_active_seconds
 
 
 logger = logging.getLogger(__name__)
 
 
+# Columns that were added to tables after their first release
+ADDED_COLUMNS = [
+    (Activity, "active_seconds"),
+    (Config, "requests_per_minute"),
+    (Config, "strava_fetch_mode"),
+    (TrackCheckpoint, "cursor"),
+    (TrackCheckpoint, "run_updated_at"),
+    (User, "time_zone"),
+]
+
+
+def add_missing_columns() -> List[Tuple[Type[BaseModel], str]]:
+    """
+    Add columns that were introduced after the tables of an existing database
+    were created.
+
+    :return: The entries of ADDED_COLUMNS whose columns were added.
+    """
+    migrator = SqliteMigrator(db)
+    added_columns = []
+    for model, field_name in ADDED_COLUMNS:
+        table_name = model._meta.table_name
+        if not db.table_exists(table_name):
+            continue
+        column_names = {column.name for column in db.get_columns(table_name)}
+        field = model._meta.fields[field_name]
+        if field.column_name in column_names:
+            continue
+
+        logger.debug(f"Adding the {field.column_name} column to {table_name}")
+        migrate(migrator.add_column(table_name, field.column_name, field))
+        added_columns.append((model, field_name))
+    return added_columns
+
+
 def create_tables():
     logger.debug("Creating tables if they do not exist: %s", ALL_MODELS)
+    added_columns = add_missing_columns()
     db.create_tables(ALL_MODELS, safe=True)
+    if (Activity, "active_seconds") in added_columns:
+        recalculate_activity_active_seconds()
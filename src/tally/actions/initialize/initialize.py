@@ -1,10 +1,10 @@
-from typing import List
+from typing import Dict, List
 import logging
 import questionary
 from pytz import common_timezones
 import traceback
 
-from tally.utils.date import prompt_date
+from tally.utils.prompt import prompt_date
 from tally.actions.initialize.user_list import (
     parse_user_list,
     UserRow,
@@ -12,6 +12,21 @@ from tally.actions.initialize.user_list import (
 from tally.actions.initialize.create_tables import create_tables
 from tally.models.db import Config, User, Team
 from tally.services.db import backup_db
+from tally.services.strava import StravaFetchMode
+from tally.actions.score.point_schedule import (
+    DEFAULT_POINT_SCHEDULE,
+    PointScheduleRules,
+    get_point_schedule,
+    parse_point_schedule,
+    save_point_schedule,
+)
+from tally.actions.score.materialized_score import (
+    is_daily_score_materialized,
+    rebuild_daily_scores,
+    update_team_rosters,
+)
+from tally.actions.score.score_cache import bump_data_version
+from tally.actions.track.checkpoint import reset_track_checkpoints
 from tally.utils.file import prompt_select_file, FileType
 
 
@@ -48,6 +63,7 @@ def create_users(user_list: List[UserRow]) -> List[str]:
             id=user_id,
             name=user_row.user_name,
             team=user_row.team_id,
+            time_zone=user_row.time_zone or None,
         )
         User.replace(**user.__data__).execute()
 
@@ -56,6 +72,47 @@ def create_users(user_list: List[UserRow]) -> List[str]:
     return list(user_ids)
 
 
+def get_changed_team_ids(
+    user_list: List[UserRow], previous_user_team_ids: dict[str, str]
+) -> List[str]:
+    """
+    Teams that gained or lost a member compared with the previous user teams.
+    """
+    changed_team_ids = set()
+    for user_row in user_list:
+        previous_team_id = previous_user_team_ids.get(user_row.get_user_id())
+        if previous_team_id == user_row.team_id:
+            continue
+
+        changed_team_ids.add(user_row.team_id)
+        if previous_team_id:
+            changed_team_ids.add(previous_team_id)
+    return list(changed_team_ids)
+
+
+def is_time_zone_changed(
+    user_list: List[UserRow], previous_user_time_zones: dict[str, str | None]
+) -> bool:
+    return any(
+        (user_row.time_zone or None)
+        != previous_user_time_zones.get(user_row.get_user_id())
+        for user_row in user_list
+    )
+
+
+STRAVA_FETCH_MODE_TITLES: Dict[StravaFetchMode, str] = {
+    "http": "Direct HTTP requests with the browser session (fastest)",
+    "script": "Batched requests from inside the browser",
+    "browser": "Load each page in the browser (slowest, most compatible)",
+}
+
+
+def requests_per_minute_validator(requests_per_minute: str) -> str | bool:
+    if not requests_per_minute.isdigit() or int(requests_per_minute) < 1:
+        return "Requests per minute must be a whole number greater than 0"
+    return True
+
+
 def prompt_config(existing_config: Config | None) -> Config | None:
     challenge_name = questionary.text(
         "Enter a name for the challenge",
@@ -72,20 +129,85 @@ def prompt_config(existing_config: Config | None) -> Config | None:
         return None
 
     time_zone = questionary.select(
-        "Select a time zone. Daily scores will be calculated based on this time zone.",
+        "Select a time zone. Daily scores will be calculated based on this time zone, "
+        "unless a user has a time zone in the user list.",
         choices=common_timezones,
         default=existing_config.time_zone if existing_config else "America/Los_Angeles",
     ).ask()
     if not time_zone:
         return None
 
+    requests_per_minute = questionary.text(
+        "Enter the maximum number of Strava requests per minute when tracking "
+        "activities",
+        validate=requests_per_minute_validator,
+        default=str(
+            existing_config.requests_per_minute
+            if existing_config
+            else Config.requests_per_minute.default
+        ),
+    ).ask()
+    if not requests_per_minute:
+        return None
+
+    strava_fetch_mode = questionary.select(
+        "Select how Strava club feeds are fetched after logging in",
+        choices=[
+            questionary.Choice(title, value)
+            for value, title in STRAVA_FETCH_MODE_TITLES.items()
+        ],
+        default=(
+            existing_config.strava_fetch_mode
+            if existing_config
+            else Config.strava_fetch_mode.default
+        ),
+    ).ask()
+    if not strava_fetch_mode:
+        return None
+
     return Config(
         challenge_name=challenge_name,
         start_date=start_date,
         time_zone=time_zone,
+        requests_per_minute=int(requests_per_minute),
+        strava_fetch_mode=strava_fetch_mode,
     )
 
 
+class PointScheduleChoice:
+    keep = "Keep the current point schedule"
+    default = "Use the default point schedule"
+    file = "Load a point schedule from a JSON file"
+
+
+def prompt_point_schedule() -> PointScheduleRules | None:
+    choice = questionary.select(
+        "Select the point schedule for the challenge",
+        choices=[
+            PointScheduleChoice.keep,
+            PointScheduleChoice.default,
+            PointScheduleChoice.file,
+        ],
+    ).ask()
+    if choice == PointScheduleChoice.keep:
+        return get_point_schedule().rules
+    if choice == PointScheduleChoice.default:
+        return DEFAULT_POINT_SCHEDULE.rules
+    if choice != PointScheduleChoice.file:
+        return None
+
+    print("Use the pop-up file explorer to select the point schedule")
+    point_schedule_path = prompt_select_file("point schedule", [FileType.json])
+    if not point_schedule_path:
+        return None
+
+    try:
+        return parse_point_schedule(point_schedule_path)
+    except Exception:
+        logger.error(f"Failed to read point schedule:\n{traceback.format_exc()}")
+        return None
+
+
 def initialize():
     create_tables()
 
@@ -99,7 +221,18 @@ def initialize():
     # latest one
     Config.delete().execute()
     config.save()
+    bump_data_version()
     logger.debug(f"Created {config}")
+    # Activities before the previous start date were never fetched
+    if existing_config and existing_config.start_date != config.start_date:
+        reset_track_checkpoints()
+
+    point_schedule_rules = prompt_point_schedule()
+    if not point_schedule_rules:
+        print("Point schedule is incomplete, cancelling operation")
+        return
+    if save_point_schedule(point_schedule_rules):
+        logger.debug(f"Saved point schedule {point_schedule_rules}")
 
     print("Use the pop-up file explorer to select the user list for the challenge")
     user_list_path = prompt_select_file("user table", [FileType.csv])
@@ -113,9 +246,25 @@ def initialize():
         logger.error(f"Failed to read user table:\n{traceback.format_exc()}")
         return
 
+    previous_user_team_ids = dict(User.select(User.id, User.team).tuples())
+    previous_user_time_zones = dict(User.select(User.id, User.time_zone).tuples())
     team_ids = create_teams(user_list)
     user_ids = create_users(user_list)
+    bump_data_version()
 
     print(f"Created {len(team_ids)} team(s) and {len(user_ids)} user(s)")
 
+    # New members may have activities before the checkpoint of their team
+    changed_team_ids = get_changed_team_ids(user_list, previous_user_team_ids)
+    reset_track_checkpoints(changed_team_ids)
+
+    # A new time zone moves the activities of a user to different days, which
+    # the roster update does not handle
+    if is_daily_score_materialized(config) and not is_time_zone_changed(
+        user_list, previous_user_time_zones
+    ):
+        update_team_rosters(changed_team_ids, config)
+    else:
+        rebuild_daily_scores(config)
+
     backup_db()
@@ -1,5 +1,6 @@
 from typing import List
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
+from pytz import all_timezones_set
 import csv
 import logging
 import traceback
@@ -12,6 +13,16 @@ class UserRow(BaseModel):
     team_name: str
     user_name: str
     user_link: str
+    # Optional, users without a time zone use the time zone of the challenge
+    time_zone: str = ""
+
+    @field_validator("time_zone")
+    @classmethod
+    def validate_time_zone(cls, time_zone: str) -> str:
+        time_zone = time_zone.strip()
+        if time_zone and time_zone not in all_timezones_set:
+            raise ValueError(f"Unknown time zone {time_zone}")
+        return time_zone
 
     def get_user_id(self) -> str:
         return self.user_link.split("/")[-1]
@@ -6,7 +6,11 @@ from tally.services.db import backup_db
 from tally.utils.file import prompt_select_file, FileType
 from tally.actions.load.activity_list import parse_activity_list, ActivityRow
 from tally.models.db import Activity, Config
-from tally.utils.date import get_start_of_day
+from tally.utils.date import get_start_of_day, get_local_date
+from tally.utils.activity import calculate_activity_active_seconds
+from tally.utils.user import get_user_time_zones
+from tally.actions.score.materialized_score import update_daily_scores
+from tally.actions.score.score_cache import bump_data_version
 
 
 logger = logging.getLogger(__name__)
@@ -14,24 +18,52 @@ logger = logging.getLogger(__name__)
 
 def create_activities(activity_list: List[ActivityRow], config: Config) -> List[str]:
     activity_ids = set()
+    # Replacing an activity can move it to a different user or day, so both the
+    # previous and the new user day need their daily scores updated
+    changed_user_dates = set()
+    user_time_zones = get_user_time_zones()
     for activity_row in activity_list:
+        existing_activity: Activity | None = Activity.get_or_none(
+            Activity.id == activity_row.get_activity_id()
+        )
+        if existing_activity:
+            changed_user_dates.add(
+                (
+                    existing_activity.user_id,
+                    get_local_date(
+                        datetime.datetime.fromisoformat(existing_activity.start_time),
+                        user_time_zones.get(
+                            existing_activity.user_id, config.time_zone
+                        ),
+                    ),
+                )
+            )
+
         active_seconds = activity_row.get_active_seconds()
+        activity_date = datetime.datetime.strptime(activity_row.date, "%Y-%m-%d").date()
         activity = Activity(
             id=activity_row.get_activity_id(),
             user=activity_row.get_user_id(),
+            # The date is in the time zone of the user
             start_time=get_start_of_day(
-                datetime.datetime.strptime(activity_row.date, "%Y-%m-%d").date(),
-                config.time_zone,
+                activity_date,
+                user_time_zones.get(activity_row.get_user_id(), config.time_zone),
             ),
             elapsed_seconds=active_seconds,
             moving_seconds=active_seconds,
             title=activity_row.title,
             workout_type=activity_row.workout_type,
         )
+        activity.active_seconds = calculate_activity_active_seconds(activity)
         Activity.replace(**activity.__data__).execute()
 
         print(f"Created {activity}")
         activity_ids.add(activity_row.get_activity_id())
+        changed_user_dates.add((activity_row.get_user_id(), activity_date))
+
+    update_daily_scores(changed_user_dates, config)
+    if activity_ids:
+        bump_data_version()
 
     return list(activity_ids)
 
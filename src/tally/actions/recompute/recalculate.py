@@ -0,0 +1,34 @@
+import logging
+
+from tally.models.db import Activity, DailyScoreState
+from tally.actions.score.score_cache import bump_data_version
+from tally.utils.activity import calculate_activity_active_seconds_expression
+
+
+logger = logging.getLogger(__name__)
+
+
+def recalculate_activity_active_seconds() -> int:
+    """
+    Recalculate the stored active seconds of every activity in one statement,
+    for when the rules in calculate_activity_active_seconds change. The
+    materialized daily scores are marked as out of date so they are rebuilt.
+
+    :return: The number of activities whose active seconds changed.
+    """
+    active_seconds = calculate_activity_active_seconds_expression()
+    with Activity._meta.database.atomic():
+        changed_count = (
+            Activity.update(active_seconds=active_seconds)
+            .where(
+                Activity.active_seconds.is_null()
+                | (Activity.active_seconds != active_seconds)
+            )
+            .execute()
+        )
+        if changed_count:
+            DailyScoreState.delete().execute()
+            bump_data_version()
+
+    logger.debug(f"Recalculated active seconds of {changed_count} activities")
+    return changed_count
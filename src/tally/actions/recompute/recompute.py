@@ -0,0 +1,16 @@
+import questionary
+
+from tally.actions.recompute.recalculate import recalculate_activity_active_seconds
+
+
+def recompute():
+    is_confirm_recompute = questionary.confirm(
+        "Recalculate the active time of every activity? This is only needed after "
+        "the activity types that count moving time have changed."
+    ).ask()
+    if not is_confirm_recompute:
+        print("Operation cancelled")
+        return
+
+    changed_count = recalculate_activity_active_seconds()
+    print(f"Updated the active time of {changed_count} activities")
@@ -15,6 +15,8 @@ def reset():
 
     backup_db()
 
+    # The data version and the score cache are dropped with the other tables,
+    # so no cached score survives a reset
     db.drop_tables(ALL_MODELS)
 
     print("All data deleted")
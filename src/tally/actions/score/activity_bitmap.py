@@ -0,0 +1,80 @@
+from typing import Iterable
+import numpy as np
+
+
+BITMAP_WORD_BITS = 64
+
+
+def get_active_day_bitmap(active_days: Iterable[int]) -> int:
+    """
+    Build a bitmap where bit i is set if the user is active on day i.
+    """
+    bitmap = 0
+    for day in active_days:
+        bitmap |= 1 << day
+    return bitmap
+
+
+def is_active_on_day(bitmap: int, day: int) -> bool:
+    return day >= 0 and (bitmap >> day) & 1 == 1
+
+
+def get_streak_length(bitmap: int, day: int) -> int:
+    """
+    Number of consecutive active days up to and including the given day, found
+    from the highest inactive day at or before it rather than by walking back
+    one day at a time.
+    """
+    if not is_active_on_day(bitmap, day):
+        return 0
+
+    day_mask = (1 << (day + 1)) - 1
+    inactive_days = ~bitmap & day_mask
+    if not inactive_days:
+        return day + 1
+    return day - (inactive_days.bit_length() - 1)
+
+
+def pack_active_days(is_active: np.ndarray) -> np.ndarray:
+    """
+    Pack a boolean row by day array into one bitmap per row made of 64 bit
+    words, so that each word holds 64 days.
+    """
+    row_count, day_count = is_active.shape
+    word_count = -(-day_count // BITMAP_WORD_BITS)
+    padded = np.zeros((row_count, word_count * BITMAP_WORD_BITS), dtype=bool)
+    padded[:, :day_count] = is_active
+    return np.packbits(padded, axis=1).view(np.uint64)
+
+
+def unpack_active_days(bitmaps: np.ndarray, day_count: int) -> np.ndarray:
+    """
+    Inverse of pack_active_days.
+    """
+    return np.unpackbits(bitmaps.view(np.uint8), axis=1)[:, :day_count].astype(bool)
+
+
+def get_all_active_days(
+    is_active: np.ndarray, group_index: np.ndarray, group_count: int
+) -> np.ndarray:
+    """
+    Days on which every row of a group is active, computed as a bitwise AND of
+    the packed bitmaps of the rows in each group. Every group must have at least
+    one row.
+
+    :param is_active: Boolean row by day array.
+    :param group_index: Group of each row.
+    :param group_count: Number of groups.
+
+    :return: Boolean group by day array.
+    """
+    day_count = is_active.shape[1]
+    if group_count == 0:
+        return np.zeros((0, day_count), dtype=bool)
+
+    row_order = np.argsort(group_index, kind="stable")
+    group_starts = np.searchsorted(group_index[row_order], np.arange(group_count))
+    group_bitmaps = np.bitwise_and.reduceat(
+        pack_active_days(is_active[row_order]), group_starts, axis=0
+    )
+    return unpack_active_days(group_bitmaps, day_count)
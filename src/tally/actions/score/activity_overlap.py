@@ -0,0 +1,176 @@
+from typing import Dict, Iterable, Iterator, List, Tuple
+import datetime
+from peewee import Case, ColumnBase, Select, Window, fn
+
+from tally.models.db import Activity
+from tally.utils.activity import (
+    get_activity_active_seconds,
+    get_activity_active_seconds_expression,
+    get_activity_start_timestamp_expression,
+)
+
+
+# (user_id, activity_id, start_timestamp, elapsed_seconds, active_seconds)
+ActivityInterval = Tuple[str, str, int, int, int]
+
+
+class ActivityOverlap:
+    __slots__ = ("user_id", "activity_id", "overlapping_activity_id", "overlap_seconds")
+
+    def __init__(
+        self,
+        user_id: str,
+        activity_id: str,
+        overlapping_activity_id: str,
+        overlap_seconds: int,
+    ):
+        self.user_id = user_id
+        self.activity_id = activity_id
+        self.overlapping_activity_id = overlapping_activity_id
+        self.overlap_seconds = overlap_seconds
+
+    def __str__(self):
+        return (
+            f"ActivityOverlap("
+            f"user={self.user_id}, "
+            f"activity={self.activity_id}, "
+            f"overlapping_activity={self.overlapping_activity_id}, "
+            f"overlap_seconds={self.overlap_seconds})"
+        )
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def get_activity_interval(activity: Activity) -> ActivityInterval:
+    return (
+        activity.user_id,
+        activity.id,
+        int(datetime.datetime.fromisoformat(activity.start_time).timestamp()),
+        activity.elapsed_seconds,
+        get_activity_active_seconds(activity),
+    )
+
+
+def sweep_activity_intervals(
+    intervals: Iterable[ActivityInterval],
+) -> Iterator[Tuple[ActivityInterval, int, str | None, int]]:
+    """
+    Merge the [start, start + elapsed_seconds) intervals of each user in a
+    single pass, comparing each activity only with the furthest end of the
+    earlier activities of the same user.
+
+    :param intervals: Activity intervals ordered by user ID, start timestamp
+        and activity ID.
+
+    :return: For each interval, its active seconds clipped to the time not
+        already covered by earlier activities, the ID of the earlier activity
+        reaching furthest into it or None if it does not overlap, and the number
+        of overlapping seconds.
+    """
+    previous_user_id: str | None = None
+    covered_until: int | None = None
+    covering_activity_id: str | None = None
+
+    for interval in intervals:
+        user_id, activity_id, start_timestamp, elapsed_seconds, active_seconds = (
+            interval
+        )
+        end_timestamp = start_timestamp + elapsed_seconds
+        if user_id != previous_user_id:
+            previous_user_id = user_id
+            covered_until = None
+            covering_activity_id = None
+
+        if covered_until is not None and covered_until > start_timestamp:
+            overlap_seconds = min(end_timestamp, covered_until) - start_timestamp
+            clipped_seconds = max(min(active_seconds, end_timestamp - covered_until), 0)
+            yield interval, clipped_seconds, covering_activity_id, overlap_seconds
+        else:
+            yield interval, active_seconds, None, 0
+
+        if covered_until is None or end_timestamp > covered_until:
+            covered_until = end_timestamp
+            covering_activity_id = activity_id
+
+
+def get_clipped_active_seconds(activities: Iterable[Activity]) -> Dict[str, int]:
+    """
+    Active seconds of each activity with the time already covered by earlier
+    activities of the same user removed, by activity ID.
+    """
+    intervals = sorted(
+        (get_activity_interval(activity) for activity in activities),
+        key=lambda x: (x[0], x[2], x[1]),
+    )
+    return {
+        interval[1]: clipped_seconds
+        for interval, clipped_seconds, _, _ in sweep_activity_intervals(intervals)
+    }
+
+
+def query_activity_intervals() -> Select:
+    """
+    Activity intervals of every activity, ordered for sweep_activity_intervals.
+    """
+    start_timestamp = get_activity_start_timestamp_expression()
+    return (
+        Activity.select(
+            Activity.user,
+            Activity.id,
+            start_timestamp,
+            Activity.elapsed_seconds,
+            get_activity_active_seconds_expression(),
+        )
+        .order_by(Activity.user, start_timestamp, Activity.id)
+        .tuples()
+    )
+
+
+def get_activity_overlaps() -> List[ActivityOverlap]:
+    """
+    Every activity that starts before an earlier activity of the same user has
+    ended, such as the same workout recorded on two devices.
+    """
+    return [
+        ActivityOverlap(
+            interval[0], interval[1], overlapping_activity_id, overlap_seconds
+        )
+        for interval, _, overlapping_activity_id, overlap_seconds in (
+            sweep_activity_intervals(query_activity_intervals().iterator())
+        )
+        if overlapping_activity_id
+    ]
+
+
+def get_clipped_active_seconds_expression(
+    start_timestamp: ColumnBase, active_seconds: ColumnBase
+) -> ColumnBase:
+    """
+    SQL equivalent of sweep_activity_intervals for the clipped active seconds of
+    each activity. The furthest end of the earlier activities of the user is a
+    running maximum over a window ordered by start time, so SQLite sorts the
+    activities once instead of comparing them in pairs.
+    """
+    covered_until = fn.MAX(start_timestamp + Activity.elapsed_seconds).over(
+        partition_by=[Activity.user],
+        order_by=[start_timestamp, Activity.id],
+        start=Window.preceding(),
+        end=Window.preceding(1),
+    )
+    return Case(
+        None,
+        [
+            (
+                covered_until > start_timestamp,
+                fn.MAX(
+                    fn.MIN(
+                        active_seconds,
+                        start_timestamp + Activity.elapsed_seconds - covered_until,
+                    ),
+                    0,
+                ),
+            )
+        ],
+        active_seconds,
+    )
@@ -0,0 +1,94 @@
+from typing import List, Literal
+from contextlib import redirect_stdout
+import datetime
+import sys
+
+from tally.models.db import Config, Team, User
+from tally.actions.score.score_config import ScoreConfig
+from tally.actions.score.point_schedule import get_point_schedule
+from tally.actions.score.period_score import get_period_team_cumulative_score
+from tally.actions.score.write_score import (
+    write_team_cumulative_score_csv,
+    write_team_cumulative_score_json,
+)
+from tally.utils.date import get_local_date
+
+
+ScoreOutputFormat = Literal["csv", "json"]
+
+
+def get_default_score_end_date(config: Config) -> datetime.date:
+    """
+    Yesterday in the time zone of the challenge, since the scores of today may
+    be incomplete.
+    """
+    today = get_local_date(
+        datetime.datetime.now(datetime.timezone.utc), config.time_zone
+    )
+    return today - datetime.timedelta(days=1)
+
+
+def score_headless(
+    start_date: datetime.date | None = None,
+    end_date: datetime.date | None = None,
+    output_path: str | None = None,
+    output_format: ScoreOutputFormat = "csv",
+) -> bool:
+    """
+    Calculate the team scores of a period without prompts or file dialogs, for
+    scheduled runs.
+
+    :param start_date: First date of the score period, by default the start of
+        the challenge.
+    :param end_date: Last date of the score period, by default yesterday.
+    :param output_path: File to write the team scores to, or None to write them
+        to stdout.
+    :param output_format: Format of the team scores.
+
+    :return: Whether the scores were written.
+    """
+    config: Config | None = Config.select().first()
+    if not config:
+        print(
+            "No active challenge found. Start a new challenge first.", file=sys.stderr
+        )
+        return False
+
+    score_config = ScoreConfig(
+        start_date or config.start_date,
+        end_date or get_default_score_end_date(config),
+        config.time_zone,
+        get_point_schedule(),
+    )
+    if score_config.score_end_date < score_config.score_start_date:
+        print(
+            f"The end date {score_config.score_end_date} is before the start date "
+            f"{score_config.score_start_date}",
+            file=sys.stderr,
+        )
+        return False
+
+    users: List[User] = list(User.select(User, Team).join(Team))
+    # Progress messages go to stderr, so the scores can be written to stdout
+    with redirect_stdout(sys.stderr):
+        team_cumulative_scores = get_period_team_cumulative_score(
+            users, config, score_config
+        )
+
+    file = (
+        open(output_path, "w", encoding="utf-8", newline="")
+        if output_path
+        else sys.stdout
+    )
+    try:
+        if output_format == "json":
+            write_team_cumulative_score_json(team_cumulative_scores, score_config, file)
+        else:
+            write_team_cumulative_score_csv(team_cumulative_scores, file)
+    finally:
+        if output_path:
+            file.close()
+
+    if output_path:
+        print(f"Successfully saved team scores to {output_path}")
+    return True
@@ -0,0 +1,40 @@
+from typing import Dict, Iterable, List
+
+
+class IdRegistry:
+    """
+    Interns string IDs, such as Strava user or team IDs, as dense integers
+    numbered from 0 in order of first appearance. The integers can be used as
+    array indices or as small dictionary keys in place of the IDs.
+    """
+
+    __slots__ = ("ids", "index_map")
+
+    def __init__(self, ids: Iterable[str] = ()):
+        self.ids: List[str] = []
+        self.index_map: Dict[str, int] = {}
+        for id in ids:
+            self.add(id)
+
+    def add(self, id: str) -> int:
+        index = self.index_map.get(id)
+        if index is None:
+            index = len(self.ids)
+            self.index_map[id] = index
+            self.ids.append(id)
+        return index
+
+    def get_index(self, id: str) -> int:
+        """
+        Index of an ID, or -1 if it has not been added.
+        """
+        return self.index_map.get(id, -1)
+
+    def get_id(self, index: int) -> str:
+        return self.ids[index]
+
+    def __contains__(self, id: str) -> bool:
+        return id in self.index_map
+
+    def __len__(self) -> int:
+        return len(self.ids)
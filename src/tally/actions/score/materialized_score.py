@@ -0,0 +1,411 @@
+from typing import Dict, Iterable, List, Set, Tuple
+import datetime
+import logging
+import numpy as np
+from peewee import Case, chunked, fn
+
+from tally.models.db import (
+    Activity,
+    Config,
+    DailyScoreState,
+    Team,
+    TeamDayScore,
+    User,
+    UserDayScore,
+)
+from tally.actions.score.score_config import ScoreConfig
+from tally.actions.score.team_score import TeamCumulativeScore
+from tally.actions.score.user_active_time import query_user_day_active_seconds
+from tally.actions.score.vectorized_score import (
+    ScoreMatrix,
+    get_streak_matrix,
+    get_team_bonus_points_matrix,
+    get_team_matrix,
+    get_user_points_matrix_from_streaks,
+)
+from tally.actions.score.point_schedule import PointSchedule, get_point_schedule
+from tally.actions.score.point_system import (
+    calculate_user_points,
+    calculate_user_bonus_points,
+    calculate_team_bonus_points,
+)
+from tally.utils.activity import get_activity_start_timestamp_expression
+from tally.utils.date import get_local_date
+from tally.utils.user import get_time_zones
+
+
+logger = logging.getLogger(__name__)
+
+
+# Keeps the number of SQL variables per statement below the SQLite limit
+QUERY_BATCH_SIZE = 100
+
+
+def is_daily_score_materialized(config: Config) -> bool:
+    state: DailyScoreState | None = DailyScoreState.select().first()
+    return (
+        state is not None
+        and state.start_date == config.start_date
+        and state.time_zone == config.time_zone
+    )
+
+
+def get_last_activity_date(time_zone: str) -> datetime.date | None:
+    """
+    Local date of the last activity, in whichever of the challenge and user
+    time zones it is latest.
+    """
+    last_timestamp = Activity.select(
+        fn.MAX(get_activity_start_timestamp_expression())
+    ).scalar()
+    if last_timestamp is None:
+        return None
+
+    last_time = datetime.datetime.fromtimestamp(last_timestamp, datetime.timezone.utc)
+    return max(
+        get_local_date(last_time, user_time_zone)
+        for user_time_zone in get_time_zones(time_zone)
+    )
+
+
+def rebuild_daily_scores(config: Config):
+    """
+    Recompute the UserDayScore and TeamDayScore tables from every activity
+    since the start of the challenge.
+    """
+    with UserDayScore._meta.database.atomic():
+        UserDayScore.delete().execute()
+        TeamDayScore.delete().execute()
+        DailyScoreState.delete().execute()
+
+        last_date = get_last_activity_date(config.time_zone)
+        if last_date is not None and last_date >= config.start_date:
+            save_matrix_daily_scores(
+                ScoreConfig(
+                    config.start_date,
+                    last_date,
+                    config.time_zone,
+                    get_point_schedule(),
+                )
+            )
+
+        DailyScoreState.create(start_date=config.start_date, time_zone=config.time_zone)
+
+    logger.debug(f"Rebuilt daily scores from {config.start_date} in {config.time_zone}")
+
+
+def save_matrix_daily_scores(config: ScoreConfig):
+    matrix = ScoreMatrix(list(User.select(User, Team).join(Team)), config)
+    matrix.add_user_day_rows(list(query_user_day_active_seconds(config)))
+
+    is_active = matrix.active_seconds > 0
+    streaks = get_streak_matrix(is_active)
+    user_points = get_user_points_matrix_from_streaks(matrix, streaks)
+
+    user_rows = [
+        {
+            "user": matrix.users[user_index].id,
+            "date": config.score_start_date + datetime.timedelta(days=int(day_index)),
+            "active_seconds": int(matrix.active_seconds[user_index, day_index]),
+            "streak": int(streaks[user_index, day_index]),
+            "points": int(user_points[user_index, day_index]),
+        }
+        for user_index, day_index in zip(*np.nonzero(is_active))
+    ]
+    for batch in chunked(user_rows, QUERY_BATCH_SIZE):
+        UserDayScore.insert_many(batch).execute()
+
+    team_points = get_team_matrix(matrix, user_points)
+    active_user_counts = get_team_matrix(matrix, user_points > 0)
+    team_bonus_points = get_team_bonus_points_matrix(matrix, user_points)
+    has_active_user = get_team_matrix(matrix, is_active) > 0
+
+    team_rows = [
+        {
+            "team": matrix.teams[team_index].id,
+            "date": config.score_start_date + datetime.timedelta(days=int(day_index)),
+            "points": int(team_points[team_index, day_index]),
+            "active_user_count": int(active_user_counts[team_index, day_index]),
+            "bonus_points": int(team_bonus_points[team_index, day_index]),
+        }
+        for team_index, day_index in zip(*np.nonzero(has_active_user))
+    ]
+    for batch in chunked(team_rows, QUERY_BATCH_SIZE):
+        TeamDayScore.insert_many(batch).execute()
+
+
+def get_user_day_active_seconds(
+    user_date_ranges: Dict[str, Tuple[datetime.date, datetime.date]],
+    time_zone: str,
+    point_schedule: PointSchedule,
+) -> Dict[str, Dict[datetime.date, int]]:
+    """
+    Active seconds per local day for each user, covering the date range given for
+    that user.
+    """
+    first_date = min(first for first, _ in user_date_ranges.values())
+    last_date = max(last for _, last in user_date_ranges.values())
+    score_config = ScoreConfig(first_date, last_date, time_zone, point_schedule)
+
+    user_active_seconds = {user_id: {} for user_id in user_date_ranges}
+    for user_ids in chunked(list(user_date_ranges), QUERY_BATCH_SIZE):
+        for user_id, day_index, active_seconds in query_user_day_active_seconds(
+            score_config, User.id.in_(user_ids)
+        ):
+            date = first_date + datetime.timedelta(days=day_index)
+            user_first_date, user_last_date = user_date_ranges[user_id]
+            if user_first_date <= date <= user_last_date:
+                user_active_seconds[user_id][date] = active_seconds
+
+    return user_active_seconds
+
+
+def update_user_day_scores(
+    user_id: str,
+    first_date: datetime.date,
+    last_date: datetime.date,
+    active_seconds_by_date: Dict[datetime.date, int],
+    point_schedule: PointSchedule,
+) -> Set[datetime.date]:
+    """
+    Apply recomputed active seconds between first_date and last_date to a
+    user's UserDayScore rows, then carry streak changes forward until the
+    stored streaks line up again.
+
+    :return: Dates whose UserDayScore row was changed.
+    """
+    previous_date = first_date - datetime.timedelta(days=1)
+    existing_scores = {
+        score.date: score
+        for score in UserDayScore.select().where(
+            (UserDayScore.user == user_id) & (UserDayScore.date >= previous_date)
+        )
+    }
+    previous_score = existing_scores.pop(previous_date, None)
+    previous_streak = previous_score.streak if previous_score else 0
+
+    changed_dates = set[datetime.date]()
+    for date in sorted(set(existing_scores) | set(active_seconds_by_date)):
+        existing_score = existing_scores.get(date)
+        active_seconds = (
+            active_seconds_by_date.get(date, 0)
+            if date <= last_date
+            else existing_score.active_seconds
+        )
+
+        if active_seconds <= 0:
+            streak = 0
+        elif date - previous_date == datetime.timedelta(days=1):
+            streak = previous_streak + 1
+        else:
+            streak = 1
+        previous_date, previous_streak = date, streak
+
+        # Later days only depend on this day through the streak, so nothing
+        # after this point changes
+        if date > last_date and streak == existing_score.streak:
+            break
+
+        if active_seconds <= 0:
+            if existing_score:
+                UserDayScore.delete().where(
+                    (UserDayScore.user == user_id) & (UserDayScore.date == date)
+                ).execute()
+                changed_dates.add(date)
+            continue
+
+        points = int(
+            calculate_user_points(active_seconds, point_schedule)
+            + calculate_user_bonus_points(streak, point_schedule)
+        )
+        if existing_score and (
+            existing_score.active_seconds,
+            existing_score.streak,
+            existing_score.points,
+        ) == (active_seconds, streak, points):
+            continue
+
+        UserDayScore.replace(
+            user=user_id,
+            date=date,
+            active_seconds=active_seconds,
+            streak=streak,
+            points=points,
+        ).execute()
+        changed_dates.add(date)
+
+    return changed_dates
+
+
+def update_team_day_scores(
+    team_dates: Iterable[Tuple[str, datetime.date]], point_schedule: PointSchedule
+):
+    """
+    Recompute the TeamDayScore rows for the given (team_id, date) pairs from the
+    UserDayScore rows of the team's current members.
+    """
+    team_dates_map = dict[str, Set[datetime.date]]()
+    for team_id, date in team_dates:
+        team_dates_map.setdefault(team_id, set()).add(date)
+
+    for team_id, dates in team_dates_map.items():
+        total_user_count = User.select().where(User.team == team_id).count()
+        for batch in chunked(sorted(dates), QUERY_BATCH_SIZE):
+            user_score_totals = {
+                date: (points, active_user_count)
+                for date, points, active_user_count in UserDayScore.select(
+                    UserDayScore.date,
+                    fn.SUM(UserDayScore.points),
+                    fn.SUM(Case(None, [(UserDayScore.points > 0, 1)], 0)),
+                )
+                .join(User)
+                .where((User.team == team_id) & (UserDayScore.date.in_(batch)))
+                .group_by(UserDayScore.date)
+                .tuples()
+            }
+
+            for date in batch:
+                if date not in user_score_totals:
+                    TeamDayScore.delete().where(
+                        (TeamDayScore.team == team_id) & (TeamDayScore.date == date)
+                    ).execute()
+                    continue
+
+                points, active_user_count = user_score_totals[date]
+                TeamDayScore.replace(
+                    team=team_id,
+                    date=date,
+                    points=points,
+                    active_user_count=active_user_count,
+                    bonus_points=calculate_team_bonus_points(
+                        active_user_count, total_user_count, point_schedule
+                    ),
+                ).execute()
+
+
+def update_daily_scores(
+    user_dates: Iterable[Tuple[str, datetime.date]], config: Config
+):
+    """
+    Incrementally update the materialized daily scores after activities on the
+    given (user_id, local date) pairs were inserted, replaced or moved. Does
+    nothing if the daily scores have not been built for the current config,
+    since they will be rebuilt the next time they are used.
+    """
+    if not is_daily_score_materialized(config):
+        logger.debug("Daily scores are not materialized, skipping update")
+        return
+
+    user_date_ranges = dict[str, Tuple[datetime.date, datetime.date]]()
+    for user_id, date in user_dates:
+        if date < config.start_date:
+            continue
+        first_date, last_date = user_date_ranges.get(user_id, (date, date))
+        user_date_ranges[user_id] = (min(first_date, date), max(last_date, date))
+
+    if not user_date_ranges:
+        return
+
+    point_schedule = get_point_schedule()
+    if point_schedule.rules.overlap_mode == "clip":
+        # An activity that runs past midnight can clip an activity of the
+        # following day
+        user_date_ranges = {
+            user_id: (first_date, last_date + datetime.timedelta(days=1))
+            for user_id, (first_date, last_date) in user_date_ranges.items()
+        }
+
+    with UserDayScore._meta.database.atomic():
+        user_active_seconds = get_user_day_active_seconds(
+            user_date_ranges, config.time_zone, point_schedule
+        )
+        user_team_ids = dict[str, str]()
+        for user_ids in chunked(list(user_date_ranges), QUERY_BATCH_SIZE):
+            user_team_ids.update(
+                User.select(User.id, User.team).where(User.id.in_(user_ids)).tuples()
+            )
+
+        changed_team_dates = set[Tuple[str, datetime.date]]()
+        for user_id, (first_date, last_date) in user_date_ranges.items():
+            if user_id not in user_team_ids:
+                logger.debug(f"Skipping daily score update for unknown user {user_id}")
+                continue
+
+            changed_dates = update_user_day_scores(
+                user_id,
+                first_date,
+                last_date,
+                user_active_seconds[user_id],
+                point_schedule,
+            )
+            changed_team_dates.update(
+                (user_team_ids[user_id], date) for date in changed_dates
+            )
+
+        update_team_day_scores(changed_team_dates, point_schedule)
+
+    logger.debug(
+        f"Updated daily scores for {len(user_date_ranges)} user(s) and "
+        f"{len(changed_team_dates)} team day(s)"
+    )
+
+
+def update_team_rosters(team_ids: Iterable[str], config: Config):
+    """
+    Recompute every TeamDayScore row of teams whose members have changed, since
+    the team bonus depends on the number of members.
+    """
+    if not is_daily_score_materialized(config):
+        logger.debug("Daily scores are not materialized, skipping update")
+        return
+
+    team_dates = set[Tuple[str, datetime.date]]()
+    for team_id in team_ids:
+        team_dates.update(
+            TeamDayScore.select(TeamDayScore.team, TeamDayScore.date)
+            .where(TeamDayScore.team == team_id)
+            .tuples()
+        )
+        team_dates.update(
+            (team_id, date)
+            for (date,) in UserDayScore.select(UserDayScore.date)
+            .join(User)
+            .where(User.team == team_id)
+            .distinct()
+            .tuples()
+        )
+
+    with TeamDayScore._meta.database.atomic():
+        update_team_day_scores(team_dates, get_point_schedule())
+
+
+def get_materialized_team_cumulative_score(
+    users: List[User], config: ScoreConfig
+) -> List[TeamCumulativeScore]:
+    """
+    Sum the materialized team day scores up to the score end date. Only valid
+    when the score start date is the challenge start date, since streaks in the
+    materialized tables count from the start of the challenge.
+    """
+    team_points = dict(
+        TeamDayScore.select(
+            TeamDayScore.team,
+            fn.SUM(TeamDayScore.points + TeamDayScore.bonus_points),
+        )
+        .where(
+            TeamDayScore.date.between(config.score_start_date, config.score_end_date)
+        )
+        .group_by(TeamDayScore.team)
+        .tuples()
+    )
+
+    team_score_map = dict[str, TeamCumulativeScore]()
+    for user in users:
+        if user.team.id not in team_score_map:
+            team_score_map[user.team.id] = TeamCumulativeScore(
+                user.team, team_points.get(user.team.id, 0)
+            )
+
+    team_scores = list(team_score_map.values())
+    team_scores.sort(key=lambda x: x.points, reverse=True)
+    return team_scores
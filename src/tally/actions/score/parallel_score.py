@@ -0,0 +1,128 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Tuple
+import logging
+import os
+from peewee import SqliteDatabase, chunked
+
+from tally.models.db import ALL_MODELS, Team, User
+from tally.actions.score.score_config import ScoreConfig
+from tally.actions.score.team_score import TeamCumulativeScore
+from tally.actions.score.user_active_time import query_user_day_active_seconds
+from tally.actions.score.vectorized_score import (
+    ScoreMatrix,
+    get_team_points_matrix,
+    get_user_points_matrix,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# Keeps the number of SQL variables per statement below the SQLite limit
+QUERY_BATCH_SIZE = 100
+# Below this many users, starting worker processes costs more than it saves
+PARALLEL_SCORE_MIN_USER_COUNT = 5000
+
+
+def get_team_shards(users: List[User], shard_count: int) -> List[List[str]]:
+    """
+    Split teams into shards with a similar number of users, assigning the
+    largest teams first to the shard with the fewest users.
+    """
+    team_user_counts = dict[str, int]()
+    for user in users:
+        team_user_counts[user.team.id] = team_user_counts.get(user.team.id, 0) + 1
+
+    shard_count = max(min(shard_count, len(team_user_counts)), 1)
+    shards: List[List[str]] = [[] for _ in range(shard_count)]
+    shard_user_counts = [0] * shard_count
+    for team_id, user_count in sorted(
+        team_user_counts.items(), key=lambda x: x[1], reverse=True
+    ):
+        shard_index = shard_user_counts.index(min(shard_user_counts))
+        shards[shard_index].append(team_id)
+        shard_user_counts[shard_index] += user_count
+
+    return [shard for shard in shards if shard]
+
+
+def bind_worker_database(database_path: str):
+    """
+    Give each worker process its own connection, since SQLite connections
+    cannot be shared between processes.
+    """
+    database = SqliteDatabase(database_path)
+    database.bind(ALL_MODELS)
+    database.connect()
+
+
+def score_team_shard(team_ids: List[str], config: ScoreConfig) -> List[Tuple[str, int]]:
+    """
+    Score the teams of a shard from the activities of their users. Users do not
+    change teams during a run and streaks are per user, so a shard does not
+    depend on any other shard.
+
+    :return: (team_id, points) pairs for every team of the shard with users.
+    """
+    users: List[User] = []
+    rows = []
+    for batch in chunked(team_ids, QUERY_BATCH_SIZE):
+        users.extend(User.select(User, Team).join(Team).where(Team.id.in_(batch)))
+        rows.extend(query_user_day_active_seconds(config, Team.id.in_(batch)))
+
+    matrix = ScoreMatrix(users, config)
+    matrix.add_user_day_rows(rows)
+    team_points = get_team_points_matrix(matrix, get_user_points_matrix(matrix))
+    return [
+        (team.id, int(points))
+        for team, points in zip(matrix.teams, team_points.sum(axis=1))
+    ]
+
+
+def get_parallel_team_cumulative_score(
+    users: List[User],
+    config: ScoreConfig,
+    worker_count: int | None = None,
+    database_path: str | None = None,
+) -> List[TeamCumulativeScore]:
+    """
+    Same as get_aggregated_team_cumulative_score, with teams split across
+    worker processes that each read and score the activities of their own
+    teams.
+
+    :param database_path: SQLite database to read from, by default the database
+        the models are bound to.
+    """
+    users = list(users)
+    database_path = database_path or User._meta.database.database
+    worker_count = worker_count or os.cpu_count() or 1
+    shards = get_team_shards(users, worker_count)
+    if not shards:
+        return []
+    logger.debug(f"Scoring {len(users)} user(s) in {len(shards)} shard(s)")
+
+    with ProcessPoolExecutor(
+        max_workers=len(shards),
+        initializer=bind_worker_database,
+        initargs=(str(Path(database_path).resolve()),),
+    ) as executor:
+        shard_results = executor.map(score_team_shard, shards, [config] * len(shards))
+        team_points = {
+            team_id: points
+            for shard_result in shard_results
+            for team_id, points in shard_result
+        }
+
+    # Teams are ordered by first appearance in the user list before sorting,
+    # as in get_team_cumulative_score
+    team_score_map = dict[str, TeamCumulativeScore]()
+    for user in users:
+        if user.team.id not in team_score_map:
+            team_score_map[user.team.id] = TeamCumulativeScore(
+                user.team, team_points.get(user.team.id, 0)
+            )
+
+    team_scores = list(team_score_map.values())
+    team_scores.sort(key=lambda x: x.points, reverse=True)
+    return team_scores
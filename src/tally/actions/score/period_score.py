@@ -0,0 +1,52 @@
+from typing import List
+
+from tally.models.db import Config, User
+from tally.actions.score.score_config import ScoreConfig
+from tally.actions.score.team_score import TeamCumulativeScore
+from tally.actions.score.streaming_score import get_streaming_team_cumulative_score
+from tally.actions.score.parallel_score import (
+    PARALLEL_SCORE_MIN_USER_COUNT,
+    get_parallel_team_cumulative_score,
+)
+from tally.actions.score.score_cache import (
+    get_cached_team_cumulative_score,
+    save_cached_team_cumulative_score,
+)
+from tally.actions.score.materialized_score import (
+    is_daily_score_materialized,
+    rebuild_daily_scores,
+    get_materialized_team_cumulative_score,
+)
+
+
+def calculate_team_cumulative_score(
+    users: List[User], config: Config, score_config: ScoreConfig
+) -> List[TeamCumulativeScore]:
+    # The materialized daily scores count streaks from the start of the
+    # challenge, so they can only be used when scoring from that date
+    if score_config.score_start_date == config.start_date:
+        if not is_daily_score_materialized(config):
+            print("Please wait, building daily scores for the challenge...")
+            rebuild_daily_scores(config)
+        return get_materialized_team_cumulative_score(users, score_config)
+    if len(users) >= PARALLEL_SCORE_MIN_USER_COUNT:
+        return get_parallel_team_cumulative_score(users, score_config)
+    # Other periods are reduced from a database cursor over the user days, so
+    # memory does not grow with the length of the period
+    return get_streaming_team_cumulative_score(users, score_config)
+
+
+def get_period_team_cumulative_score(
+    users: List[User], config: Config, score_config: ScoreConfig
+) -> List[TeamCumulativeScore]:
+    """
+    Team scores of a period, from the score cache if the period has been scored
+    since the data last changed.
+    """
+    team_cumulative_scores = get_cached_team_cumulative_score(users, score_config)
+    if team_cumulative_scores is None:
+        team_cumulative_scores = calculate_team_cumulative_score(
+            users, config, score_config
+        )
+        save_cached_team_cumulative_score(team_cumulative_scores, score_config)
+    return team_cumulative_scores
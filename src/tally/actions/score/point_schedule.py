@@ -0,0 +1,153 @@
+from functools import lru_cache
+from typing import List, Literal
+import numpy as np
+from pydantic import BaseModel, Field
+
+from tally.models.db import DailyScoreState, PointScheduleConfig
+from tally.utils.date import ONE_MINUTE_IN_SECONDS
+
+
+class PointThreshold(BaseModel):
+    minutes: int = Field(ge=0)
+    points: int
+
+
+class PointScheduleRules(BaseModel):
+    """
+    Declarative point rules of a challenge. The defaults are the original
+    challenge rules:
+
+    - 1 point per full hour of active time, plus 5, 2 and 1 points for
+      reaching 30, 60 and 120 active minutes in a day
+    - 5 bonus points for every 7 consecutive active days
+    - 5 bonus points for a team when all of its members are active on a day
+    - Overlapping activities of a user, such as the same workout recorded on
+      two devices, are counted in full and only flagged. With an overlap_mode
+      of "clip", time already covered by an earlier activity is not counted.
+    """
+
+    base_minutes: int = Field(default=60, gt=0)
+    base_points: int = 1
+    thresholds: List[PointThreshold] = Field(
+        default_factory=lambda: [
+            PointThreshold(minutes=30, points=5),
+            PointThreshold(minutes=60, points=2),
+            PointThreshold(minutes=120, points=1),
+        ]
+    )
+    streak_interval_days: int = Field(default=7, gt=0)
+    streak_bonus_points: int = 5
+    team_bonus_points: int = 5
+    overlap_mode: Literal["flag", "clip"] = "flag"
+
+
+class PointSchedule:
+    """
+    PointScheduleRules compiled for evaluation. Threshold points are looked up
+    in a table indexed by whole active minutes up to the highest threshold, so
+    scoring a user day is a lookup and a division, both for a single value and
+    for a whole array.
+    """
+
+    def __init__(self, rules: PointScheduleRules):
+        self.rules = rules
+        self.table_minutes = max(
+            (threshold.minutes for threshold in rules.thresholds), default=0
+        )
+
+        minutes = np.arange(self.table_minutes + 1)
+        threshold_points_table = np.zeros(self.table_minutes + 1, dtype=np.int64)
+        for threshold in rules.thresholds:
+            threshold_points_table += np.where(
+                minutes >= threshold.minutes, threshold.points, 0
+            )
+        self.threshold_points_table = threshold_points_table
+        # Indexing a list is faster than indexing an array for single values
+        self.threshold_points_list: List[int] = threshold_points_table.tolist()
+
+    def get_user_points(self, active_seconds: int) -> int:
+        active_minutes = int(active_seconds // ONE_MINUTE_IN_SECONDS)
+        points = active_minutes // self.rules.base_minutes * self.rules.base_points
+        if active_minutes >= 0:
+            points += self.threshold_points_list[
+                min(active_minutes, self.table_minutes)
+            ]
+        return points
+
+    def get_user_points_array(self, active_seconds: np.ndarray) -> np.ndarray:
+        active_minutes = active_seconds // ONE_MINUTE_IN_SECONDS
+        points = active_minutes // self.rules.base_minutes * self.rules.base_points
+        threshold_points = self.threshold_points_table[
+            np.clip(active_minutes, 0, self.table_minutes)
+        ]
+        return points + np.where(active_minutes >= 0, threshold_points, 0)
+
+    def get_user_bonus_points(self, streak: int) -> int:
+        return (
+            self.rules.streak_bonus_points
+            if streak > 0 and streak % self.rules.streak_interval_days == 0
+            else 0
+        )
+
+    def get_user_bonus_points_array(self, streaks: np.ndarray) -> np.ndarray:
+        return np.where(
+            (streaks > 0) & (streaks % self.rules.streak_interval_days == 0),
+            self.rules.streak_bonus_points,
+            0,
+        )
+
+    def get_team_bonus_points(
+        self, active_user_count: int, total_user_count: int
+    ) -> int:
+        return (
+            self.rules.team_bonus_points
+            if total_user_count > 0 and active_user_count == total_user_count
+            else 0
+        )
+
+    def get_team_bonus_points_array(self, is_all_active: np.ndarray) -> np.ndarray:
+        return np.where(is_all_active, self.rules.team_bonus_points, 0)
+
+
+DEFAULT_POINT_SCHEDULE = PointSchedule(PointScheduleRules())
+
+
+@lru_cache(maxsize=None)
+def compile_point_schedule(rules_json: str) -> PointSchedule:
+    return PointSchedule(PointScheduleRules.model_validate_json(rules_json))
+
+
+def get_point_schedule() -> PointSchedule:
+    """
+    The point schedule of the challenge, or the default schedule if none has
+    been saved.
+    """
+    point_schedule_config: PointScheduleConfig | None = (
+        PointScheduleConfig.select().first()
+    )
+    if not point_schedule_config:
+        return DEFAULT_POINT_SCHEDULE
+    return compile_point_schedule(point_schedule_config.rules)
+
+
+def save_point_schedule(rules: PointScheduleRules) -> bool:
+    """
+    Save the point schedule of the challenge.
+
+    :return: Whether the schedule changed, in which case the materialized daily
+        scores are marked as out of date so they are rebuilt.
+    """
+    rules_json = rules.model_dump_json()
+    if rules_json == get_point_schedule().rules.model_dump_json():
+        return False
+
+    with PointScheduleConfig._meta.database.atomic():
+        PointScheduleConfig.delete().execute()
+        PointScheduleConfig.create(rules=rules_json)
+        DailyScoreState.delete().execute()
+    return True
+
+
+def parse_point_schedule(point_schedule_path: str) -> PointScheduleRules:
+    with open(point_schedule_path, "r", encoding="utf-8") as file:
+        return PointScheduleRules.model_validate_json(file.read())
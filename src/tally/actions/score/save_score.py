@@ -1,8 +1,11 @@
 from typing import List
 import csv
+import numpy as np
 
+from tally.actions.score.standings import DailyStandings
 from tally.actions.score.team_score import TeamCumulativeScore
 from tally.actions.score.score_config import ScoreConfig
+from tally.actions.score.write_score import write_team_cumulative_score_csv
 from tally.utils.file import prompt_save_file
 
 
@@ -18,11 +21,34 @@ def save_team_cumulative_score_to_csv(
         return
 
     with open(file, "w", encoding="utf-8", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["Team", "Points"])
-        for team_cumulative_score in team_cumulative_scores:
-            writer.writerow(
-                [team_cumulative_score.team.name, team_cumulative_score.points]
-            )
+        write_team_cumulative_score_csv(team_cumulative_scores, f)
 
     print(f"Successfully saved team scores to {file}")
+
+
+def save_team_standings_to_csv(standings: DailyStandings, config: ScoreConfig):
+    formatted_score_date_range = f"{config.score_start_date.strftime('%Y-%m-%d')}_to_{config.score_end_date.strftime('%Y-%m-%d')}"
+    file = prompt_save_file(
+        f"team_standings_{formatted_score_date_range}", ".csv", "team standings"
+    )
+    if not file:
+        print("No file selected, skipping save")
+        return
+
+    with open(file, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Date", "Rank", "Team", "Points"])
+        for day_index in range(standings.matrix.day_count):
+            date = standings.get_date(day_index).strftime("%Y-%m-%d")
+            team_order = np.argsort(standings.team_ranks[:, day_index], kind="stable")
+            for team_index in team_order:
+                writer.writerow(
+                    [
+                        date,
+                        standings.team_ranks[team_index, day_index],
+                        standings.matrix.teams[team_index].name,
+                        standings.team_cumulative_points[team_index, day_index],
+                    ]
+                )
+
+    print(f"Successfully saved team standings to {file}")
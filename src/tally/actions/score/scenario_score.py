@@ -0,0 +1,109 @@
+from typing import Dict, List
+import numpy as np
+
+from tally.models.db import Team, User
+from tally.actions.score.score_config import ScoreConfig
+from tally.actions.score.point_schedule import PointSchedule
+from tally.actions.score.point_system import (
+    calculate_team_bonus_points_array,
+    calculate_user_bonus_points_array,
+    calculate_user_points_array,
+)
+from tally.actions.score.activity_bitmap import get_all_active_days
+from tally.actions.score.standings import get_rank_matrix
+from tally.actions.score.user_active_time import query_user_day_active_seconds
+from tally.actions.score.vectorized_score import ScoreMatrix, get_streak_matrix
+
+
+def get_scenario_team_points(
+    matrix: ScoreMatrix, point_schedules: List[PointSchedule]
+) -> np.ndarray:
+    """
+    Total points of each team under each point schedule, ignoring the point
+    schedule of the matrix config. The streaks do not depend on the schedule,
+    so they are computed once for all schedules.
+
+    :return: Team by schedule array, with teams in the order of matrix.teams.
+    """
+    streaks = get_streak_matrix(matrix.active_seconds > 0)
+    team_points = np.zeros((len(matrix.teams), len(point_schedules)), dtype=np.int64)
+    for schedule_index, point_schedule in enumerate(point_schedules):
+        user_points = calculate_user_points_array(
+            matrix.active_seconds, point_schedule
+        ) + calculate_user_bonus_points_array(streaks, point_schedule)
+        is_all_active = get_all_active_days(
+            user_points > 0, matrix.user_team_index, len(matrix.teams)
+        )
+
+        np.add.at(
+            team_points[:, schedule_index],
+            matrix.user_team_index,
+            user_points.sum(axis=1),
+        )
+        team_points[:, schedule_index] += calculate_team_bonus_points_array(
+            is_all_active, point_schedule
+        ).sum(axis=1)
+
+    return team_points
+
+
+class ScenarioComparison:
+    """
+    Points and rank of every team in a score window under several point
+    schedules, side by side.
+    """
+
+    def __init__(
+        self, teams: List[Team], scenario_names: List[str], team_points: np.ndarray
+    ):
+        self.teams = teams
+        self.scenario_names = scenario_names
+        self.team_points = team_points
+        self.team_ranks = get_rank_matrix(team_points)
+
+    def get_team_order(self) -> np.ndarray:
+        """
+        Team indices ordered by rank in the first scenario.
+        """
+        return np.argsort(self.team_ranks[:, 0], kind="stable")
+
+
+def get_scenario_comparison(
+    users: List[User], config: ScoreConfig, scenarios: Dict[str, PointSchedule]
+) -> ScenarioComparison:
+    """
+    Score the window of the config once per point schedule. The active time
+    depends on the overlap mode of a schedule, so the activities are
+    aggregated once per overlap mode used by the scenarios, and every schedule
+    with that mode is scored from the same aggregation.
+
+    :param scenarios: Point schedules by scenario name, at least one.
+    """
+    point_schedules = list(scenarios.values())
+    schedule_indices_by_overlap_mode: Dict[str, List[int]] = {}
+    for schedule_index, point_schedule in enumerate(point_schedules):
+        schedule_indices_by_overlap_mode.setdefault(
+            point_schedule.rules.overlap_mode, []
+        ).append(schedule_index)
+
+    teams: List[Team] = []
+    team_points: np.ndarray | None = None
+    for schedule_indices in schedule_indices_by_overlap_mode.values():
+        matrix = ScoreMatrix(
+            users,
+            ScoreConfig(
+                config.score_start_date,
+                config.score_end_date,
+                config.time_zone,
+                point_schedules[schedule_indices[0]],
+            ),
+        )
+        matrix.add_user_day_rows(list(query_user_day_active_seconds(matrix.config)))
+        if team_points is None:
+            teams = matrix.teams
+            team_points = np.zeros((len(teams), len(point_schedules)), dtype=np.int64)
+        team_points[:, schedule_indices] = get_scenario_team_points(
+            matrix, [point_schedules[index] for index in schedule_indices]
+        )
+
+    return ScenarioComparison(teams, list(scenarios), team_points)
@@ -2,19 +2,29 @@ from typing import List
 import questionary
 import datetime
 
-from tally.models.db import Config, Team, User, Activity
+from tally.models.db import Config, Team, User
 from tally.actions.score.score_config import ScoreConfig
-from tally.actions.score.save_score import save_team_cumulative_score_to_csv
-from tally.utils.date import (
-    prompt_date,
+from tally.actions.score.point_schedule import get_point_schedule
+from tally.actions.score.save_score import (
+    save_team_cumulative_score_to_csv,
+    save_team_standings_to_csv,
 )
-from tally.actions.score.user_active_time import (
-    get_user_active_time,
+from tally.actions.score.standings import get_daily_standings
+from tally.actions.score.score_index import ScoreIndex, build_score_index
+from tally.actions.score.team_score import TeamCumulativeScore
+from tally.actions.score.activity_overlap import get_activity_overlaps
+from tally.actions.score.score_audit import (
+    ScoreAudit,
+    TeamDayAudit,
+    UserDayAudit,
+    build_score_audit,
 )
-from tally.actions.score.user_score import get_user_daily_score
-from tally.actions.score.team_score import (
-    get_team_daily_score,
-    get_team_cumulative_score,
+from tally.utils.date import format_duration
+from tally.utils.prompt import prompt_date
+from tally.actions.score.period_score import get_period_team_cumulative_score
+from tally.actions.score.score_cache import (
+    get_cached_team_cumulative_score,
+    save_cached_team_cumulative_score,
 )
 
 
@@ -35,7 +45,132 @@ def prompt_score_config(config: Config) -> ScoreConfig | None:
     if not end_date:
         return None
 
-    return ScoreConfig(start_date, end_date, config.time_zone)
+    return ScoreConfig(start_date, end_date, config.time_zone, get_point_schedule())
+
+
+def print_activity_overlaps(score_config: ScoreConfig):
+    """
+    List overlapping activities for review when the point schedule counts them
+    in full.
+    """
+    if score_config.point_schedule.rules.overlap_mode != "flag":
+        return
+
+    overlaps = get_activity_overlaps()
+    if not overlaps:
+        return
+    formatted_overlaps = "\n".join(
+        [
+            f"{overlap.user_id}: activity {overlap.activity_id} overlaps activity "
+            f"{overlap.overlapping_activity_id} by "
+            f"{format_duration(overlap.overlap_seconds)}"
+            for overlap in overlaps
+        ]
+    )
+    print(
+        f"Found {len(overlaps)} overlapping activities, which are counted in "
+        f"full:\n{formatted_overlaps}"
+    )
+
+
+def format_user_day_audit(user_day_audit: UserDayAudit) -> str:
+    lines = [
+        f"  {user_day_audit.user.name}: {user_day_audit.points} points for "
+        f"{format_duration(user_day_audit.active_seconds)} active in activities "
+        f"{', '.join(user_day_audit.activity_ids)}"
+    ]
+    if user_day_audit.bonus_points:
+        lines.append(
+            f"  {user_day_audit.user.name}: {user_day_audit.bonus_points} bonus "
+            f"points for {user_day_audit.streak} consecutive active days"
+        )
+    return "\n".join(lines)
+
+
+def format_team_day_audit(team_day_audit: TeamDayAudit) -> str:
+    lines = [f"{team_day_audit.date}: {team_day_audit.get_points()} points"]
+    lines.extend(
+        format_user_day_audit(user_day_audit)
+        for user_day_audit in team_day_audit.user_day_audits
+    )
+    if team_day_audit.bonus_points:
+        lines.append(
+            f"  {team_day_audit.bonus_points} team bonus points for all "
+            f"{team_day_audit.user_count} members being active"
+        )
+    return "\n".join(lines)
+
+
+def print_team_audit(audit: ScoreAudit, team: Team):
+    team_day_audits = audit.get_team_day_audits(team.id)
+    points = sum(team_day_audit.get_points() for team_day_audit in team_day_audits)
+    formatted_days = "\n".join(
+        format_team_day_audit(team_day_audit) for team_day_audit in team_day_audits
+    )
+    print(f"Score breakdown of {team.name}, {points} points:\n{formatted_days}")
+
+
+def print_user_audit(audit: ScoreAudit, user: User):
+    user_day_audits = audit.get_user_day_audits(user.id)
+    points = sum(user_day_audit.get_points() for user_day_audit in user_day_audits)
+    formatted_days = "\n".join(
+        f"{user_day_audit.date}:\n{format_user_day_audit(user_day_audit)}"
+        for user_day_audit in user_day_audits
+    )
+    print(f"Score breakdown of {user.name}, {points} points:\n{formatted_days}")
+
+
+def prompt_score_audit(users: List[User], score_config: ScoreConfig):
+    """
+    Show which activities and bonuses produced the points of chosen teams and
+    users. The audit is only built once the first breakdown is requested, so
+    scoring without one does no extra work.
+    """
+    audit: ScoreAudit | None = None
+    teams = {user.team.id: user.team for user in users}
+    choices = [
+        questionary.Choice(f"Team: {team.name}", team)
+        for team in sorted(teams.values(), key=lambda x: x.name)
+    ] + [
+        questionary.Choice(f"User: {user.name}", user)
+        for user in sorted(users, key=lambda x: x.name)
+    ]
+
+    while questionary.confirm(
+        "Show the score breakdown of a team or user?", default=False
+    ).ask():
+        choice: Team | User | None = questionary.select(
+            "Select a team or user", choices=choices
+        ).ask()
+        if not choice:
+            continue
+
+        if not audit:
+            audit = build_score_audit(users, score_config)
+        if isinstance(choice, Team):
+            print_team_audit(audit, choice)
+        else:
+            print_user_audit(audit, choice)
+
+
+def save_team_scores(
+    team_cumulative_scores: List[TeamCumulativeScore],
+    users: List[User],
+    score_config: ScoreConfig,
+):
+    formatted_team_scores = "\n".join(
+        [f"{score.team.name}: {score.points}" for score in team_cumulative_scores]
+    )
+    print(f"Team scores:\n{formatted_team_scores}")
+
+    save_team_cumulative_score_to_csv(team_cumulative_scores, score_config)
+
+    if questionary.confirm(
+        "Also save the team standings for each day of the score period?",
+        default=False,
+    ).ask():
+        standings = get_daily_standings(users, score_config)
+        save_team_standings_to_csv(standings, score_config)
 
 
 def score():
@@ -51,19 +186,40 @@ def score():
         print("Score config is incomplete, cancelling operation")
         return
 
-    activities: List[Activity] = (
-        Activity.select().join(User).join(Team).order_by(Activity.start_time.asc())
+    users: List[User] = list(User.select(User, Team).join(Team))
+
+    team_cumulative_scores = get_period_team_cumulative_score(
+        users, config, score_config
     )
-    users: List[User] = User.select().join(Team)
 
-    user_active_times = get_user_active_time(activities, score_config)
-    user_daily_scores = get_user_daily_score(user_active_times)
-    team_daily_scores = get_team_daily_score(user_daily_scores, users)
-    team_cumulative_scores = get_team_cumulative_score(team_daily_scores, users)
+    print_activity_overlaps(score_config)
+    save_team_scores(team_cumulative_scores, users, score_config)
+    prompt_score_audit(users, score_config)
 
-    formatted_team_scores = "\n".join(
-        [f"{score.team.name}: {score.points}" for score in team_cumulative_scores]
-    )
-    print(f"Team scores:\n{formatted_team_scores}")
+    # Further periods are answered from a score index built once for the
+    # challenge, instead of scoring the activities again for each period
+    score_index: ScoreIndex | None = None
+    while questionary.confirm(
+        "Calculate scores for another period?", default=False
+    ).ask():
+        score_config = prompt_score_config(config)
+        if not score_config:
+            print("Score config is incomplete, skipping period")
+            continue
+        if score_config.score_start_date < config.start_date:
+            print(
+                "The start date cannot be before the challenge start date "
+                f"({config.start_date})"
+            )
+            continue
 
-    save_team_cumulative_score_to_csv(team_cumulative_scores, score_config)
+        team_cumulative_scores = get_cached_team_cumulative_score(users, score_config)
+        if team_cumulative_scores is None:
+            if not score_index:
+                score_index = build_score_index(config)
+            team_cumulative_scores = score_index.get_team_cumulative_score(
+                score_config.score_start_date, score_config.score_end_date
+            )
+            save_cached_team_cumulative_score(team_cumulative_scores, score_config)
+        save_team_scores(team_cumulative_scores, users, score_config)
+        prompt_score_audit(users, score_config)
@@ -0,0 +1,216 @@
+from typing import List, Tuple
+from itertools import groupby
+import datetime
+
+from tally.models.db import Team, User
+from tally.actions.score.score_config import ScoreConfig
+from tally.actions.score.id_registry import IdRegistry
+from tally.actions.score.user_active_time import query_activity_day_active_seconds
+from tally.actions.score.point_system import (
+    calculate_user_points,
+    calculate_user_bonus_points,
+    calculate_team_bonus_points,
+)
+
+
+# (day_index, active_seconds, streak, activity_ids)
+UserDayProvenance = Tuple[int, int, int, Tuple[str, ...]]
+
+
+class UserDayAudit:
+    __slots__ = (
+        "user",
+        "date",
+        "activity_ids",
+        "active_seconds",
+        "points",
+        "streak",
+        "bonus_points",
+    )
+
+    def __init__(
+        self,
+        user: User,
+        date: datetime.date,
+        activity_ids: Tuple[str, ...],
+        active_seconds: int,
+        points: int,
+        streak: int,
+        bonus_points: int,
+    ):
+        self.user = user
+        self.date = date
+        self.activity_ids = activity_ids
+        self.active_seconds = active_seconds
+        self.points = points
+        self.streak = streak
+        self.bonus_points = bonus_points
+
+    def get_points(self) -> int:
+        return self.points + self.bonus_points
+
+    def __str__(self):
+        return (
+            f"UserDayAudit("
+            f"user={self.user.id}, "
+            f"date={self.date}, "
+            f"activity_ids={self.activity_ids}, "
+            f"points={self.points}, "
+            f"bonus_points={self.bonus_points})"
+        )
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class TeamDayAudit:
+    __slots__ = ("team", "date", "user_day_audits", "user_count", "bonus_points")
+
+    def __init__(
+        self,
+        team: Team,
+        date: datetime.date,
+        user_day_audits: List[UserDayAudit],
+        user_count: int,
+        bonus_points: int,
+    ):
+        self.team = team
+        self.date = date
+        self.user_day_audits = user_day_audits
+        self.user_count = user_count
+        self.bonus_points = bonus_points
+
+    @property
+    def active_user_count(self) -> int:
+        return sum(1 for audit in self.user_day_audits if audit.get_points() > 0)
+
+    def get_points(self) -> int:
+        return (
+            sum(audit.get_points() for audit in self.user_day_audits)
+            + self.bonus_points
+        )
+
+    def __str__(self):
+        return (
+            f"TeamDayAudit("
+            f"team={self.team.id}, "
+            f"date={self.date}, "
+            f"user_day_audits={self.user_day_audits}, "
+            f"bonus_points={self.bonus_points})"
+        )
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class ScoreAudit:
+    """
+    Provenance of the points of a score period. Only the activity IDs, active
+    seconds and streak of each user day are kept, by user index. The points and
+    bonus reasons are derived from them when the breakdown of a user or team is
+    requested.
+    """
+
+    __slots__ = ("config", "users", "user_ids", "user_days")
+
+    def __init__(self, config: ScoreConfig, users: List[User]):
+        self.config = config
+        self.users = users
+        self.user_ids = IdRegistry(user.id for user in users)
+        self.user_days: List[List[UserDayProvenance]] = [[] for _ in self.user_ids.ids]
+
+    def get_date(self, day_index: int) -> datetime.date:
+        return self.config.score_start_date + datetime.timedelta(days=day_index)
+
+    def get_user_day_audits(self, user_id: str) -> List[UserDayAudit]:
+        user_index = self.user_ids.get_index(user_id)
+        if user_index < 0:
+            return []
+
+        user = self.users[user_index]
+        point_schedule = self.config.point_schedule
+        return [
+            UserDayAudit(
+                user,
+                self.get_date(day_index),
+                activity_ids,
+                active_seconds,
+                calculate_user_points(active_seconds, point_schedule),
+                streak,
+                calculate_user_bonus_points(streak, point_schedule),
+            )
+            for day_index, active_seconds, streak, activity_ids in self.user_days[
+                user_index
+            ]
+        ]
+
+    def get_team_day_audits(self, team_id: str) -> List[TeamDayAudit]:
+        team_users = [user for user in self.users if user.team.id == team_id]
+        if not team_users:
+            return []
+
+        day_audit_map = dict[datetime.date, List[UserDayAudit]]()
+        for user in team_users:
+            for user_day_audit in self.get_user_day_audits(user.id):
+                day_audit_map.setdefault(user_day_audit.date, []).append(user_day_audit)
+
+        team_day_audits: List[TeamDayAudit] = []
+        for date in sorted(day_audit_map):
+            user_day_audits = day_audit_map[date]
+            active_user_count = sum(
+                1 for audit in user_day_audits if audit.get_points() > 0
+            )
+            team_day_audits.append(
+                TeamDayAudit(
+                    team_users[0].team,
+                    date,
+                    user_day_audits,
+                    len(team_users),
+                    calculate_team_bonus_points(
+                        active_user_count, len(team_users), self.config.point_schedule
+                    ),
+                )
+            )
+        return team_day_audits
+
+
+def build_score_audit(users: List[User], config: ScoreConfig) -> ScoreAudit:
+    """
+    Collect the provenance of the points of every user day in the score window.
+    The activities are read one row at a time, in the same order and with the
+    same local days and active seconds as query_user_day_active_seconds, so the
+    streaks match the scoring engines.
+    """
+    audit = ScoreAudit(config, users)
+    previous_user_index = -1
+    previous_day_index = 0
+    streak = 0
+
+    for (user_id, day_index), rows in groupby(
+        query_activity_day_active_seconds(config).iterator(),
+        key=lambda row: (row[0], row[2]),
+    ):
+        user_index = audit.user_ids.get_index(user_id)
+        if user_index < 0:
+            continue
+
+        activity_ids: List[str] = []
+        active_seconds = 0
+        for _, activity_id, _, activity_active_seconds in rows:
+            activity_ids.append(activity_id)
+            active_seconds += activity_active_seconds
+
+        if active_seconds <= 0:
+            streak = 0
+        elif user_index == previous_user_index and day_index == previous_day_index + 1:
+            streak += 1
+        else:
+            streak = 1
+        previous_user_index = user_index
+        previous_day_index = day_index
+
+        audit.user_days[user_index].append(
+            (day_index, active_seconds, streak, tuple(activity_ids))
+        )
+
+    return audit
@@ -0,0 +1,109 @@
+from typing import List
+import hashlib
+import json
+import logging
+import uuid
+from peewee import fn
+
+from tally.models.db import DataVersion, ScoreCacheEntry, Team, User
+from tally.actions.score.score_config import ScoreConfig
+from tally.actions.score.team_score import TeamCumulativeScore
+
+
+logger = logging.getLogger(__name__)
+
+
+SCORE_CACHE_MAX_ENTRIES = 32
+
+
+def bump_data_version():
+    """
+    Replace the data version stamp. Must be called after every write to the
+    activities, users, teams or config, so cached scores are not reused.
+    """
+    with DataVersion._meta.database.atomic():
+        DataVersion.delete().execute()
+        DataVersion.create(stamp=uuid.uuid4().hex)
+
+
+def get_data_version() -> str:
+    data_version: DataVersion | None = DataVersion.select().first()
+    if not data_version:
+        # Databases without a stamp, for example right after a reset, get one
+        # that no cached score can match
+        data_version = DataVersion.create(stamp=uuid.uuid4().hex)
+    return data_version.stamp
+
+
+def get_score_cache_key(score_config: ScoreConfig, data_version: str) -> str:
+    """
+    Hash of everything the team scores of a period depend on.
+    """
+    key_data = {
+        "data_version": data_version,
+        "score_start_date": score_config.score_start_date.isoformat(),
+        "score_end_date": score_config.score_end_date.isoformat(),
+        "time_zone": score_config.time_zone,
+        "point_schedule": score_config.point_schedule.rules.model_dump(),
+    }
+    return hashlib.sha256(
+        json.dumps(key_data, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+def get_next_last_used() -> int:
+    return (ScoreCacheEntry.select(fn.MAX(ScoreCacheEntry.last_used)).scalar() or 0) + 1
+
+
+def get_cached_team_cumulative_score(
+    users: List[User], score_config: ScoreConfig
+) -> List[TeamCumulativeScore] | None:
+    """
+    :return: The cached team scores of the period, or None if the period has
+        not been scored since the data last changed.
+    """
+    key = get_score_cache_key(score_config, get_data_version())
+    entry: ScoreCacheEntry | None = ScoreCacheEntry.get_or_none(
+        ScoreCacheEntry.key == key
+    )
+    if not entry:
+        return None
+
+    teams = {user.team.id: user.team for user in users}
+    team_scores = []
+    for team_id, points in json.loads(entry.team_scores):
+        team: Team | None = teams.get(team_id)
+        if not team:
+            return None
+        team_scores.append(TeamCumulativeScore(team, points))
+
+    ScoreCacheEntry.update(last_used=get_next_last_used()).where(
+        ScoreCacheEntry.key == key
+    ).execute()
+    logger.debug(f"Using cached team scores {key}")
+    return team_scores
+
+
+def save_cached_team_cumulative_score(
+    team_scores: List[TeamCumulativeScore], score_config: ScoreConfig
+):
+    """
+    Cache the team scores of a period, evicting the least recently used
+    entries above SCORE_CACHE_MAX_ENTRIES.
+    """
+    key = get_score_cache_key(score_config, get_data_version())
+    with ScoreCacheEntry._meta.database.atomic():
+        ScoreCacheEntry.replace(
+            key=key,
+            team_scores=json.dumps(
+                [[team_score.team.id, team_score.points] for team_score in team_scores]
+            ),
+            last_used=get_next_last_used(),
+        ).execute()
+
+        kept_keys = (
+            ScoreCacheEntry.select(ScoreCacheEntry.key)
+            .order_by(ScoreCacheEntry.last_used.desc())
+            .limit(SCORE_CACHE_MAX_ENTRIES)
+        )
+        ScoreCacheEntry.delete().where(ScoreCacheEntry.key.not_in(kept_keys)).execute()
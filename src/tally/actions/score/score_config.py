@@ -1,5 +1,7 @@
 import datetime
 
+from tally.actions.score.point_schedule import DEFAULT_POINT_SCHEDULE, PointSchedule
+
 
 class ScoreConfig:
     def __init__(
@@ -7,7 +9,9 @@ class ScoreConfig:
         score_start_date: datetime.date,
         score_end_date: datetime.date,
         time_zone: str,
+        point_schedule: PointSchedule = DEFAULT_POINT_SCHEDULE,
     ):
         self.score_start_date = score_start_date
         self.score_end_date = score_end_date
         self.time_zone = time_zone
+        self.point_schedule = point_schedule
@@ -0,0 +1,175 @@
+from typing import Dict, List
+import datetime
+import logging
+import numpy as np
+
+from tally.models.db import Config, Team, User
+from tally.actions.score.score_config import ScoreConfig
+from tally.actions.score.team_score import TeamCumulativeScore
+from tally.actions.score.user_active_time import query_user_day_active_seconds
+from tally.actions.score.materialized_score import get_last_activity_date
+from tally.actions.score.point_schedule import get_point_schedule
+from tally.actions.score.vectorized_score import (
+    ScoreMatrix,
+    get_team_points_matrix,
+    get_user_points_matrix,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_prefix_sums(values: np.ndarray) -> np.ndarray:
+    """
+    Running sums along the days with a leading column of zeros, so the sum of
+    days i to j is prefix[:, j + 1] - prefix[:, i].
+    """
+    prefix_sums = np.zeros((values.shape[0], values.shape[1] + 1), dtype=np.int64)
+    np.cumsum(values, axis=1, out=prefix_sums[:, 1:])
+    return prefix_sums
+
+
+class ScoreIndex:
+    """
+    Prefix sums of user day and team day points from the start of the
+    challenge, for answering the score of any window of dates.
+
+    Streaks count from the start of the score window, so a window that starts
+    in the middle of a user's streak scores differently from the same days
+    scored from the start of the challenge. The difference is only computed
+    for start days that cut through a streak, once per start day, after which
+    each window is answered in time proportional to the number of teams.
+    """
+
+    def __init__(self, matrix: ScoreMatrix):
+        self.matrix = matrix
+        self.is_active = matrix.active_seconds > 0
+        self.user_points = get_user_points_matrix(matrix)
+        self.team_points = get_team_points_matrix(matrix, self.user_points)
+        self.user_prefix_sums = get_prefix_sums(self.user_points)
+        self.team_prefix_sums = get_prefix_sums(self.team_points)
+
+        self.user_corrections: Dict[int, np.ndarray] = {}
+        self.team_corrections: Dict[int, np.ndarray] = {}
+
+    @property
+    def start_date(self) -> datetime.date:
+        return self.matrix.config.score_start_date
+
+    @property
+    def end_date(self) -> datetime.date:
+        return self.matrix.config.score_end_date
+
+    def get_day_index(self, date: datetime.date) -> int:
+        return (date - self.start_date).days
+
+    def is_streak_start(self, day_index: int) -> bool:
+        """
+        Whether no streak continues from the previous day into this day, in
+        which case scores from this day are plain prefix sum differences.
+        """
+        if day_index <= 0 or day_index >= self.matrix.day_count:
+            return True
+        return not np.any(
+            self.is_active[:, day_index - 1] & self.is_active[:, day_index]
+        )
+
+    def build_corrections(self, first_day: int):
+        """
+        Prefix sums of the difference between scoring the remaining days from
+        first_day and scoring them from the start of the challenge.
+        """
+        window_matrix = self.matrix.get_day_range(first_day, self.matrix.day_count - 1)
+        user_points = get_user_points_matrix(window_matrix)
+        team_points = get_team_points_matrix(window_matrix, user_points)
+
+        self.user_corrections[first_day] = get_prefix_sums(
+            user_points - self.user_points[:, first_day:]
+        )
+        self.team_corrections[first_day] = get_prefix_sums(
+            team_points - self.team_points[:, first_day:]
+        )
+        logger.debug(
+            f"Built score index corrections from {window_matrix.config.score_start_date}"
+        )
+
+    def get_window_points(
+        self,
+        prefix_sums: np.ndarray,
+        corrections: Dict[int, np.ndarray],
+        start_date: datetime.date,
+        end_date: datetime.date,
+    ) -> np.ndarray:
+        if start_date < self.start_date:
+            raise ValueError(
+                f"Score window starting on {start_date} is before the start of "
+                f"the score index on {self.start_date}"
+            )
+
+        first_day = self.get_day_index(start_date)
+        # There is no active time after the end of the index
+        last_day = min(self.get_day_index(end_date), self.matrix.day_count - 1)
+        if last_day < first_day:
+            return np.zeros(prefix_sums.shape[0], dtype=np.int64)
+
+        points = prefix_sums[:, last_day + 1] - prefix_sums[:, first_day]
+        if self.is_streak_start(first_day):
+            return points
+
+        if first_day not in corrections:
+            self.build_corrections(first_day)
+        return points + corrections[first_day][:, last_day - first_day + 1]
+
+    def get_user_points(
+        self, start_date: datetime.date, end_date: datetime.date
+    ) -> np.ndarray:
+        """
+        Points of each user in the window, in the order of matrix.users.
+        """
+        return self.get_window_points(
+            self.user_prefix_sums, self.user_corrections, start_date, end_date
+        )
+
+    def get_team_points(
+        self, start_date: datetime.date, end_date: datetime.date
+    ) -> np.ndarray:
+        """
+        Points of each team in the window, in the order of matrix.teams.
+        """
+        return self.get_window_points(
+            self.team_prefix_sums, self.team_corrections, start_date, end_date
+        )
+
+    def get_team_cumulative_score(
+        self, start_date: datetime.date, end_date: datetime.date
+    ) -> List[TeamCumulativeScore]:
+        """
+        Same result as get_team_cumulative_score for a score window from
+        start_date to end_date.
+        """
+        team_scores = [
+            TeamCumulativeScore(team, int(points))
+            for team, points in zip(
+                self.matrix.teams, self.get_team_points(start_date, end_date)
+            )
+        ]
+        team_scores.sort(key=lambda x: x.points, reverse=True)
+        return team_scores
+
+
+def build_score_index(config: Config) -> ScoreIndex:
+    """
+    Build a score index over every activity from the start of the challenge
+    to the last activity.
+    """
+    last_date = get_last_activity_date(config.time_zone)
+    score_config = ScoreConfig(
+        config.start_date,
+        max(last_date or config.start_date, config.start_date),
+        config.time_zone,
+        get_point_schedule(),
+    )
+
+    matrix = ScoreMatrix(list(User.select(User, Team).join(Team)), score_config)
+    matrix.add_user_day_rows(list(query_user_day_active_seconds(score_config)))
+    return ScoreIndex(matrix)
@@ -0,0 +1,73 @@
+from typing import List
+import datetime
+import numpy as np
+
+from tally.models.db import User
+from tally.actions.score.score_config import ScoreConfig
+from tally.actions.score.team_score import TeamCumulativeScore
+from tally.actions.score.user_active_time import query_user_day_active_seconds
+from tally.actions.score.vectorized_score import (
+    ScoreMatrix,
+    get_team_points_matrix,
+    get_user_points_matrix,
+)
+
+
+def get_rank_matrix(cumulative_points: np.ndarray) -> np.ndarray:
+    """
+    Rank of each row on each day, where rows with equal points share a rank and
+    the rank is one more than the number of rows with more points.
+    """
+    ranks = np.zeros(cumulative_points.shape, dtype=np.int64)
+    for day_index in range(cumulative_points.shape[1]):
+        descending_points = np.sort(-cumulative_points[:, day_index])
+        ranks[:, day_index] = (
+            np.searchsorted(descending_points, -cumulative_points[:, day_index]) + 1
+        )
+    return ranks
+
+
+class DailyStandings:
+    """
+    Cumulative points and rank of every team and user as of each day of the
+    score window. The point matrices are computed once and summed along the
+    days, so the standings on day i match the cumulative score for a window
+    that ends on day i.
+    """
+
+    def __init__(self, matrix: ScoreMatrix):
+        self.matrix = matrix
+
+        user_points = get_user_points_matrix(matrix)
+        team_points = get_team_points_matrix(matrix, user_points)
+        self.user_cumulative_points = np.cumsum(user_points, axis=1)
+        self.team_cumulative_points = np.cumsum(team_points, axis=1)
+        self.user_ranks = get_rank_matrix(self.user_cumulative_points)
+        self.team_ranks = get_rank_matrix(self.team_cumulative_points)
+
+    def get_date(self, day_index: int) -> datetime.date:
+        return self.matrix.config.score_start_date + datetime.timedelta(days=day_index)
+
+    def get_team_cumulative_score(self, day_index: int) -> List[TeamCumulativeScore]:
+        """
+        Team scores as of the given day, in the same order as
+        get_team_cumulative_score.
+        """
+        team_scores = [
+            TeamCumulativeScore(team, int(points))
+            for team, points in zip(
+                self.matrix.teams, self.team_cumulative_points[:, day_index]
+            )
+        ]
+        team_scores.sort(key=lambda x: x.points, reverse=True)
+        return team_scores
+
+
+def get_daily_standings(users: List[User], config: ScoreConfig) -> DailyStandings:
+    """
+    Standings for every day of the score window over all activities in the
+    database, from a single aggregation query.
+    """
+    matrix = ScoreMatrix(users, config)
+    matrix.add_user_day_rows(list(query_user_day_active_seconds(config)))
+    return DailyStandings(matrix)
@@ -0,0 +1,26 @@
+from typing import List
+
+from tally.models.db import User
+from tally.actions.score.score_config import ScoreConfig
+from tally.actions.score.team_score import (
+    TeamCumulativeScore,
+    reduce_team_cumulative_score,
+)
+from tally.actions.score.user_active_time import iterate_user_active_time
+from tally.actions.score.user_score import iterate_user_daily_score
+
+
+def get_streaming_team_cumulative_score(
+    users: List[User], config: ScoreConfig
+) -> List[TeamCumulativeScore]:
+    """
+    Same result as get_aggregated_team_cumulative_score, with each stage a
+    generator over a database cursor of user days ordered by user and date.
+    Apart from the users, memory grows with the number of team days rather than
+    with the number of activities or user days.
+    """
+    user_active_times = iterate_user_active_time(users, config)
+    user_daily_scores = iterate_user_daily_score(
+        user_active_times, config.point_schedule
+    )
+    return reduce_team_cumulative_score(user_daily_scores, users, config.point_schedule)
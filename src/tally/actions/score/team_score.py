@@ -1,37 +1,58 @@
-from typing import List, Tuple, Optional
+from typing import Iterable, List, Tuple, Optional
 import datetime
 
 from tally.models.db import Team, User
 from tally.actions.score.user_score import UserDailyScore
+from tally.actions.score.point_schedule import DEFAULT_POINT_SCHEDULE, PointSchedule
 from tally.actions.score.point_system import calculate_team_bonus_points
 
 
 class TeamDailyScore:
+    __slots__ = (
+        "team",
+        "date_ordinal",
+        "users",
+        "user_scores",
+        "user_points",
+        "active_user_count",
+        "point_schedule",
+    )
+
     def __init__(
         self,
         team: Team,
         date: datetime.date,
         users: List[User],
         user_scores: Optional[List[UserDailyScore]] = None,
+        point_schedule: PointSchedule = DEFAULT_POINT_SCHEDULE,
     ):
         self.team = team
-        self.date = date
+        self.date_ordinal = date.toordinal()
         self.users = users
-        self.user_scores = user_scores or []
+        self.point_schedule = point_schedule
+        self.user_scores = []
+        # Running totals, so the points of a team day are not recomputed from
+        # the user scores every time they are read
+        self.user_points = 0
+        self.active_user_count = 0
+        for user_score in user_scores or []:
+            self.add_user_score(user_score)
+
+    @property
+    def date(self) -> datetime.date:
+        return datetime.date.fromordinal(self.date_ordinal)
 
     def add_user_score(self, user_score: UserDailyScore):
         self.user_scores.append(user_score)
+        self.user_points += user_score.points
+        if user_score.points > 0:
+            self.active_user_count += 1
 
     def get_points(self) -> int:
-        points = sum(user_score.points for user_score in self.user_scores)
-
-        active_user_count = len(
-            [user_score for user_score in self.user_scores if user_score.points > 0]
+        bonus_points = calculate_team_bonus_points(
+            self.active_user_count, len(self.users), self.point_schedule
         )
-        total_user_count = len(self.users)
-        bonus_points = calculate_team_bonus_points(active_user_count, total_user_count)
-
-        return points + bonus_points
+        return self.user_points + bonus_points
 
     def __str__(self):
         return (
@@ -46,6 +67,8 @@ class TeamDailyScore:
 
 
 class TeamCumulativeScore:
+    __slots__ = ("team", "points")
+
     def __init__(self, team: Team, points: int = 0):
         self.team = team
         self.points = points
@@ -61,24 +84,30 @@ class TeamCumulativeScore:
 
 
 def get_team_daily_score(
-    user_daily_scores: List[UserDailyScore], users: List[User]
+    user_daily_scores: List[UserDailyScore],
+    users: List[User],
+    point_schedule: PointSchedule = DEFAULT_POINT_SCHEDULE,
 ) -> List[TeamDailyScore]:
     team_user_map = dict[str, List[User]]()
     for user in users:
-        team_user_map[user.team.id] = team_user_map.get(user.team.id, []) + [user]
+        team_user_map.setdefault(user.team.id, []).append(user)
 
-    team_score_map = dict[Tuple[str, datetime.date], TeamDailyScore]()
+    team_score_map = dict[Tuple[str, int], TeamDailyScore]()
 
     for user_score_entry in user_daily_scores:
         team: Team = user_score_entry.user.team
-        date = user_score_entry.date
-        key = (team.id, date)
-
-        team_score = team_score_map.get(
-            key, TeamDailyScore(team, date, team_user_map[team.id])
-        )
+        key = (team.id, user_score_entry.date_ordinal)
+
+        team_score = team_score_map.get(key)
+        if team_score is None:
+            team_score = TeamDailyScore(
+                team,
+                user_score_entry.date,
+                team_user_map[team.id],
+                point_schedule=point_schedule,
+            )
+            team_score_map[key] = team_score
         team_score.add_user_score(user_score_entry)
-        team_score_map[key] = team_score
 
     return list(team_score_map.values())
 
@@ -94,9 +123,52 @@ def get_team_cumulative_score(
     for team_daily_score in team_daily_scores:
         team: Team = team_daily_score.team
 
-        team_score = team_score_map.get(team.id, TeamCumulativeScore(team))
+        team_score = team_score_map.get(team.id)
+        if team_score is None:
+            team_score = TeamCumulativeScore(team)
+            team_score_map[team.id] = team_score
         team_score.add_daily_score(team_daily_score)
-        team_score_map[team.id] = team_score
+
+    team_scores = list(team_score_map.values())
+    team_scores.sort(key=lambda x: x.points, reverse=True)
+    return team_scores
+
+
+def reduce_team_cumulative_score(
+    user_daily_scores: Iterable[UserDailyScore],
+    users: List[User],
+    point_schedule: PointSchedule = DEFAULT_POINT_SCHEDULE,
+) -> List[TeamCumulativeScore]:
+    """
+    Same result as get_team_daily_score followed by get_team_cumulative_score,
+    reducing the user scores as they are read instead of building every team
+    day. Only the number of active users per team day is kept until the end,
+    for the team bonus.
+    """
+    team_score_map = dict[str, TeamCumulativeScore]()
+    team_user_counts = dict[str, int]()
+    for user in users:
+        team_score_map.setdefault(user.team.id, TeamCumulativeScore(user.team))
+        team_user_counts[user.team.id] = team_user_counts.get(user.team.id, 0) + 1
+
+    team_day_active_counts = dict[Tuple[str, int], int]()
+    for user_score_entry in user_daily_scores:
+        team: Team = user_score_entry.user.team
+
+        team_score = team_score_map.get(team.id)
+        if team_score is None:
+            team_score = TeamCumulativeScore(team)
+            team_score_map[team.id] = team_score
+        team_score.points += user_score_entry.points
+
+        if user_score_entry.points > 0:
+            key = (team.id, user_score_entry.date_ordinal)
+            team_day_active_counts[key] = team_day_active_counts.get(key, 0) + 1
+
+    for (team_id, _), active_user_count in team_day_active_counts.items():
+        team_score_map[team_id].points += calculate_team_bonus_points(
+            active_user_count, team_user_counts.get(team_id, 0), point_schedule
+        )
 
     team_scores = list(team_score_map.values())
     team_scores.sort(key=lambda x: x.points, reverse=True)
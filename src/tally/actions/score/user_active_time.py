@@ -1,18 +1,43 @@
 import datetime
-from typing import List, Tuple
-import pytz
+from typing import Iterable, Iterator, List, Tuple
+from peewee import SQL, Case, ColumnBase, Select, Value, fn
 
-from tally.models.db import Activity, User
+from tally.models.db import Activity, Team, User
 from tally.actions.score.score_config import ScoreConfig
-from tally.utils.activity import get_activity_active_seconds
+from tally.actions.score.id_registry import IdRegistry
+from tally.actions.score.activity_overlap import (
+    get_clipped_active_seconds,
+    get_clipped_active_seconds_expression,
+)
+from tally.utils.activity import (
+    get_activity_active_seconds,
+    get_activity_active_seconds_expression,
+    get_activity_start_timestamp_expression,
+)
+from tally.utils.date import get_start_of_day
+from tally.utils.user import get_time_zones, get_user_time_zone
+from tally.utils.time_zone import (
+    ONE_DAY_IN_SECONDS,
+    UNIX_EPOCH_DATE,
+    TimeZoneOffsetTable,
+    get_time_zone_offset_table,
+)
 
 
 class UserActiveTime:
+    # Scoring creates one record per user day, so records use slots and keep
+    # the date as an ordinal instead of a date object
+    __slots__ = ("user", "date_ordinal", "active_seconds")
+
     def __init__(self, user: User, date: datetime.date, active_seconds: int = 0):
         self.user = user
-        self.date = date
+        self.date_ordinal = date.toordinal()
         self.active_seconds = active_seconds
 
+    @property
+    def date(self) -> datetime.date:
+        return datetime.date.fromordinal(self.date_ordinal)
+
     def add_activity(self, activity: Activity):
         self.active_seconds += get_activity_active_seconds(activity)
 
@@ -31,13 +56,33 @@ class UserActiveTime:
 def get_user_active_time(
     activities: List[Activity], config: ScoreConfig
 ) -> List[UserActiveTime]:
-    active_time_map = dict[Tuple[str, datetime.date], UserActiveTime]()
+    user_ids = IdRegistry()
+    # Every record of a user shares one User instance instead of the instance
+    # loaded by each activity
+    users: List[User] = []
+    # Offset table of the time zone of each user, shared by the users of a
+    # time zone through the offset table cache
+    offset_tables: List[TimeZoneOffsetTable] = []
+    active_time_map = dict[Tuple[int, int], UserActiveTime]()
+    clipped_active_seconds = (
+        get_clipped_active_seconds(activities)
+        if config.point_schedule.rules.overlap_mode == "clip"
+        else None
+    )
 
     for activity in activities:
-        activity_date = (
-            datetime.datetime.fromisoformat(activity.start_time)
-            .astimezone(pytz.timezone(config.time_zone))
-            .date()
+        user_index = user_ids.get_index(activity.user_id)
+        if user_index < 0:
+            user_index = user_ids.add(activity.user_id)
+            users.append(activity.user)
+            offset_tables.append(
+                get_time_zone_offset_table(
+                    get_user_time_zone(activity.user, config.time_zone)
+                )
+            )
+
+        activity_date = offset_tables[user_index].get_local_date(
+            datetime.datetime.fromisoformat(activity.start_time).timestamp()
         )
         if (
             activity_date > config.score_end_date
@@ -45,11 +90,329 @@ def get_user_active_time(
         ):
             continue
 
-        key = (activity.user.id, activity_date)
-        active_time = active_time_map.get(
-            key, UserActiveTime(activity.user, activity_date)
-        )
-        active_time.add_activity(activity)
-        active_time_map[key] = active_time
+        key = (user_index, activity_date.toordinal())
+        active_time = active_time_map.get(key)
+        if active_time is None:
+            active_time = UserActiveTime(users[user_index], activity_date)
+            active_time_map[key] = active_time
+        if clipped_active_seconds is None:
+            active_time.add_activity(activity)
+        else:
+            active_time.active_seconds += clipped_active_seconds[activity.id]
 
     return list(active_time_map.values())
+
+
+def get_score_window_timestamps(
+    config: ScoreConfig, time_zones: List[str] | None = None
+) -> Tuple[int, int]:
+    """
+    UTC timestamps of the start of the score start date and the start of the day
+    after the score end date. With several time zones, the window covers the
+    score window of each of them.
+    """
+    time_zones = time_zones or [config.time_zone]
+    return (
+        min(
+            int(get_start_of_day(config.score_start_date, time_zone).timestamp())
+            for time_zone in time_zones
+        ),
+        max(
+            int(
+                get_start_of_day(
+                    config.score_end_date + datetime.timedelta(days=1), time_zone
+                ).timestamp()
+            )
+            for time_zone in time_zones
+        ),
+    )
+
+
+def get_local_day_expression(
+    start_timestamp: ColumnBase,
+    config: ScoreConfig,
+    time_zone: str | None = None,
+    window: Tuple[int, int] | None = None,
+) -> ColumnBase:
+    """
+    SQL expression for the number of days between the score start date and the
+    local date of a UTC timestamp. The UTC offset is picked with a CASE over the
+    offset transitions in the window, by default the score window, so it is
+    only valid for timestamps inside the window.
+
+    :param time_zone: Time zone of the local date, by default the time zone of
+        the config.
+    """
+    window_start, window_end = window or get_score_window_timestamps(config)
+    transitions = get_time_zone_offset_table(
+        time_zone or config.time_zone
+    ).get_transitions(window_start, window_end)
+    if len(transitions) == 1:
+        utc_offset = Value(transitions[0][1])
+    else:
+        utc_offset = Case(
+            None,
+            [
+                (start_timestamp < next_timestamp, offset)
+                for (_, offset), (next_timestamp, _) in zip(
+                    transitions, transitions[1:]
+                )
+            ],
+            transitions[-1][1],
+        )
+
+    start_day_number = (config.score_start_date - UNIX_EPOCH_DATE).days
+    # Integer division since both operands are integers in SQLite
+    return (start_timestamp + utc_offset) / ONE_DAY_IN_SECONDS - start_day_number
+
+
+def get_user_local_day_expression(
+    start_timestamp: ColumnBase,
+    user_time_zone: ColumnBase,
+    config: ScoreConfig,
+    time_zones: List[str],
+) -> ColumnBase:
+    """
+    Same as get_local_day_expression in the time zone of each user. Activities
+    are converted in groups that share a time zone, with one branch per time
+    zone, so a challenge with a single time zone gets the same expression as
+    get_local_day_expression.
+
+    :param user_time_zone: Time zone of the user, or NULL for the time zone of
+        the config.
+    :param time_zones: Time zones of the users, as returned by get_time_zones.
+    """
+    window = get_score_window_timestamps(config, time_zones)
+    default_expression = get_local_day_expression(
+        start_timestamp, config, time_zones[0], window
+    )
+    if len(time_zones) == 1:
+        return default_expression
+
+    return Case(
+        None,
+        [
+            (
+                user_time_zone == time_zone,
+                get_local_day_expression(start_timestamp, config, time_zone, window),
+            )
+            for time_zone in time_zones[1:]
+        ],
+        default_expression,
+    )
+
+
+def query_user_day_active_seconds(
+    config: ScoreConfig, condition: ColumnBase | None = None
+) -> Select:
+    """
+    Aggregates active seconds per user and local day in the database. Each row
+    is a (user_id, day_index, active_seconds) tuple, where day_index is the
+    number of days since the score start date. Only activities in the score
+    window are included.
+
+    Start times without a UTC offset are treated as UTC, whereas
+    get_user_active_time treats them as system local time. Activities saved by
+    track and load always include an offset.
+
+    :param condition: Only include activities that match this condition, which
+        can refer to Activity, User and Team. Conditions on the user or team
+        keep every activity of a user together, as required when clipping
+        overlaps.
+    """
+    if config.point_schedule.rules.overlap_mode == "clip":
+        return query_clipped_user_day_active_seconds(config, condition)
+
+    time_zones = get_time_zones(config.time_zone)
+    window_start, window_end = get_score_window_timestamps(config, time_zones)
+    start_timestamp = get_activity_start_timestamp_expression()
+    day_index = get_user_local_day_expression(
+        start_timestamp, User.time_zone, config, time_zones
+    ).alias("day_index")
+    query = (
+        Activity.select(
+            Activity.user,
+            day_index,
+            fn.SUM(get_activity_active_seconds_expression()),
+        )
+        .join(User)
+        .join(Team)
+        .where((start_timestamp >= window_start) & (start_timestamp < window_end))
+    )
+    if condition is not None:
+        query = query.where(condition)
+
+    query = query.group_by(Activity.user, SQL("day_index"))
+    if len(time_zones) > 1:
+        query = query.having(is_in_score_window(SQL("day_index"), config))
+    return query.order_by(Activity.user, SQL("day_index")).tuples()
+
+
+def is_in_score_window(day_index: ColumnBase, config: ScoreConfig) -> ColumnBase:
+    """
+    With several time zones, the UTC window of the query is wider than the
+    score window of each time zone, so the local days are filtered again.
+    """
+    day_count = (config.score_end_date - config.score_start_date).days + 1
+    return (day_index >= 0) & (day_index < day_count)
+
+
+def query_clipped_user_day_active_seconds(
+    config: ScoreConfig, condition: ColumnBase | None = None
+) -> Select:
+    """
+    Same as query_user_day_active_seconds, with the active seconds of each
+    activity clipped to the time not covered by earlier activities of the user.
+    Earlier activities can start before the score window, so the clipped active
+    seconds are computed over every activity before the window is applied.
+    """
+    time_zones = get_time_zones(config.time_zone)
+    window_start, window_end = get_score_window_timestamps(config, time_zones)
+    activity_seconds = query_clipped_activity_active_seconds(
+        window_end, condition
+    ).alias("activity_seconds")
+    day_index = get_user_local_day_expression(
+        activity_seconds.c.start_timestamp,
+        activity_seconds.c.time_zone,
+        config,
+        time_zones,
+    ).alias("day_index")
+    query = (
+        Select(
+            from_list=[activity_seconds],
+            columns=[
+                activity_seconds.c.user_id,
+                day_index,
+                fn.SUM(activity_seconds.c.active_seconds),
+            ],
+        )
+        .where(activity_seconds.c.start_timestamp >= window_start)
+        .group_by(activity_seconds.c.user_id, SQL("day_index"))
+    )
+    if len(time_zones) > 1:
+        query = query.having(is_in_score_window(SQL("day_index"), config))
+    return (
+        query.order_by(activity_seconds.c.user_id, SQL("day_index"))
+        .bind(Activity._meta.database)
+        .tuples()
+    )
+
+
+def query_clipped_activity_active_seconds(
+    window_end: int, condition: ColumnBase | None = None
+) -> Select:
+    """
+    Clipped active seconds of each activity that starts before window_end, with
+    the user_id, activity_id, time_zone, start_timestamp and active_seconds
+    columns.
+    """
+    start_timestamp = get_activity_start_timestamp_expression()
+    query = (
+        Activity.select(
+            Activity.user.alias("user_id"),
+            Activity.id.alias("activity_id"),
+            User.time_zone.alias("time_zone"),
+            start_timestamp.alias("start_timestamp"),
+            get_clipped_active_seconds_expression(
+                start_timestamp, get_activity_active_seconds_expression()
+            ).alias("active_seconds"),
+        )
+        .join(User)
+        .join(Team)
+        # Later activities do not change the clipping of earlier ones
+        .where(start_timestamp < window_end)
+    )
+    if condition is not None:
+        query = query.where(condition)
+    return query
+
+
+def query_activity_day_active_seconds(
+    config: ScoreConfig, condition: ColumnBase | None = None
+) -> Select:
+    """
+    Per activity rows of query_user_day_active_seconds, before they are summed.
+    Each row is a (user_id, activity_id, day_index, active_seconds) tuple,
+    ordered by user ID, day index and start time.
+    """
+    time_zones = get_time_zones(config.time_zone)
+    window_start, window_end = get_score_window_timestamps(config, time_zones)
+
+    if config.point_schedule.rules.overlap_mode == "clip":
+        activity_seconds = query_clipped_activity_active_seconds(
+            window_end, condition
+        ).alias("activity_seconds")
+        start_timestamp = activity_seconds.c.start_timestamp
+        day_index = get_user_local_day_expression(
+            start_timestamp, activity_seconds.c.time_zone, config, time_zones
+        )
+        query = Select(
+            from_list=[activity_seconds],
+            columns=[
+                activity_seconds.c.user_id,
+                activity_seconds.c.activity_id,
+                day_index.alias("day_index"),
+                activity_seconds.c.active_seconds,
+            ],
+        ).bind(Activity._meta.database)
+        user_id = activity_seconds.c.user_id
+        activity_id = activity_seconds.c.activity_id
+    else:
+        start_timestamp = get_activity_start_timestamp_expression()
+        day_index = get_user_local_day_expression(
+            start_timestamp, User.time_zone, config, time_zones
+        )
+        query = (
+            Activity.select(
+                Activity.user,
+                Activity.id,
+                day_index.alias("day_index"),
+                get_activity_active_seconds_expression(),
+            )
+            .join(User)
+            .join(Team)
+        )
+        if condition is not None:
+            query = query.where(condition)
+        user_id = Activity.user
+        activity_id = Activity.id
+
+    query = query.where(
+        (start_timestamp >= window_start) & (start_timestamp < window_end)
+    )
+    if len(time_zones) > 1:
+        query = query.where(is_in_score_window(day_index, config))
+    return query.order_by(
+        user_id, SQL("day_index"), start_timestamp, activity_id
+    ).tuples()
+
+
+def iterate_user_active_time(
+    users: Iterable[User], config: ScoreConfig
+) -> Iterator[UserActiveTime]:
+    """
+    Stream the active time of each user day over all activities in the
+    database, ordered by user ID and date. Rows are read from a database cursor
+    without being cached, so only the current row is held in memory.
+    """
+    user_map = {user.id: user for user in users}
+
+    for user_id, day_index, active_seconds in query_user_day_active_seconds(
+        config
+    ).iterator():
+        if user_id not in user_map:
+            continue
+        yield UserActiveTime(
+            user_map[user_id],
+            config.score_start_date + datetime.timedelta(days=day_index),
+            active_seconds,
+        )
+
+
+def get_aggregated_user_active_time(config: ScoreConfig) -> List[UserActiveTime]:
+    """
+    Equivalent of get_user_active_time over all activities in the database,
+    with the per activity work done by SQLite so only one row per user day is
+    loaded into Python.
+    """
+    return list(iterate_user_active_time(User.select(User, Team).join(Team), config))
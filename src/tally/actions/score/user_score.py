@@ -1,9 +1,13 @@
-from typing import List, Tuple
+from typing import Iterable, Iterator, List
 import datetime
 
 from tally.models.db import User
 from tally.actions.score.user_active_time import UserActiveTime
-from tally.utils.date import get_previous_day
+from tally.actions.score.activity_bitmap import (
+    get_active_day_bitmap,
+    get_streak_length,
+)
+from tally.actions.score.point_schedule import DEFAULT_POINT_SCHEDULE, PointSchedule
 from tally.actions.score.point_system import (
     calculate_user_points,
     calculate_user_bonus_points,
@@ -11,11 +15,17 @@ from tally.actions.score.point_system import (
 
 
 class UserDailyScore:
+    __slots__ = ("user", "date_ordinal", "points")
+
     def __init__(self, user: User, date: datetime.date, points: int):
         self.user = user
-        self.date = date
+        self.date_ordinal = date.toordinal()
         self.points = points
 
+    @property
+    def date(self) -> datetime.date:
+        return datetime.date.fromordinal(self.date_ordinal)
+
     def __str__(self):
         return (
             f"UserDailyScore("
@@ -30,22 +40,38 @@ class UserDailyScore:
 
 def get_user_daily_score(
     user_active_times: List[UserActiveTime],
+    point_schedule: PointSchedule = DEFAULT_POINT_SCHEDULE,
 ) -> List[UserDailyScore]:
     user_daily_scores: List[UserDailyScore] = []
-    user_streak_map = dict[Tuple[str, datetime.date], int]()
+    if not user_active_times:
+        return user_daily_scores
 
-    # Dates must be in increasing order since calculation relies on knowing the
+    # Active days of each user are kept as a bitmap relative to the earliest
+    # date, so a streak is found from the bitmap instead of by looking up the
     # previous day's streak
-    sorted_active_times = sorted(user_active_times, key=lambda x: (x.user.id, x.date))
+    first_ordinal = min(entry.date_ordinal for entry in user_active_times)
+    user_active_day_map = dict[str, List[int]]()
+    for active_time_entry in user_active_times:
+        if active_time_entry.active_seconds > 0:
+            user_active_day_map.setdefault(active_time_entry.user.id, []).append(
+                active_time_entry.date_ordinal - first_ordinal
+            )
+    user_bitmap_map = {
+        user_id: get_active_day_bitmap(active_days)
+        for user_id, active_days in user_active_day_map.items()
+    }
 
-    for active_time_entry in sorted_active_times:
-        points = calculate_user_points(active_time_entry.active_seconds)
-        prev_day_date = get_previous_day(active_time_entry.date)
-        prev_streak = user_streak_map.get((active_time_entry.user.id, prev_day_date), 0)
-        streak = prev_streak + 1 if active_time_entry.active_seconds > 0 else 0
-        bonus_points = calculate_user_bonus_points(streak)
+    sorted_active_times = sorted(
+        user_active_times, key=lambda x: (x.user.id, x.date_ordinal)
+    )
 
-        user_streak_map[(active_time_entry.user.id, active_time_entry.date)] = streak
+    for active_time_entry in sorted_active_times:
+        points = calculate_user_points(active_time_entry.active_seconds, point_schedule)
+        streak = get_streak_length(
+            user_bitmap_map.get(active_time_entry.user.id, 0),
+            active_time_entry.date_ordinal - first_ordinal,
+        )
+        bonus_points = calculate_user_bonus_points(streak, point_schedule)
 
         user_daily_scores.append(
             UserDailyScore(
@@ -56,3 +82,35 @@ def get_user_daily_score(
         )
 
     return user_daily_scores
+
+
+def iterate_user_daily_score(
+    user_active_times: Iterable[UserActiveTime],
+    point_schedule: PointSchedule = DEFAULT_POINT_SCHEDULE,
+) -> Iterator[UserDailyScore]:
+    """
+    Streaming equivalent of get_user_daily_score for active times ordered by
+    user ID and date. Only the streak of the previous entry is kept, so memory
+    does not grow with the number of entries.
+    """
+    previous_user_id: str | None = None
+    previous_date_ordinal = 0
+    streak = 0
+
+    for active_time_entry in user_active_times:
+        if active_time_entry.active_seconds <= 0:
+            streak = 0
+        elif (
+            active_time_entry.user.id == previous_user_id
+            and active_time_entry.date_ordinal == previous_date_ordinal + 1
+        ):
+            streak += 1
+        else:
+            streak = 1
+        previous_user_id = active_time_entry.user.id
+        previous_date_ordinal = active_time_entry.date_ordinal
+
+        points = calculate_user_points(
+            active_time_entry.active_seconds, point_schedule
+        ) + calculate_user_bonus_points(streak, point_schedule)
+        yield UserDailyScore(active_time_entry.user, active_time_entry.date, points)
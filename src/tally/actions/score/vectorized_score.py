@@ -0,0 +1,286 @@
+from typing import List, Tuple
+import datetime
+import numpy as np
+
+from tally.models.db import Activity, Team, User
+from tally.actions.score.score_config import ScoreConfig
+from tally.actions.score.team_score import TeamCumulativeScore
+from tally.actions.score.user_active_time import query_user_day_active_seconds
+from tally.actions.score.point_system import (
+    calculate_user_points_array,
+    calculate_user_bonus_points_array,
+    calculate_team_bonus_points_array,
+)
+from tally.actions.score.activity_bitmap import get_all_active_days
+from tally.actions.score.activity_overlap import get_clipped_active_seconds
+from tally.actions.score.id_registry import IdRegistry
+from tally.utils.activity import get_activity_active_seconds
+from tally.utils.user import get_user_time_zone
+from tally.utils.time_zone import UNIX_EPOCH_DATE, get_time_zone_offset_table
+
+
+class ScoreMatrix:
+    """
+    Dense user by day grid of active seconds for a score window. Rows follow
+    the order of the user list and column 0 is the score start date. Teams are
+    numbered in order of first appearance in the user list, which matches the
+    ordering used by get_team_cumulative_score.
+    """
+
+    def __init__(self, users: List[User], config: ScoreConfig):
+        self.users = list(users)
+        self.config = config
+        self.day_count = max(
+            (config.score_end_date - config.score_start_date).days + 1, 0
+        )
+        self.user_ids = IdRegistry(user.id for user in self.users)
+
+        self.teams: List[Team] = []
+        self.team_ids = IdRegistry()
+        user_team_index = []
+        for user in self.users:
+            if user.team.id not in self.team_ids:
+                self.teams.append(user.team)
+            user_team_index.append(self.team_ids.add(user.team.id))
+        self.user_team_index = np.array(user_team_index, dtype=np.int64)
+
+        # Time zone 0 is the time zone of the config, also used for unknown users
+        self.time_zones = IdRegistry([config.time_zone])
+        self.user_time_zone_index = np.array(
+            [
+                self.time_zones.add(get_user_time_zone(user, config.time_zone))
+                for user in self.users
+            ],
+            dtype=np.int64,
+        )
+
+        self.active_seconds = np.zeros(
+            (len(self.users), self.day_count), dtype=np.int64
+        )
+
+    def add_active_seconds(
+        self,
+        user_indices: np.ndarray,
+        day_indices: np.ndarray,
+        active_seconds: np.ndarray,
+    ):
+        """
+        Accumulate active seconds into the grid. Entries for unknown users
+        (index -1) or days outside of the score window are ignored.
+        """
+        is_in_window = (
+            (user_indices >= 0) & (day_indices >= 0) & (day_indices < self.day_count)
+        )
+        np.add.at(
+            self.active_seconds,
+            (user_indices[is_in_window], day_indices[is_in_window]),
+            active_seconds[is_in_window],
+        )
+
+    def get_day_range(self, first_day: int, last_day: int) -> "ScoreMatrix":
+        """
+        Copy of the grid restricted to the days between first_day and last_day,
+        as if it had been built for that score window.
+        """
+        matrix = ScoreMatrix(
+            self.users,
+            ScoreConfig(
+                self.config.score_start_date + datetime.timedelta(days=first_day),
+                self.config.score_start_date + datetime.timedelta(days=last_day),
+                self.config.time_zone,
+                self.config.point_schedule,
+            ),
+        )
+        matrix.active_seconds[:] = self.active_seconds[:, first_day : last_day + 1]
+        return matrix
+
+    def add_user_day_rows(self, rows: List[Tuple[str, int, int]]):
+        """
+        Accumulate (user_id, day_index, active_seconds) rows, as returned by
+        query_user_day_active_seconds, into the grid.
+        """
+        self.add_active_seconds(
+            np.array([self.user_ids.get_index(row[0]) for row in rows], dtype=np.int64),
+            np.array([row[1] for row in rows], dtype=np.int64),
+            np.array([row[2] for row in rows], dtype=np.int64),
+        )
+
+
+def get_local_day_indices(
+    start_timestamps: np.ndarray,
+    config: ScoreConfig,
+    time_zones: IdRegistry | None = None,
+    time_zone_indices: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Map UTC timestamps to the index of the local day in the score window.
+    Timestamps before the window map to -1 and timestamps after the window map
+    to indices at or past the number of days in the window.
+
+    :param time_zones: Time zones of the timestamps, by default only the time
+        zone of the config. Timestamps are converted in one vectorized lookup
+        per time zone.
+    :param time_zone_indices: Index of the time zone of each timestamp.
+    """
+    if time_zones is None or time_zone_indices is None:
+        day_numbers = get_time_zone_offset_table(
+            config.time_zone
+        ).get_local_day_numbers(start_timestamps)
+    else:
+        day_numbers = np.zeros(len(start_timestamps), dtype=np.int64)
+        for time_zone_index, time_zone in enumerate(time_zones.ids):
+            is_in_time_zone = time_zone_indices == time_zone_index
+            day_numbers[is_in_time_zone] = get_time_zone_offset_table(
+                time_zone
+            ).get_local_day_numbers(start_timestamps[is_in_time_zone])
+    start_day_number = (config.score_start_date - UNIX_EPOCH_DATE).days
+    return np.clip(day_numbers - start_day_number, -1, None)
+
+
+def get_activity_columns(
+    activities: List[Activity], matrix: ScoreMatrix
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Flatten activities into arrays of user index, UTC start timestamp and
+    active seconds. Users that are not part of the matrix get index -1.
+    Overlapping activities are clipped if the point schedule says so.
+    """
+    clipped_active_seconds = (
+        get_clipped_active_seconds(activities)
+        if matrix.config.point_schedule.rules.overlap_mode == "clip"
+        else None
+    )
+    user_indices = []
+    start_timestamps = []
+    active_seconds = []
+    for activity in activities:
+        user_indices.append(matrix.user_ids.get_index(activity.user_id))
+        start_timestamps.append(
+            datetime.datetime.fromisoformat(activity.start_time).timestamp()
+        )
+        active_seconds.append(
+            get_activity_active_seconds(activity)
+            if clipped_active_seconds is None
+            else clipped_active_seconds[activity.id]
+        )
+
+    return (
+        np.array(user_indices, dtype=np.int64),
+        np.array(start_timestamps, dtype=np.float64),
+        np.array(active_seconds, dtype=np.int64),
+    )
+
+
+def get_streak_matrix(is_active: np.ndarray) -> np.ndarray:
+    """
+    Number of consecutive active days up to and including each day, or 0 if the
+    user is not active on that day.
+    """
+    day_numbers = np.arange(is_active.shape[1])
+    last_inactive_day = np.maximum.accumulate(
+        np.where(is_active, -1, day_numbers), axis=1
+    )
+    return np.where(is_active, day_numbers - last_inactive_day, 0)
+
+
+def get_user_points_matrix(matrix: ScoreMatrix) -> np.ndarray:
+    """
+    Points for each user day including streak bonus points. Mirrors
+    get_user_daily_score, where a day counts towards the streak if the user
+    has any active time on that day.
+    """
+    return get_user_points_matrix_from_streaks(
+        matrix, get_streak_matrix(matrix.active_seconds > 0)
+    )
+
+
+def get_user_points_matrix_from_streaks(
+    matrix: ScoreMatrix, streaks: np.ndarray
+) -> np.ndarray:
+    point_schedule = matrix.config.point_schedule
+    return calculate_user_points_array(
+        matrix.active_seconds, point_schedule
+    ) + calculate_user_bonus_points_array(streaks, point_schedule)
+
+
+def get_team_matrix(matrix: ScoreMatrix, user_values: np.ndarray) -> np.ndarray:
+    """
+    Sum a user by day array into a team by day array.
+    """
+    team_values = np.zeros((len(matrix.teams), matrix.day_count), dtype=np.int64)
+    np.add.at(team_values, matrix.user_team_index, user_values)
+    return team_values
+
+
+def get_team_bonus_points_matrix(
+    matrix: ScoreMatrix, user_points: np.ndarray
+) -> np.ndarray:
+    """
+    Bonus points for each team day where all members of the team are active.
+    """
+    is_all_active = get_all_active_days(
+        user_points > 0, matrix.user_team_index, len(matrix.teams)
+    )
+    return calculate_team_bonus_points_array(
+        is_all_active, matrix.config.point_schedule
+    )
+
+
+def get_team_points_matrix(matrix: ScoreMatrix, user_points: np.ndarray) -> np.ndarray:
+    """
+    Points for each team day including the bonus for all members being active.
+    Mirrors TeamDailyScore.get_points.
+    """
+    return get_team_matrix(matrix, user_points) + get_team_bonus_points_matrix(
+        matrix, user_points
+    )
+
+
+def get_matrix_team_cumulative_score(matrix: ScoreMatrix) -> List[TeamCumulativeScore]:
+    user_points = get_user_points_matrix(matrix)
+    team_points = get_team_points_matrix(matrix, user_points)
+
+    team_scores = [
+        TeamCumulativeScore(team, int(points))
+        for team, points in zip(matrix.teams, team_points.sum(axis=1))
+    ]
+    team_scores.sort(key=lambda x: x.points, reverse=True)
+    return team_scores
+
+
+def get_vectorized_team_cumulative_score(
+    activities: List[Activity], users: List[User], config: ScoreConfig
+) -> List[TeamCumulativeScore]:
+    """
+    Columnar equivalent of running get_user_active_time, get_user_daily_score,
+    get_team_daily_score and get_team_cumulative_score in sequence.
+    """
+    matrix = ScoreMatrix(users, config)
+    user_indices, start_timestamps, active_seconds = get_activity_columns(
+        activities, matrix
+    )
+    time_zone_indices = np.zeros(len(user_indices), dtype=np.int64)
+    is_known_user = user_indices >= 0
+    time_zone_indices[is_known_user] = matrix.user_time_zone_index[
+        user_indices[is_known_user]
+    ]
+    matrix.add_active_seconds(
+        user_indices,
+        get_local_day_indices(
+            start_timestamps, config, matrix.time_zones, time_zone_indices
+        ),
+        active_seconds,
+    )
+    return get_matrix_team_cumulative_score(matrix)
+
+
+def get_aggregated_team_cumulative_score(
+    users: List[User], config: ScoreConfig
+) -> List[TeamCumulativeScore]:
+    """
+    Same as get_vectorized_team_cumulative_score over all activities in the
+    database, with active time aggregated per user day by SQLite.
+    """
+    matrix = ScoreMatrix(users, config)
+    matrix.add_user_day_rows(list(query_user_day_active_seconds(config)))
+    return get_matrix_team_cumulative_score(matrix)
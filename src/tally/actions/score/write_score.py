@@ -0,0 +1,39 @@
+from typing import List, TextIO
+import csv
+import json
+
+from tally.actions.score.team_score import TeamCumulativeScore
+from tally.actions.score.score_config import ScoreConfig
+
+
+def write_team_cumulative_score_csv(
+    team_cumulative_scores: List[TeamCumulativeScore], file: TextIO
+):
+    writer = csv.writer(file)
+    writer.writerow(["Team", "Points"])
+    for team_cumulative_score in team_cumulative_scores:
+        writer.writerow([team_cumulative_score.team.name, team_cumulative_score.points])
+
+
+def write_team_cumulative_score_json(
+    team_cumulative_scores: List[TeamCumulativeScore],
+    config: ScoreConfig,
+    file: TextIO,
+):
+    json.dump(
+        {
+            "score_start_date": config.score_start_date.isoformat(),
+            "score_end_date": config.score_end_date.isoformat(),
+            "teams": [
+                {
+                    "id": team_cumulative_score.team.id,
+                    "name": team_cumulative_score.team.name,
+                    "points": team_cumulative_score.points,
+                }
+                for team_cumulative_score in team_cumulative_scores
+            ],
+        },
+        file,
+        indent=2,
+    )
+    file.write("\n")
@@ -0,0 +1,38 @@
+import csv
+
+from tally.actions.score.scenario_score import ScenarioComparison
+from tally.actions.score.score_config import ScoreConfig
+from tally.utils.file import prompt_save_file
+
+
+def save_scenario_comparison_to_csv(
+    comparison: ScenarioComparison, config: ScoreConfig
+):
+    formatted_score_date_range = f"{config.score_start_date.strftime('%Y-%m-%d')}_to_{config.score_end_date.strftime('%Y-%m-%d')}"
+    file = prompt_save_file(
+        f"point_schedule_comparison_{formatted_score_date_range}",
+        ".csv",
+        "point schedule comparison",
+    )
+    if not file:
+        print("No file selected, skipping save")
+        return
+
+    with open(file, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        header = ["Team"]
+        for scenario_name in comparison.scenario_names:
+            header.extend([f"{scenario_name} Rank", f"{scenario_name} Points"])
+        writer.writerow(header)
+        for team_index in comparison.get_team_order():
+            row = [comparison.teams[team_index].name]
+            for scenario_index in range(len(comparison.scenario_names)):
+                row.extend(
+                    [
+                        comparison.team_ranks[team_index, scenario_index],
+                        comparison.team_points[team_index, scenario_index],
+                    ]
+                )
+            writer.writerow(row)
+
+    print(f"Successfully saved point schedule comparison to {file}")
@@ -0,0 +1,89 @@
+from pathlib import Path
+from typing import Dict, List
+import logging
+import traceback
+
+from tally.models.db import Config, Team, User
+from tally.actions.score.score import prompt_score_config
+from tally.actions.score.point_schedule import (
+    PointSchedule,
+    get_point_schedule,
+    parse_point_schedule,
+)
+from tally.actions.score.scenario_score import (
+    ScenarioComparison,
+    get_scenario_comparison,
+)
+from tally.actions.simulate.save_simulation import save_scenario_comparison_to_csv
+from tally.utils.file import FileType, prompt_select_files
+
+
+logger = logging.getLogger(__name__)
+
+
+CURRENT_SCENARIO_NAME = "Current"
+
+
+def load_scenarios(point_schedule_paths: List[str]) -> Dict[str, PointSchedule]:
+    """
+    The current point schedule of the challenge followed by one scenario per
+    point schedule file, named after the file. Files that cannot be read are
+    skipped.
+    """
+    scenarios = {CURRENT_SCENARIO_NAME: get_point_schedule()}
+    for point_schedule_path in point_schedule_paths:
+        try:
+            rules = parse_point_schedule(point_schedule_path)
+        except Exception:
+            logger.error(
+                f"Failed to read point schedule {point_schedule_path}:\n"
+                f"{traceback.format_exc()}"
+            )
+            continue
+
+        name = Path(point_schedule_path).stem
+        if name in scenarios:
+            name = f"{name} ({len(scenarios)})"
+        scenarios[name] = PointSchedule(rules)
+    return scenarios
+
+
+def format_scenario_comparison(comparison: ScenarioComparison) -> str:
+    lines = []
+    for team_index in comparison.get_team_order():
+        columns = [
+            f"{name}: #{comparison.team_ranks[team_index, scenario_index]} "
+            f"({comparison.team_points[team_index, scenario_index]})"
+            for scenario_index, name in enumerate(comparison.scenario_names)
+        ]
+        lines.append(f"{comparison.teams[team_index].name}: {', '.join(columns)}")
+    return "\n".join(lines)
+
+
+def simulate():
+    config: Config | None = Config.select().first()
+    if not config:
+        print(
+            "No active challenge found. Start a new challenge first. Cancelling operation."
+        )
+        return
+
+    score_config = prompt_score_config(config)
+    if not score_config:
+        print("Score config is incomplete, cancelling operation")
+        return
+
+    print("Use the pop-up file explorer to select the point schedules to compare")
+    point_schedule_paths = prompt_select_files("point schedules", [FileType.json])
+    if not point_schedule_paths:
+        print("No files selected, cancelling operation")
+        return
+
+    scenarios = load_scenarios(point_schedule_paths)
+    users: List[User] = list(User.select(User, Team).join(Team))
+    comparison = get_scenario_comparison(users, score_config, scenarios)
+    print(
+        f"Team standings by point schedule:\n{format_scenario_comparison(comparison)}"
+    )
+
+    save_scenario_comparison_to_csv(comparison, score_config)
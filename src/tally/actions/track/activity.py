@@ -1,22 +1,33 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List
+from typing import Dict, Iterator, List, Set
+import queue
 import re
-import time
+import threading
 
 from tally.services.strava import StravaService
-from tally.models.db import Activity, Team
+from tally.services.rate_limiter import TokenBucket
+from tally.models.db import Activity, Config, Team
 from tally.models.validation.club_feed import (
     FeedEntryMultipleActivities,
     FeedResponse,
     FeedActivity,
     ActivityStatsEntry,
 )
+from tally.utils.activity import calculate_activity_active_seconds
 
 
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_REQUESTS_PER_MINUTE = Config.requests_per_minute.default
+MAX_CONCURRENT_CLUB_FEEDS = 4
+# Fetched pages waiting to be saved, before fetching pauses
+FEED_PAGE_BUFFER_SIZE = 2 * MAX_CONCURRENT_CLUB_FEEDS
+FEED_PAGE_PUT_TIMEOUT_SECONDS = 0.1
+
+
 def get_moving_seconds_from_stats(stats: List[ActivityStatsEntry]) -> int | None:
     """
     Checks if the stats string contains any one or more of the following elements:
@@ -77,7 +88,7 @@ def map_feed_activity_to_activity(activity: FeedActivity) -> Activity:
     if not moving_seconds:
         logger.debug(f"No moving time found for activity {activity.id}")
 
-    return Activity(
+    mapped_activity = Activity(
         id=activity.id,
         user=activity.athlete.athleteId,
         start_time=datetime.fromisoformat(activity.startDate.replace("Z", "+00:00")),
@@ -86,32 +97,200 @@ def map_feed_activity_to_activity(activity: FeedActivity) -> Activity:
         title=activity.activityName,
         workout_type=activity.type,
     )
+    mapped_activity.active_seconds = calculate_activity_active_seconds(mapped_activity)
+    return mapped_activity
 
 
-def get_activities(
-    strava_service: StravaService, team: Team, after_date: datetime
-) -> List[Activity]:
-    feed_activities: List[FeedActivity] = []
-    cursor = None
-    request_interval_seconds = 5
-    while True:
-        # delay request to avoid rate limiting
-        time.sleep(request_interval_seconds)
+class ClubFeedPage:
+    """
+    Feed activities read from one page of the feed of a club, with the highest
+    cursorData.updated_at of its entries and the cursor of the next page, or
+    None if it is the last page to fetch.
+    """
 
-        feed = strava_service.get_club_feed(team.id, cursor)
-        feed_activities.extend(get_activities_from_feed(feed))
-        next_feed_timestamp = (
-            feed.entries[-1].cursorData.updated_at if feed.entries else None
+    __slots__ = ("club_id", "activities", "updated_at", "next_cursor")
+
+    def __init__(self, club_id: str, feed: FeedResponse, next_cursor: int | None):
+        self.club_id = club_id
+        self.activities = get_activities_from_feed(feed)
+        self.updated_at = max(
+            (entry.cursorData.updated_at for entry in feed.entries), default=None
+        )
+        self.next_cursor = next_cursor
+
+    @property
+    def is_last(self) -> bool:
+        return self.next_cursor is None
+
+    def __str__(self):
+        return (
+            f"ClubFeedPage("
+            f"club={self.club_id}, "
+            f"activities={len(self.activities)}, "
+            f"updated_at={self.updated_at}, "
+            f"next_cursor={self.next_cursor})"
         )
-        # comparing the updated_at timestamp means activities fetch before the
-        # after_date but updated after the after_date are still fetched.
-        if not feed.pagination.hasMore or next_feed_timestamp < after_date.timestamp():
-            break
-        cursor = next_feed_timestamp
 
+    def __repr__(self):
+        return self.__str__()
+
+
+def iterate_club_feed(
+    strava_service: StravaService,
+    club_id: str,
+    after_date: datetime,
+    rate_limiter: TokenBucket,
+    cursor: int | None = None,
+) -> Iterator[ClubFeedPage]:
+    """
+    Fetch the feed of a club page by page, from cursor, or the newest page,
+    back to the after_date.
+    """
+    while True:
+        # Wait for the shared request budget to avoid rate limiting
+        rate_limiter.acquire()
+
+        feed = strava_service.get_club_feed(club_id, cursor)
+        cursor = get_next_feed_cursor(feed, after_date)
+        yield ClubFeedPage(club_id, feed, cursor)
+        if cursor is None:
+            return
+
+
+def get_next_feed_cursor(feed: FeedResponse, after_date: datetime) -> int | None:
+    """
+    :return: The cursor of the next page of the feed, or None if there are no
+        more pages with activities updated after the after_date.
+    """
+    next_feed_timestamp = (
+        feed.entries[-1].cursorData.updated_at if feed.entries else None
+    )
+    # comparing the updated_at timestamp means activities fetch before the
+    # after_date but updated after the after_date are still fetched.
+    if not feed.pagination.hasMore or next_feed_timestamp < after_date.timestamp():
+        return None
+    return next_feed_timestamp
+
+
+def iterate_club_feed_pages(
+    strava_service: StravaService,
+    club_after_dates: Dict[str, datetime],
+    requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+    club_cursors: Dict[str, int] | None = None,
+) -> Iterator[ClubFeedPage]:
+    """
+    Fetch the feeds of several clubs concurrently, each back to its own after
+    date and from its own cursor, if any. Every page request of every club
+    takes a token from one shared rate limiter, so the total time is bounded by
+    the request budget instead of a fixed delay per page.
+
+    Pages are handed over as soon as they are fetched, through a buffer of at
+    most FEED_PAGE_BUFFER_SIZE pages. Fetching pauses while the buffer is full,
+    so pages that are not consumed yet do not pile up in memory.
+
+    :return: The pages of each club in feed order, interleaved with the pages
+        of the other clubs.
+    """
+    club_cursors = club_cursors or {}
+    rate_limiter = TokenBucket(requests_per_minute)
+    pages = queue.Queue[ClubFeedPage | Exception](maxsize=FEED_PAGE_BUFFER_SIZE)
+    is_stopped = threading.Event()
+
+    def put_page(page: ClubFeedPage | Exception) -> bool:
+        # Keep checking whether the consumer stopped, so a full buffer does not
+        # block this thread forever
+        while not is_stopped.is_set():
+            try:
+                pages.put(page, timeout=FEED_PAGE_PUT_TIMEOUT_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def fetch_club_feed(club_id: str, after_date: datetime):
+        try:
+            for page in iterate_club_feed(
+                strava_service,
+                club_id,
+                after_date,
+                rate_limiter,
+                club_cursors.get(club_id),
+            ):
+                if not put_page(page):
+                    return
+        except Exception as error:
+            put_page(error)
+
+    executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_CLUB_FEEDS)
+    try:
+        for club_id, after_date in club_after_dates.items():
+            executor.submit(fetch_club_feed, club_id, after_date)
+
+        remaining_club_count = len(club_after_dates)
+        while remaining_club_count:
+            page = pages.get()
+            if isinstance(page, Exception):
+                raise page
+
+            logger.debug(f"Fetched {page}")
+            if page.is_last:
+                remaining_club_count -= 1
+            yield page
+    finally:
+        # Stop fetching the remaining clubs if one of them failed or the caller
+        # stopped reading
+        is_stopped.set()
+        executor.shutdown(cancel_futures=True)
+
+
+def iterate_club_feed_pages_in_batches(
+    strava_service: StravaService,
+    club_after_dates: Dict[str, datetime],
+    requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+    club_cursors: Dict[str, int] | None = None,
+) -> Iterator[ClubFeedPage]:
+    """
+    Same result as iterate_club_feed_pages for the "script" fetch mode of the
+    StravaService. The next pages of up to MAX_CONCURRENT_CLUB_FEEDS clubs are
+    requested together with get_club_feeds, so each round of pages costs one
+    WebDriver round trip. Each page still takes a token from the rate limiter,
+    and the next round is only requested once the pages of the previous round
+    are consumed.
+    """
+    club_cursors = club_cursors or {}
+    rate_limiter = TokenBucket(requests_per_minute)
+    # Cursor of the next page of each club that has more pages
+    next_cursors = dict[str, int | None](
+        (club_id, club_cursors.get(club_id)) for club_id in club_after_dates
+    )
+    while next_cursors:
+        feed_pages = list(next_cursors.items())[:MAX_CONCURRENT_CLUB_FEEDS]
+        for _ in feed_pages:
+            rate_limiter.acquire()
+
+        feeds = strava_service.get_club_feeds(feed_pages)
+        for (club_id, _), feed in zip(feed_pages, feeds):
+            page = ClubFeedPage(
+                club_id, feed, get_next_feed_cursor(feed, club_after_dates[club_id])
+            )
+            if page.is_last:
+                del next_cursors[club_id]
+            else:
+                next_cursors[club_id] = page.next_cursor
+            logger.debug(f"Fetched {page}")
+            yield page
+
+
+def get_team_activities(
+    team: Team,
+    feed_activities: List[FeedActivity],
+    team_user_ids: Set[str] | None = None,
+) -> List[Activity]:
     # If the user is part of a team in Strava, but not a part of the team in the
     # database, use the database as the source of truth and do not include the activity.
-    team_user_id_set = {user.id for user in team.users}
+    team_user_id_set = (
+        team_user_ids if team_user_ids is not None else {user.id for user in team.users}
+    )
     activities = []
     for activity in feed_activities:
         if activity.athlete.athleteId in team_user_id_set:
@@ -123,3 +302,23 @@ def get_activities(
             )
 
     return activities
+
+
+def get_activities(
+    strava_service: StravaService,
+    team: Team,
+    after_date: datetime,
+    rate_limiter: TokenBucket | None = None,
+) -> List[Activity]:
+    team_user_ids = {user.id for user in team.users}
+    activities = []
+    # Each page is filtered and mapped as it arrives, so only the activities of
+    # the team are kept
+    for page in iterate_club_feed(
+        strava_service,
+        team.id,
+        after_date,
+        rate_limiter or TokenBucket(DEFAULT_REQUESTS_PER_MINUTE),
+    ):
+        activities.extend(get_team_activities(team, page.activities, team_user_ids))
+    return activities
@@ -0,0 +1,123 @@
+from typing import Dict, List
+import datetime
+import logging
+
+from tally.models.db import TrackCheckpoint
+
+
+logger = logging.getLogger(__name__)
+
+
+class TrackStatus:
+    running = "running"
+    complete = "complete"
+
+
+def get_track_after_dates(
+    team_ids: List[str], default_after_date: datetime.datetime
+) -> Dict[str, datetime.datetime]:
+    """
+    Date to fetch the feed of each team back to: the checkpoint of the team,
+    or default_after_date for teams that have not been tracked yet. A run that
+    was interrupted before saving a team leaves its previous checkpoint in
+    place, so the next run resumes from it.
+    """
+    checkpoints: Dict[str, TrackCheckpoint] = {
+        checkpoint.team_id: checkpoint
+        for checkpoint in TrackCheckpoint.select().where(
+            TrackCheckpoint.team.in_(team_ids)
+        )
+    }
+    after_dates = {}
+    for team_id in team_ids:
+        checkpoint = checkpoints.get(team_id)
+        after_dates[team_id] = (
+            datetime.datetime.fromtimestamp(
+                checkpoint.updated_at, datetime.timezone.utc
+            )
+            if checkpoint and checkpoint.updated_at is not None
+            else default_after_date
+        )
+    return after_dates
+
+
+def get_track_cursors(team_ids: List[str]) -> Dict[str, int]:
+    """
+    Cursor of the next page of each team whose previous run was interrupted
+    after saving some pages of its feed.
+    """
+    return {
+        checkpoint.team_id: checkpoint.cursor
+        for checkpoint in TrackCheckpoint.select().where(
+            TrackCheckpoint.team.in_(team_ids) & TrackCheckpoint.cursor.is_null(False)
+        )
+    }
+
+
+def start_track_checkpoints(team_ids: List[str]):
+    """
+    Mark the checkpoints of the teams as running, keeping their updated_at and
+    the progress of an interrupted run.
+    """
+    with TrackCheckpoint._meta.database.atomic():
+        for team_id in team_ids:
+            TrackCheckpoint.insert(
+                team=team_id, status=TrackStatus.running
+            ).on_conflict(
+                conflict_target=[TrackCheckpoint.team],
+                update={TrackCheckpoint.status: TrackStatus.running},
+            ).execute()
+
+
+def save_track_checkpoint_page(team_id: str, updated_at: int | None, cursor: int):
+    """
+    Record that a page of the feed of a team is saved, so an interrupted run
+    resumes from cursor, the cursor of the next page. The updated_at of the
+    page is kept as run_updated_at until the run completes, since the next run
+    still has to fetch the remaining pages back to the previous checkpoint.
+    """
+    checkpoint: TrackCheckpoint = TrackCheckpoint.get_by_id(team_id)
+    checkpoint.run_updated_at = get_max_updated_at(
+        checkpoint.run_updated_at, updated_at
+    )
+    checkpoint.cursor = cursor
+    checkpoint.save()
+
+
+def complete_track_checkpoint(team_id: str, updated_at: int | None):
+    """
+    Move the checkpoint of a team forward to updated_at, or the highest
+    updated_at of the pages saved before, once the activities of its feed are
+    saved. The checkpoint never moves back, so a feed without new entries
+    keeps the previous checkpoint.
+    """
+    checkpoint: TrackCheckpoint | None = TrackCheckpoint.get_or_none(
+        TrackCheckpoint.team == team_id
+    )
+    if checkpoint:
+        updated_at = get_max_updated_at(
+            checkpoint.updated_at, checkpoint.run_updated_at, updated_at
+        )
+
+    TrackCheckpoint.replace(
+        team=team_id, updated_at=updated_at, status=TrackStatus.complete
+    ).execute()
+    logger.debug(f"Completed track checkpoint of team {team_id} at {updated_at}")
+
+
+def get_max_updated_at(*updated_ats: int | None) -> int | None:
+    return max(
+        (updated_at for updated_at in updated_ats if updated_at is not None),
+        default=None,
+    )
+
+
+def reset_track_checkpoints(team_ids: List[str] | None = None):
+    """
+    Delete the checkpoints of the teams, or of every team, so their feeds are
+    fetched back to the start of the challenge on the next run.
+    """
+    query = TrackCheckpoint.delete()
+    if team_ids is not None:
+        query = query.where(TrackCheckpoint.team.in_(team_ids))
+    query.execute()
@@ -1,17 +1,74 @@
+from contextlib import closing
 import logging
-from typing import List
+from typing import Dict, List, Set
 import datetime
 
-from tally.models.db import Config, Team, Activity
-from tally.actions.track.activity import get_activities
+from tally.models.db import Config, Team, Activity, User
+from tally.actions.track.activity import (
+    MAX_CONCURRENT_CLUB_FEEDS,
+    get_team_activities,
+    iterate_club_feed_pages,
+    iterate_club_feed_pages_in_batches,
+)
+from tally.actions.track.checkpoint import (
+    complete_track_checkpoint,
+    get_track_after_dates,
+    get_track_cursors,
+    save_track_checkpoint_page,
+    start_track_checkpoints,
+)
 from tally.services.strava import StravaService
-from tally.utils.date import get_start_of_day
+from tally.utils.date import get_start_of_day, get_local_date
+from tally.actions.score.materialized_score import update_daily_scores
+from tally.actions.score.score_cache import bump_data_version
 from tally.services.db import backup_db
+from tally.utils.user import get_user_time_zones
 
 
 logger = logging.getLogger(__name__)
 
 
+def save_team_activities(
+    activities: List[Activity],
+    challenge_start_time: datetime.datetime,
+    user_time_zones: Dict[str, str],
+    config: Config,
+) -> int:
+    """
+    Save the activities of a team and update the daily scores of their user
+    days.
+
+    :return: The number of saved activities.
+    """
+    saved_activity_count = 0
+    saved_user_dates = set()
+    for activity in activities:
+        # Drop activities that occurred before the challenge started
+        if activity.start_time < challenge_start_time:
+            continue
+
+        # Do not overwrite existing activities in DB to prevent edits made by
+        # the user and imported using the load action from being lost
+        Activity.insert(**activity.__data__).on_conflict_ignore().execute()
+
+        logger.debug(f"Saved {activity}")
+        saved_activity_count += 1
+        saved_user_dates.add(
+            (
+                activity.user_id,
+                get_local_date(
+                    activity.start_time,
+                    user_time_zones.get(activity.user_id, config.time_zone),
+                ),
+            )
+        )
+
+    update_daily_scores(saved_user_dates, config)
+    if saved_activity_count:
+        bump_data_version()
+    return saved_activity_count
+
+
 def track():
     config: Config | None = Config.select().first()
     if not config:
@@ -21,39 +78,72 @@ def track():
         return
 
     challenge_start_time = get_start_of_day(config.start_date, config.time_zone)
-    # Avoid fetching already saved activities
-    last_activity: Activity | None = (
-        Activity.select().order_by(Activity.start_time.desc()).first()
-    )
-    last_tracked_time = (
-        datetime.datetime.fromisoformat(last_activity.start_time)
-        if last_activity
-        else challenge_start_time
-    )
+    teams: Dict[str, Team] = {team.id: team for team in Team.select()}
+    # Each team is fetched back to its own checkpoint, so an active team does
+    # not move the cutoff of the other teams
+    club_after_dates = get_track_after_dates(list(teams), challenge_start_time)
+    # Teams whose previous run was interrupted continue from the page after the
+    # last one that was saved
+    club_cursors = get_track_cursors(list(teams))
 
-    teams: List[Team] = Team.select()
-    activities: List[Activity] = []
     print("Please wait, a browser window is opening...")
-    strava_service = StravaService()
+    strava_service = StravaService(
+        fetch_mode=config.strava_fetch_mode, http_pool_size=MAX_CONCURRENT_CLUB_FEEDS
+    )
     strava_service.login()
-    for team in teams:
-        print(f"Fetching activities for team {team.id}")
-        activities.extend(get_activities(strava_service, team, last_tracked_time))
-        print(f"Fetched {len(activities)} activities for team {team.id}")
+    print(
+        f"Fetching activities for {len(teams)} teams, with at most "
+        f"{config.requests_per_minute} requests per minute"
+    )
+    start_track_checkpoints(list(teams))
+    if strava_service.fetch_mode == "script":
+        club_feed_pages = iterate_club_feed_pages_in_batches(
+            strava_service, club_after_dates, config.requests_per_minute, club_cursors
+        )
+    else:
+        club_feed_pages = iterate_club_feed_pages(
+            strava_service, club_after_dates, config.requests_per_minute, club_cursors
+        )
 
     saved_activity_count = 0
-    for activity in activities:
-        # Drop activities that occurred before the challenge started
-        if activity.start_time < challenge_start_time:
-            continue
-
-        # Do not overwrite existing activities in DB to prevent edits made by
-        # the user and imported using the load action from being lost
-        Activity.insert(**activity.__data__).on_conflict_ignore().execute()
-
-        logger.debug(f"Saved {activity}")
-        saved_activity_count += 1
+    team_saved_activity_counts = dict.fromkeys(teams, 0)
+    team_activity_counts = dict.fromkeys(teams, 0)
+    team_user_ids: Dict[str, Set[str]] = {team_id: set() for team_id in teams}
+    for user in User.select(User.id, User.team):
+        team_user_ids[user.team_id].add(user.id)
+    user_time_zones = get_user_time_zones()
+    # Each page is saved as soon as it is fetched, on this thread since the
+    # fetching threads do not share the database connection. The checkpoint of
+    # a team is saved with every page, so an interrupted run resumes from the
+    # page it did not save. The pages are closed even if saving one fails, so
+    # the fetching threads stop right away instead of when the generator is
+    # garbage collected.
+    with closing(club_feed_pages):
+        for page in club_feed_pages:
+            team = teams[page.club_id]
+            page_activities = get_team_activities(
+                team, page.activities, team_user_ids[team.id]
+            )
+            with Activity._meta.database.atomic():
+                page_saved_activity_count = save_team_activities(
+                    page_activities, challenge_start_time, user_time_zones, config
+                )
+                if page.is_last:
+                    complete_track_checkpoint(team.id, page.updated_at)
+                else:
+                    save_track_checkpoint_page(
+                        team.id, page.updated_at, page.next_cursor
+                    )
+            saved_activity_count += page_saved_activity_count
+            team_saved_activity_counts[team.id] += page_saved_activity_count
+            team_activity_counts[team.id] += len(page_activities)
+            if page.is_last:
+                print(
+                    f"Saved {team_saved_activity_counts[team.id]} of "
+                    f"{team_activity_counts[team.id]} activities "
+                    f"for team {team.id} after {club_after_dates[team.id]}"
+                )
 
-    print(f"Saved {saved_activity_count} activities after {last_tracked_time}")
+    print(f"Saved {saved_activity_count} activities")
 
     backup_db()
@@ -1,41 +1,29 @@
 import questionary
 import logging
-import sys
-from pathlib import Path
+import multiprocessing
 import traceback
 
 from tally.actions.initialize.initialize import initialize
+from tally.actions.initialize.create_tables import create_tables
 from tally.actions.reset.reset import reset
 from tally.actions.track.track import track
 from tally.actions.score.score import score
+from tally.actions.simulate.simulate import simulate
 from tally.actions.export.export import export
 from tally.actions.load.load import load
-from tally.utils.date import get_file_timestamp
-
-
-def configure_logging():
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
-    stdout_handler = logging.StreamHandler(sys.stdout)
-    stdout_handler.setFormatter(formatter)
-    stdout_handler.setLevel(logging.ERROR)
-
-    Path("logs").mkdir(exist_ok=True)
-    file_handler = logging.FileHandler(f"logs/tally_{get_file_timestamp()}.log")
-    file_handler.setFormatter(formatter)
-    file_handler.setLevel(logging.DEBUG)
-
-    logging.basicConfig(level=logging.DEBUG, handlers=[stdout_handler, file_handler])
+from tally.actions.recompute.recompute import recompute
+from tally.utils.log import configure_logging
 
 
 actions = {
     "initialize": "Configure challenge",
     "track": "Track activities",
     "score": "Calculate scores",
+    "simulate": "Compare point schedules",
     "reset": "Delete all data",
     "export": "Export activity data",
     "load": "Import activity data",
+    "recompute": "Recalculate activity time",
     "exit": "Exit",
 }
 
@@ -61,6 +49,9 @@ def app():
     configure_logging()
     logger = logging.getLogger(__name__)
 
+    # Databases created by older versions may be missing newer tables
+    create_tables()
+
     should_exit = False
     while not should_exit:
         action = prompt_action()
@@ -71,12 +62,16 @@ def app():
                 track()
             elif action == actions["score"]:
                 score()
+            elif action == actions["simulate"]:
+                simulate()
             elif action == actions["reset"]:
                 reset()
             elif action == actions["export"]:
                 export()
             elif action == actions["load"]:
                 load()
+            elif action == actions["recompute"]:
+                recompute()
             elif action == actions["exit"] or not action:
                 should_exit = True
         except Exception:
@@ -87,4 +82,6 @@ def app():
 
 
 if __name__ == "__main__":
+    # Lets the process pool of parallel_score start workers in a frozen build
+    multiprocessing.freeze_support()
     app()
@@ -0,0 +1,93 @@
+from typing import List
+import argparse
+import datetime
+import logging
+import multiprocessing
+import sys
+import traceback
+
+from tally.utils.log import configure_logging
+
+
+def parse_date(date: str) -> datetime.date:
+    try:
+        return datetime.datetime.strptime(date, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid date {date}, must be in the format YYYY-MM-DD"
+        )
+
+
+def get_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="tally",
+        description="A fitness challenge score tracker. Run without a command "
+        "to use the interactive menu.",
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    score_parser = commands.add_parser(
+        "score", help="Calculate team scores without prompts, for scheduled runs"
+    )
+    score_parser.add_argument(
+        "--start-date",
+        type=parse_date,
+        help="First date of the score period (YYYY-MM-DD), by default the start "
+        "of the challenge",
+    )
+    score_parser.add_argument(
+        "--end-date",
+        type=parse_date,
+        help="Last date of the score period (YYYY-MM-DD), by default yesterday",
+    )
+    score_parser.add_argument(
+        "--output",
+        help="File to save the team scores to, by default they are written to "
+        "stdout",
+    )
+    score_parser.add_argument(
+        "--format",
+        choices=["csv", "json"],
+        help="Format of the team scores, by default json for an output file "
+        "ending in .json and csv otherwise",
+    )
+    return parser
+
+
+def run_score_command(args: argparse.Namespace) -> int:
+    # Only the modules needed for scoring are imported, so the prompt and file
+    # dialog libraries of the interactive menu are never loaded
+    from tally.actions.initialize.create_tables import create_tables
+    from tally.actions.score.headless_score import score_headless
+
+    output_format = args.format or (
+        "json" if args.output and args.output.endswith(".json") else "csv"
+    )
+    create_tables()
+    is_saved = score_headless(
+        args.start_date, args.end_date, args.output, output_format
+    )
+    return 0 if is_saved else 1
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = get_argument_parser().parse_args(argv)
+    if not args.command:
+        from tally.cli import app
+
+        app()
+        return 0
+
+    configure_logging(sys.stderr)
+    logger = logging.getLogger(__name__)
+    try:
+        return run_score_command(args)
+    except Exception:
+        logger.error(f"Failed to run command {args.command}:\n{traceback.format_exc()}")
+        return 1
+
+
+if __name__ == "__main__":
+    # Before anything else, see tally/__main__.py
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -1,6 +1,25 @@
 from .activity import Activity
 from .config import Config
+from .daily_score_state import DailyScoreState
+from .data_version import DataVersion
+from .point_schedule_config import PointScheduleConfig
+from .score_cache_entry import ScoreCacheEntry
 from .team import Team
+from .team_day_score import TeamDayScore
+from .track_checkpoint import TrackCheckpoint
 from .user import User
+from .user_day_score import UserDayScore
 
-ALL_MODELS = [Activity, Config, Team, User]
+ALL_MODELS = [
+    Activity,
+    Config,
+    DailyScoreState,
+    DataVersion,
+    PointScheduleConfig,
+    ScoreCacheEntry,
+    Team,
+    TeamDayScore,
+    TrackCheckpoint,
+    User,
+    UserDayScore,
+]
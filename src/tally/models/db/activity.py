@@ -12,6 +12,14 @@ class Activity(BaseModel):
     moving_seconds = IntegerField(null=True)
     title = CharField()
     workout_type = CharField()
+    # Effective active seconds from calculate_activity_active_seconds, stored
+    # when the activity is written so scoring reads a single column
+    active_seconds = IntegerField(null=True)
+
+    class Meta:
+        # Covers the per user day aggregation of active seconds, so scoring
+        # reads the index instead of the table
+        indexes = ((("user", "start_time", "active_seconds"), False),)
 
     def as_dict(self):
         return {
@@ -22,6 +30,7 @@ class Activity(BaseModel):
             "moving_seconds": self.moving_seconds,
             "title": self.title,
             "workout_type": self.workout_type,
+            "active_seconds": self.active_seconds,
         }
 
     def __str__(self):
@@ -33,7 +42,8 @@ class Activity(BaseModel):
             f"elapsed_seconds={self.elapsed_seconds}, "
             f"moving_seconds={self.moving_seconds}, "
             f"title={self.title}, "
-            f"workout_type={self.workout_type})"
+            f"workout_type={self.workout_type}, "
+            f"active_seconds={self.active_seconds})"
         )
 
     def __repr__(self):
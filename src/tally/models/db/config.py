@@ -1,4 +1,4 @@
-from peewee import CharField, DateField
+from peewee import CharField, DateField, IntegerField
 
 from .base import BaseModel
 
@@ -7,3 +7,8 @@ class Config(BaseModel):
     challenge_name = CharField()
     start_date = DateField()
     time_zone = CharField()
+    # Budget of Strava club feed requests shared by all teams when tracking,
+    # by default one request every 5 seconds
+    requests_per_minute = IntegerField(default=12)
+    # How Strava feed pages are requested after logging in, see StravaService
+    strava_fetch_mode = CharField(default="http")
@@ -0,0 +1,14 @@
+from peewee import CharField, DateField
+
+from .base import BaseModel
+
+
+class DailyScoreState(BaseModel):
+    """
+    The challenge start date and time zone that the UserDayScore and
+    TeamDayScore tables were built for. The tables are rebuilt when these no
+    longer match the challenge config.
+    """
+
+    start_date = DateField()
+    time_zone = CharField()
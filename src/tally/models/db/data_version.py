@@ -0,0 +1,12 @@
+from peewee import CharField
+
+from .base import BaseModel
+
+
+class DataVersion(BaseModel):
+    """
+    A random stamp that is replaced whenever the challenge data changes, so
+    results computed from the data can be cached against it.
+    """
+
+    stamp = CharField()
@@ -0,0 +1,12 @@
+from peewee import TextField
+
+from .base import BaseModel
+
+
+class PointScheduleConfig(BaseModel):
+    """
+    The point schedule of the challenge, stored as the JSON of a
+    PointScheduleRules. The default schedule is used when there is no row.
+    """
+
+    rules = TextField()
@@ -0,0 +1,16 @@
+from peewee import CharField, IntegerField, TextField
+
+from .base import BaseModel
+
+
+class ScoreCacheEntry(BaseModel):
+    """
+    Team scores of a score period, stored as JSON (team_id, points) pairs under
+    a hash of the data version and the score config.
+    """
+
+    key = CharField(primary_key=True)
+    team_scores = TextField()
+    # Increases on every read or write, so the least recently used entries are
+    # evicted first
+    last_used = IntegerField(index=True)
@@ -0,0 +1,33 @@
+from peewee import CompositeKey, DateField, ForeignKeyField, IntegerField
+
+from .base import BaseModel
+from .team import Team
+
+
+class TeamDayScore(BaseModel):
+    """
+    Materialized score for a team on a local day of the challenge. Rows only
+    exist for days where at least one member of the team has active time.
+    """
+
+    team = ForeignKeyField(Team, backref="day_scores")
+    date = DateField()
+    points = IntegerField()
+    active_user_count = IntegerField()
+    bonus_points = IntegerField()
+
+    class Meta:
+        primary_key = CompositeKey("team", "date")
+
+    def __str__(self):
+        return (
+            f"TeamDayScore("
+            f"team={self.team_id}, "
+            f"date={self.date}, "
+            f"points={self.points}, "
+            f"active_user_count={self.active_user_count}, "
+            f"bonus_points={self.bonus_points})"
+        )
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,36 @@
+from peewee import CharField, ForeignKeyField, IntegerField
+
+from .base import BaseModel
+from .team import Team
+
+
+class TrackCheckpoint(BaseModel):
+    """
+    Progress of tracking the club feed of a team. updated_at is the highest
+    cursorData.updated_at of the feed entries saved for the team, so the next
+    run stops paginating the feed once it reaches it. The status is "running"
+    while a run has not saved every page of the feed of the team yet, and
+    "complete" afterwards.
+
+    While running, cursor is the cursor of the next page to save and
+    run_updated_at the highest updated_at of the pages saved so far, so an
+    interrupted run is resumed from the page it stopped at.
+    """
+
+    team = ForeignKeyField(Team, primary_key=True, backref="track_checkpoints")
+    updated_at = IntegerField(null=True)
+    status = CharField()
+    cursor = IntegerField(null=True)
+    run_updated_at = IntegerField(null=True)
+
+    def __str__(self):
+        return (
+            f"TrackCheckpoint("
+            f"team={self.team_id}, "
+            f"updated_at={self.updated_at}, "
+            f"status={self.status}, "
+            f"cursor={self.cursor})"
+        )
+
+    def __repr__(self):
+        return self.__str__()
@@ -8,9 +8,18 @@ class User(BaseModel):
     id = CharField(primary_key=True)
     name = CharField()
     team = ForeignKeyField(Team, backref="users")
+    # Daily scores of the user are bucketed in this time zone instead of the
+    # time zone of the challenge when it is set
+    time_zone = CharField(null=True)
 
     def __str__(self):
-        return f"User(" f"id={self.id}, " f"name={self.name}, " f"team={self.team})"
+        return (
+            f"User("
+            f"id={self.id}, "
+            f"name={self.name}, "
+            f"team={self.team}, "
+            f"time_zone={self.time_zone})"
+        )
 
     def __repr__(self):
         return self.__str__()
@@ -0,0 +1,33 @@
+from peewee import CompositeKey, DateField, ForeignKeyField, IntegerField
+
+from .base import BaseModel
+from .user import User
+
+
+class UserDayScore(BaseModel):
+    """
+    Materialized score for a user on a local day of the challenge. Rows only
+    exist for days where the user has active time.
+    """
+
+    user = ForeignKeyField(User, backref="day_scores")
+    date = DateField()
+    active_seconds = IntegerField()
+    streak = IntegerField()
+    points = IntegerField()
+
+    class Meta:
+        primary_key = CompositeKey("user", "date")
+
+    def __str__(self):
+        return (
+            f"UserDayScore("
+            f"user={self.user_id}, "
+            f"date={self.date}, "
+            f"active_seconds={self.active_seconds}, "
+            f"streak={self.streak}, "
+            f"points={self.points})"
+        )
+
+    def __repr__(self):
+        return self.__str__()
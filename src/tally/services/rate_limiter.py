@@ -0,0 +1,41 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Rate limiter shared by concurrent requests. Tokens are added continuously
+    at rate_per_minute, up to capacity, and each request takes one token,
+    waiting until one is available. A capacity of 1 spaces requests evenly,
+    whereas a larger capacity allows short bursts after idle periods.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: int = 1):
+        if rate_per_minute <= 0:
+            raise ValueError("The rate must be greater than 0")
+        if capacity < 1:
+            raise ValueError("The capacity must be at least 1")
+
+        self.interval_seconds = 60 / rate_per_minute
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity,
+                    self.tokens + (now - self.updated_at) / self.interval_seconds,
+                )
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_seconds = (1 - self.tokens) * self.interval_seconds
+
+            # Sleep outside the lock, so other threads can take tokens that are
+            # added in the meantime
+            time.sleep(wait_seconds)
@@ -1,5 +1,8 @@
+from typing import List, Literal, Tuple
 import logging
 import json
+import threading
+import urllib3
 from pydantic import ValidationError
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -17,6 +20,35 @@ from tally.models.validation.club_feed import FeedResponse
 logger = logging.getLogger(__name__)
 
 
+StravaFetchMode = Literal["http", "browser", "script"]
+
+# Fetches each URL in the logged in page and passes the status and parsed JSON
+# of every response back to Selenium at once
+FETCH_JSON_SCRIPT = """
+const urls = arguments[0];
+const done = arguments[arguments.length - 1];
+Promise.all(
+    urls.map((url) =>
+        fetch(url, {
+            credentials: "include",
+            redirect: "manual",
+            headers: {
+                Accept: "application/json",
+                "X-Requested-With": "XMLHttpRequest",
+            },
+        })
+            .then((response) =>
+                response.status === 200
+                    ? response.json().then((body) => ({ status: 200, body }))
+                    : { status: response.status, body: null }
+            )
+            .catch((error) => ({ status: 0, body: null, error: String(error) }))
+    )
+).then(done);
+"""
+FETCH_JSON_SCRIPT_TIMEOUT_SECONDS = 120
+
+
 class StravaService:
     """
     The StravaService uses Selenium to fetch data from Strava instead of using
@@ -24,45 +56,118 @@ class StravaService:
     to obtain more detailed activity data compared with the Strava API. It
     requires the user to manually log in to Strava each time this service is
     created.
+
+    The browser is only needed for the interactive login. In the "http" fetch
+    mode, the session cookies are then handed to a pool of keep-alive HTTP
+    connections that read the JSON pages directly, without rendering them. In
+    the "browser" fetch mode, every page is loaded in the browser. In the
+    "script" fetch mode, get_club_feeds requests several pages with fetch()
+    inside the logged in page, in a single WebDriver round trip.
+
+    The service can be shared by threads. A browser session loads one page at
+    a time, so in the "browser" fetch mode concurrent requests are queued for
+    the browser, while the HTTP pool has a connection for each of
+    http_pool_size concurrent requests.
     """
 
-    def __init__(self):
-        self.driver: webdriver.Chrome = webdriver.Chrome(
+    def __init__(self, fetch_mode: StravaFetchMode = "http", http_pool_size: int = 4):
+        # Set before starting the browser, which may fail, so __del__ can run
+        self.driver: webdriver.Chrome | None = None
+        self.http_client: urllib3.PoolManager | None = None
+        self.is_logged_in = False
+        self.driver_lock = threading.Lock()
+        self.fetch_mode = fetch_mode
+        self.http_pool_size = http_pool_size
+        self.driver = webdriver.Chrome(
             service=Service(ChromeDriverManager().install()), options=Options()
         )
-        self.is_logged_in = False
 
     def get_club_feed(self, club_id: str, cursor: str = None) -> FeedResponse:
         self.login()
 
         logger.debug(f"Getting club feed for club {club_id} with cursor {cursor}")
         try:
-            feed_json = self._get_json_content(
-                f"https://www.strava.com/clubs/{club_id}/feed",
-                params={
-                    "feed_type": "club",
-                    "club_id": club_id,
-                    "before": cursor,
-                    "cursor": cursor,
-                },
+            feed_json = self._get_json_content(self._get_club_feed_url(club_id, cursor))
+        except Exception:
+            raise Exception(f"Failed to get activities for club {club_id}")
+
+        return self._parse_club_feed(club_id, feed_json)
+
+    def get_club_feeds(
+        self, feed_pages: List[Tuple[str, str | None]]
+    ) -> List[FeedResponse]:
+        """
+        Get several club feed pages. In the "script" fetch mode, the pages are
+        requested in parallel inside the browser and returned in one WebDriver
+        round trip, otherwise they are requested one after another.
+
+        :param feed_pages: (club_id, cursor) of each page.
+
+        :return: The feed of each page, in the same order.
+        """
+        if self.fetch_mode != "script":
+            return [
+                self.get_club_feed(club_id, cursor) for club_id, cursor in feed_pages
+            ]
+
+        self.login()
+
+        logger.debug(f"Getting club feed pages {feed_pages}")
+        with self.driver_lock:
+            self.driver.set_script_timeout(FETCH_JSON_SCRIPT_TIMEOUT_SECONDS)
+            responses = self.driver.execute_async_script(
+                FETCH_JSON_SCRIPT,
+                [
+                    self._get_club_feed_url(club_id, cursor)
+                    for club_id, cursor in feed_pages
+                ],
             )
 
+        feeds = []
+        for (club_id, cursor), response in zip(feed_pages, responses):
+            if response["status"] != 200:
+                logger.debug(
+                    f"Request for club {club_id} with cursor {cursor} failed with "
+                    f"status {response['status']} {response.get('error', '')}"
+                )
+                raise Exception(f"Failed to get activities for club {club_id}")
+            feeds.append(self._parse_club_feed(club_id, response["body"]))
+        return feeds
+
+    def _get_club_feed_url(self, club_id: str, cursor: str | None) -> str:
+        params = {
+            "feed_type": "club",
+            "club_id": club_id,
+            "before": cursor,
+            "cursor": cursor,
+        }
+        # Ensure params that are None are not included in the URL
+        formatted_params = urlencode({k: v for k, v in params.items() if v is not None})
+        return f"https://www.strava.com/clubs/{club_id}/feed?{formatted_params}"
+
+    def _parse_club_feed(self, club_id: str, feed_json: dict) -> FeedResponse:
+        try:
             return FeedResponse.model_validate(feed_json)
         except ValidationError:
             logger.debug(
                 f"Failed to parse feed response for club {club_id}:\n{feed_json}"
             )
             raise Exception(f"Failed to parse feed response for club {club_id}")
-        except Exception:
-            raise Exception(f"Failed to get activities for club {club_id}")
 
-    def _get_json_content(self, url: str, params: dict) -> str:
-        # Ensure params that are None are not included in the URL
-        formatted_params = urlencode({k: v for k, v in params.items() if v is not None})
-        url_with_params = f"{url}?{formatted_params}" if formatted_params else url
+    def _get_json_content(self, url_with_params: str) -> dict:
+        if self.http_client:
+            response = self.http_client.request("GET", url_with_params, redirect=False)
+            # An expired session is redirected to the login page
+            if response.status != 200:
+                raise Exception(
+                    f"Request to {url_with_params} failed with status "
+                    f"{response.status}"
+                )
+            return json.loads(response.data)
 
-        self.driver.get(url_with_params)
-        return json.loads(self.driver.find_element(By.TAG_NAME, "pre").text)
+        with self.driver_lock:
+            self.driver.get(url_with_params)
+            return json.loads(self.driver.find_element(By.TAG_NAME, "pre").text)
 
     def login(self) -> None:
         if self.is_logged_in:
@@ -90,6 +195,32 @@ class StravaService:
             raise Exception("Failed to log in to Strava")
 
         print("Login successful")
+        if self.fetch_mode == "http":
+            self.http_client = self._create_http_client()
+
+    def _create_http_client(self) -> urllib3.PoolManager:
+        """
+        Connection pool that sends the cookies and user agent of the logged in
+        browser session, so requests are made as the logged in user.
+        """
+        cookies = "; ".join(
+            f"{cookie['name']}={cookie['value']}"
+            for cookie in self.driver.get_cookies()
+        )
+        user_agent = self.driver.execute_script("return navigator.userAgent")
+        return urllib3.PoolManager(
+            maxsize=self.http_pool_size,
+            block=True,
+            headers={
+                "Accept": "application/json",
+                "Cookie": cookies,
+                "User-Agent": user_agent,
+                "X-Requested-With": "XMLHttpRequest",
+            },
+        )
 
     def __del__(self):
-        self.driver.quit()
+        if self.http_client:
+            self.http_client.clear()
+        if self.driver:
+            self.driver.quit()
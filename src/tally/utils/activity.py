@@ -1,10 +1,12 @@
+from peewee import Case, Cast, ColumnBase, fn
+
 from tally.models.db import Activity
 
 
 MOVING_TIME_ACTIVITY_TYPES = ["Walk", "Run", "EBikeRide", "Ride", "Hike"]
 
 
-def get_activity_active_seconds(activity: Activity) -> int:
+def calculate_activity_active_seconds(activity: Activity) -> int:
     """
     The time spent in the activity that counts when calculating the score.
 
@@ -21,5 +23,54 @@ def get_activity_active_seconds(activity: Activity) -> int:
     return activity.elapsed_seconds
 
 
+def get_activity_active_seconds(activity: Activity) -> int:
+    """
+    The active seconds stored with the activity, or calculated for activities
+    that have not been saved yet.
+    """
+
+    if activity.active_seconds is not None:
+        return activity.active_seconds
+    return calculate_activity_active_seconds(activity)
+
+
+def calculate_activity_active_seconds_expression() -> ColumnBase:
+    """
+    SQL equivalent of calculate_activity_active_seconds, for recalculating the
+    stored active seconds of many activities at once.
+    """
+
+    return Case(
+        None,
+        [
+            (
+                Activity.workout_type.in_(MOVING_TIME_ACTIVITY_TYPES)
+                & Activity.moving_seconds.is_null(False),
+                Activity.moving_seconds,
+            )
+        ],
+        Activity.elapsed_seconds,
+    )
+
+
+def get_activity_active_seconds_expression() -> ColumnBase:
+    """
+    SQL equivalent of get_activity_active_seconds, for aggregating active time
+    in the database instead of in Python.
+    """
+
+    return fn.COALESCE(
+        Activity.active_seconds, calculate_activity_active_seconds_expression()
+    )
+
+
+def get_activity_start_timestamp_expression() -> ColumnBase:
+    """
+    SQL expression for the UTC timestamp of the activity start time in seconds.
+    """
+
+    return Cast(fn.strftime("%s", Activity.start_time), "INTEGER")
+
+
 def get_activity_link(activity: Activity) -> str:
     return f"https://www.strava.com/activities/{activity.id}"
@@ -1,8 +1,8 @@
 import datetime
-import pytz
-import questionary
 import re
 
+from tally.utils.time_zone import get_time_zone_offset_table
+
 
 ONE_HOUR_IN_SECONDS = 3600
 ONE_MINUTE_IN_SECONDS = 60
@@ -17,8 +17,7 @@ def date_validator(date: str) -> str | bool:
 
 
 def get_start_of_day(date: datetime.date, time_zone: str) -> datetime.datetime:
-    date_with_time = datetime.datetime.combine(date, datetime.datetime.min.time())
-    return pytz.timezone(time_zone).localize(date_with_time)
+    return get_time_zone_offset_table(time_zone).get_start_of_day(date)
 
 
 def get_previous_day(date: datetime.date) -> datetime.date:
@@ -29,22 +28,8 @@ def get_file_timestamp() -> str:
     return datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
 
 
-def prompt_date(
-    message: str, defaultDate: datetime.date | None
-) -> datetime.date | None:
-    date = questionary.text(
-        message,
-        validate=date_validator,
-        default=defaultDate.strftime("%Y-%m-%d") if defaultDate else "",
-    ).ask()
-    if not date:
-        return None
-
-    return datetime.datetime.strptime(date, "%Y-%m-%d").date()
-
-
 def get_local_date(date: datetime.date, time_zone: str) -> datetime.date:
-    return date.astimezone(pytz.timezone(time_zone)).date()
+    return get_time_zone_offset_table(time_zone).get_local_date(date.timestamp())
 
 
 def format_duration(seconds: int) -> str:
@@ -5,6 +5,7 @@ from typing import List, TextIO, Tuple
 
 class FileType:
     csv = ("CSV files", "*.csv")
+    json = ("JSON files", "*.json")
 
 
 def prompt_save_file(
@@ -45,3 +46,23 @@ def prompt_select_file(
         print(f"Selected file: {path}")
 
     return path
+
+
+def prompt_select_files(
+    file_description: str, file_types: List[Tuple[str, str]]
+) -> List[str]:
+    root = tkinter.Tk()
+    # Prevents the tkinter window from appearing
+    root.withdraw()
+
+    paths = filedialog.askopenfilenames(
+        title=f"Select the {file_description}",
+        filetypes=file_types,
+    )
+
+    root.destroy()
+
+    for path in paths:
+        print(f"Selected file: {path}")
+
+    return list(paths)
@@ -0,0 +1,22 @@
+from typing import TextIO
+import logging
+import sys
+from pathlib import Path
+
+from tally.utils.date import get_file_timestamp
+
+
+def configure_logging(stream: TextIO = sys.stdout):
+    formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(formatter)
+    stream_handler.setLevel(logging.ERROR)
+
+    Path("logs").mkdir(exist_ok=True)
+    file_handler = logging.FileHandler(f"logs/tally_{get_file_timestamp()}.log")
+    file_handler.setFormatter(formatter)
+    file_handler.setLevel(logging.DEBUG)
+
+    logging.basicConfig(level=logging.DEBUG, handlers=[stream_handler, file_handler])
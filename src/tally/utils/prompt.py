@@ -0,0 +1,18 @@
+import datetime
+import questionary
+
+from tally.utils.date import date_validator
+
+
+def prompt_date(
+    message: str, defaultDate: datetime.date | None
+) -> datetime.date | None:
+    date = questionary.text(
+        message,
+        validate=date_validator,
+        default=defaultDate.strftime("%Y-%m-%d") if defaultDate else "",
+    ).ask()
+    if not date:
+        return None
+
+    return datetime.datetime.strptime(date, "%Y-%m-%d").date()
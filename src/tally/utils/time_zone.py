@@ -0,0 +1,172 @@
+from functools import lru_cache
+from typing import List, Tuple
+import bisect
+import datetime
+import numpy as np
+import pytz
+
+
+ONE_DAY_IN_SECONDS = 86400
+UNIX_EPOCH_DATE = datetime.date(1970, 1, 1)
+# Extra range added around requested timestamps when the offset table is
+# extended, so neighbouring conversions do not each extend the table
+OFFSET_TABLE_PADDING_SECONDS = 90 * ONE_DAY_IN_SECONDS
+
+
+def get_utc_offset_seconds(timestamp: int, time_zone: str) -> int:
+    local_time = datetime.datetime.fromtimestamp(timestamp, pytz.timezone(time_zone))
+    return int(local_time.utcoffset().total_seconds())
+
+
+def get_utc_offset_transitions(
+    time_zone: str, start_timestamp: int, end_timestamp: int
+) -> List[Tuple[int, int]]:
+    """
+    Returns (timestamp, offset) pairs where the UTC offset of the time zone
+    changes between the two UTC timestamps. The first pair is always the offset
+    at start_timestamp and each offset applies until the next pair's timestamp.
+
+    Offsets are sampled once per day and each change is narrowed down to the
+    exact second, so the number of pytz conversions depends on the length of the
+    range rather than on the number of timestamps being converted.
+    """
+    transitions = [
+        (start_timestamp, get_utc_offset_seconds(start_timestamp, time_zone))
+    ]
+    sample_start = start_timestamp
+    while sample_start < end_timestamp:
+        sample_end = min(sample_start + ONE_DAY_IN_SECONDS, end_timestamp)
+        sample_end_offset = get_utc_offset_seconds(sample_end, time_zone)
+        if sample_end_offset != transitions[-1][1]:
+            # Find the first second that uses the new offset
+            low, high = sample_start, sample_end
+            while high - low > 1:
+                middle = (low + high) // 2
+                if get_utc_offset_seconds(middle, time_zone) == sample_end_offset:
+                    high = middle
+                else:
+                    low = middle
+            transitions.append((high, sample_end_offset))
+        sample_start = sample_end
+
+    return transitions
+
+
+class TimeZoneOffsetTable:
+    """
+    Precomputed UTC offsets of a time zone over a range of UTC timestamps. Maps
+    timestamps to local days with a binary search over the offset transitions
+    instead of a pytz conversion per timestamp. The range is extended whenever a
+    timestamp outside of it is converted.
+    """
+
+    def __init__(self, time_zone: str):
+        self.time_zone = time_zone
+        self.start_timestamp = 0
+        self.end_timestamp = 0
+        self.transition_timestamps: List[int] = []
+        self.offsets: List[int] = []
+        self.transition_timestamp_array = np.array([], dtype=np.int64)
+        self.offset_array = np.array([], dtype=np.int64)
+
+    def ensure_range(self, start_timestamp: int, end_timestamp: int):
+        if (
+            self.transition_timestamps
+            and self.start_timestamp <= start_timestamp
+            and end_timestamp <= self.end_timestamp
+        ):
+            return
+
+        if self.transition_timestamps:
+            start_timestamp = min(start_timestamp, self.start_timestamp)
+            end_timestamp = max(end_timestamp, self.end_timestamp)
+        self.start_timestamp = int(start_timestamp) - OFFSET_TABLE_PADDING_SECONDS
+        self.end_timestamp = int(end_timestamp) + OFFSET_TABLE_PADDING_SECONDS
+
+        transitions = get_utc_offset_transitions(
+            self.time_zone, self.start_timestamp, self.end_timestamp
+        )
+        self.transition_timestamps = [timestamp for timestamp, _ in transitions]
+        self.offsets = [offset for _, offset in transitions]
+        self.transition_timestamp_array = np.array(
+            self.transition_timestamps, dtype=np.int64
+        )
+        self.offset_array = np.array(self.offsets, dtype=np.int64)
+
+    def get_transitions(
+        self, start_timestamp: int, end_timestamp: int
+    ) -> List[Tuple[int, int]]:
+        """
+        Same as get_utc_offset_transitions, using the precomputed table.
+        """
+        self.ensure_range(start_timestamp, end_timestamp)
+        first_index = bisect.bisect_right(self.transition_timestamps, start_timestamp)
+        last_index = bisect.bisect_left(self.transition_timestamps, end_timestamp)
+        return [(start_timestamp, self.offsets[first_index - 1])] + [
+            (self.transition_timestamps[index], self.offsets[index])
+            for index in range(first_index, last_index)
+        ]
+
+    def get_utc_offset(self, timestamp: float) -> int:
+        self.ensure_range(timestamp, timestamp)
+        index = bisect.bisect_right(self.transition_timestamps, timestamp) - 1
+        return self.offsets[index]
+
+    def get_local_day_number(self, timestamp: float) -> int:
+        """
+        Number of days between the Unix epoch and the local date of a timestamp.
+        """
+        return int((timestamp + self.get_utc_offset(timestamp)) // ONE_DAY_IN_SECONDS)
+
+    def get_local_date(self, timestamp: float) -> datetime.date:
+        return UNIX_EPOCH_DATE + datetime.timedelta(
+            days=self.get_local_day_number(timestamp)
+        )
+
+    def get_local_day_numbers(self, timestamps: np.ndarray) -> np.ndarray:
+        """
+        Array equivalent of get_local_day_number.
+        """
+        if len(timestamps) == 0:
+            return np.array([], dtype=np.int64)
+
+        self.ensure_range(timestamps.min(), timestamps.max())
+        indices = np.searchsorted(self.transition_timestamp_array, timestamps, "right")
+        offsets = self.offset_array[indices - 1]
+        return np.floor_divide(timestamps + offsets, ONE_DAY_IN_SECONDS).astype(
+            np.int64
+        )
+
+    def get_start_of_day(self, date: datetime.date) -> datetime.datetime:
+        """
+        The first moment of a local date. Falls back to pytz when midnight is
+        skipped or repeated by a transition, so the result always matches
+        pytz's localize.
+        """
+        local_midnight = (date - UNIX_EPOCH_DATE).days * ONE_DAY_IN_SECONDS
+        self.ensure_range(
+            local_midnight - ONE_DAY_IN_SECONDS, local_midnight + ONE_DAY_IN_SECONDS
+        )
+
+        nearby_offsets = {
+            self.get_utc_offset(local_midnight - ONE_DAY_IN_SECONDS),
+            self.get_utc_offset(local_midnight + ONE_DAY_IN_SECONDS),
+        }
+        matching_offsets = [
+            offset
+            for offset in nearby_offsets
+            if self.get_utc_offset(local_midnight - offset) == offset
+        ]
+        if len(matching_offsets) != 1:
+            date_with_time = datetime.datetime.combine(date, datetime.time.min)
+            return pytz.timezone(self.time_zone).localize(date_with_time)
+
+        offset = matching_offsets[0]
+        return datetime.datetime.fromtimestamp(
+            local_midnight - offset, pytz.timezone(self.time_zone)
+        )
+
+
+@lru_cache(maxsize=None)
+def get_time_zone_offset_table(time_zone: str) -> TimeZoneOffsetTable:
+    return TimeZoneOffsetTable(time_zone)
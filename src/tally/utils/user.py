@@ -1,5 +1,39 @@
+from typing import Dict, List
+
 from tally.models.db import User
 
 
 def get_user_link(user: User) -> str:
     return f"https://www.strava.com/athletes/{user.id}"
+
+
+def get_user_time_zone(user: User, default_time_zone: str) -> str:
+    return user.time_zone or default_time_zone
+
+
+def get_user_time_zones() -> Dict[str, str]:
+    """
+    Time zones of the users that have their own time zone, by user ID.
+    """
+    return dict(
+        User.select(User.id, User.time_zone)
+        .where(User.time_zone.is_null(False))
+        .tuples()
+    )
+
+
+def get_time_zones(default_time_zone: str) -> List[str]:
+    """
+    The default time zone followed by every other time zone of a user.
+    """
+    time_zones = [default_time_zone]
+    for (time_zone,) in (
+        User.select(User.time_zone)
+        .where(User.time_zone.is_null(False))
+        .distinct()
+        .order_by(User.time_zone)
+        .tuples()
+    ):
+        if time_zone not in time_zones:
+            time_zones.append(time_zone)
+    return time_zones
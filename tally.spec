@@ -1,8 +1,10 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+# Same entry point as the tally console script, so the executable has both the
+# interactive menu and the headless commands
 a = Analysis(
-    ['src/tally/cli.py'],
-    pathex=[],
+    ['src/tally/__main__.py'],
+    pathex=['src'],
     binaries=[],
     datas=[],
     hiddenimports=[],
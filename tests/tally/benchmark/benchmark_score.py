@@ -0,0 +1,201 @@
+"""
+Benchmarks for the scoring pipeline on synthetic challenges.
+
+Run from the repository root:
+
+    python -m tests.tally.benchmark.benchmark_score --size medium
+    python -m tests.tally.benchmark.benchmark_score --size medium --update-baseline
+
+Results are compared with the baselines in baselines.json and the command exits
+with status 1 if a stage is slower or uses more memory than its baseline allows.
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+import argparse
+import datetime
+import json
+import sys
+import time
+import tracemalloc
+from peewee import SqliteDatabase
+
+from tally.models.db import ALL_MODELS, Activity, Team, User
+from tally.actions.score.score_config import ScoreConfig
+from tally.actions.score.user_active_time import get_user_active_time
+from tally.actions.score.user_score import get_user_daily_score
+from tally.actions.score.team_score import (
+    get_team_daily_score,
+    get_team_cumulative_score,
+)
+from tally.actions.score.vectorized_score import get_aggregated_team_cumulative_score
+from tally.actions.score.streaming_score import get_streaming_team_cumulative_score
+from tests.tally.mocks.mock_challenge import create_challenge
+
+
+BASELINE_PATH = Path(__file__).parent / "baselines.json"
+BENCHMARK_SIZES = {
+    "small": {
+        "team_count": 10,
+        "user_count": 100,
+        "day_count": 14,
+        "activities_per_day": 1.0,
+    },
+    "medium": {
+        "team_count": 50,
+        "user_count": 1000,
+        "day_count": 30,
+        "activities_per_day": 1.0,
+    },
+    "large": {
+        "team_count": 200,
+        "user_count": 10000,
+        "day_count": 60,
+        "activities_per_day": 1.0,
+    },
+}
+START_DATE = datetime.date(2023, 1, 1)
+TIME_ZONE = "America/Los_Angeles"
+# Timings vary between runs much more than memory does
+SECONDS_TOLERANCE = 2.0
+PEAK_MEMORY_TOLERANCE = 1.25
+
+
+def measure(function: Callable, *args) -> Tuple[Any, Dict[str, float]]:
+    """
+    Run a function and measure its duration and peak traced memory. Tracing
+    every allocation slows the function down, so the duration is measured in
+    a separate run without tracing.
+    """
+    start_time = time.perf_counter()
+    result = function(*args)
+    seconds = time.perf_counter() - start_time
+
+    tracemalloc.start()
+    function(*args)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, {
+        "seconds": round(seconds, 4),
+        "peak_memory_mb": round(peak_memory / 1024 / 1024, 3),
+    }
+
+
+def run_score_benchmark(size: str) -> Dict[str, Dict[str, float]]:
+    """
+    Score a synthetic challenge of the given size in an in-memory database and
+    measure each stage of the pipeline.
+    """
+    original_db = User._meta.database
+    benchmark_db = SqliteDatabase(":memory:")
+    benchmark_db.bind(ALL_MODELS)
+    benchmark_db.connect()
+    benchmark_db.create_tables(ALL_MODELS)
+    try:
+        create_challenge(start_date=START_DATE, **BENCHMARK_SIZES[size]).save()
+
+        config = ScoreConfig(
+            START_DATE,
+            START_DATE
+            + datetime.timedelta(days=BENCHMARK_SIZES[size]["day_count"] - 1),
+            TIME_ZONE,
+        )
+        activities = list(Activity.select())
+        users = list(User.select(User, Team).join(Team))
+
+        results = dict[str, Dict[str, float]]()
+        user_active_times, results["get_user_active_time"] = measure(
+            get_user_active_time, activities, config
+        )
+        user_daily_scores, results["get_user_daily_score"] = measure(
+            get_user_daily_score, user_active_times
+        )
+        team_daily_scores, results["get_team_daily_score"] = measure(
+            get_team_daily_score, user_daily_scores, users
+        )
+        _, results["get_team_cumulative_score"] = measure(
+            get_team_cumulative_score, team_daily_scores, users
+        )
+        _, results["get_aggregated_team_cumulative_score"] = measure(
+            get_aggregated_team_cumulative_score, users, config
+        )
+        _, results["get_streaming_team_cumulative_score"] = measure(
+            get_streaming_team_cumulative_score, users, config
+        )
+        return results
+    finally:
+        benchmark_db.close()
+        original_db.bind(ALL_MODELS)
+
+
+def load_baselines() -> Dict[str, Dict[str, Dict[str, float]]]:
+    if not BASELINE_PATH.exists():
+        return {}
+    with open(BASELINE_PATH, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_baseline(size: str, results: Dict[str, Dict[str, float]]):
+    baselines = load_baselines()
+    baselines[size] = results
+    with open(BASELINE_PATH, "w", encoding="utf-8") as file:
+        json.dump(baselines, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def get_regressions(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]]
+) -> List[str]:
+    regressions = []
+    for stage, stage_results in results.items():
+        stage_baseline = baseline.get(stage)
+        if not stage_baseline:
+            continue
+        for metric, tolerance in [
+            ("seconds", SECONDS_TOLERANCE),
+            ("peak_memory_mb", PEAK_MEMORY_TOLERANCE),
+        ]:
+            if stage_results[metric] > stage_baseline[metric] * tolerance:
+                regressions.append(
+                    f"{stage} {metric}: {stage_results[metric]} is over "
+                    f"{tolerance}x the baseline of {stage_baseline[metric]}"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--size", choices=list(BENCHMARK_SIZES), default="small")
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Save the results as the new baseline for the size",
+    )
+    args = parser.parse_args()
+
+    results = run_score_benchmark(args.size)
+    for stage, stage_results in results.items():
+        print(
+            f"{stage}: {stage_results['seconds']}s, "
+            f"{stage_results['peak_memory_mb']} MB peak"
+        )
+
+    if args.update_baseline:
+        save_baseline(args.size, results)
+        print(f"Saved baseline for {args.size} to {BASELINE_PATH}")
+        return 0
+
+    baseline = load_baselines().get(args.size)
+    if not baseline:
+        print(f"No baseline for {args.size}, run with --update-baseline to add one")
+        return 0
+
+    regressions = get_regressions(results, baseline)
+    for regression in regressions:
+        print(f"Regression in {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
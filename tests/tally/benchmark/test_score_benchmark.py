@@ -0,0 +1,53 @@
+import os
+import pytest
+
+from tests.tally.benchmark.benchmark_score import (
+    get_regressions,
+    load_baselines,
+    run_score_benchmark,
+)
+from tests.tally.mocks.mock_challenge import create_challenge
+
+
+class TestScoreBenchmark:
+    def test_synthetic_challenge_is_deterministic(self):
+        """Test that the same arguments create the same challenge"""
+        challenge1 = create_challenge(3, 10, 5, 2.0, seed=1)
+        challenge2 = create_challenge(3, 10, 5, 2.0, seed=1)
+
+        assert len(challenge1.activities) == 100
+        assert [a.__data__ for a in challenge1.activities] == [
+            a.__data__ for a in challenge2.activities
+        ]
+        assert [u.__data__ for u in challenge1.users] == [
+            u.__data__ for u in challenge2.users
+        ]
+
+    def test_regressions_are_reported(self):
+        """Test that only metrics over their tolerance are reported"""
+        baseline = {"stage": {"seconds": 1.0, "peak_memory_mb": 10.0}}
+
+        assert (
+            get_regressions(
+                {"stage": {"seconds": 1.9, "peak_memory_mb": 12.0}}, baseline
+            )
+            == []
+        )
+        assert (
+            len(
+                get_regressions(
+                    {"stage": {"seconds": 2.1, "peak_memory_mb": 13.0}}, baseline
+                )
+            )
+            == 2
+        )
+
+    @pytest.mark.skipif(
+        not os.environ.get("TALLY_BENCHMARK"),
+        reason="Set TALLY_BENCHMARK=1 to compare against the benchmark baselines",
+    )
+    def test_small_challenge_against_baseline(self):
+        """Test the small benchmark against its baseline"""
+        results = run_score_benchmark("small")
+
+        assert get_regressions(results, load_baselines()["small"]) == []
@@ -2,6 +2,7 @@ from uuid import uuid4
 from datetime import datetime, timezone
 
 from tally.models.db import Activity, User
+from tally.utils.activity import calculate_activity_active_seconds
 
 
 def create_activity(
@@ -12,8 +13,9 @@ def create_activity(
     moving_seconds: int | None = None,
     title: str | None = None,
     workout_type: str | None = None,
+    active_seconds: int | None = None,
 ):
-    return Activity(
+    activity = Activity(
         id=id or str(uuid4()),
         user=user or str(uuid4()),
         start_time=start_time or datetime.now(timezone.utc),
@@ -22,3 +24,9 @@ def create_activity(
         title=title or "Test Activity",
         workout_type=workout_type or "Run",
     )
+    activity.active_seconds = (
+        active_seconds
+        if active_seconds is not None
+        else calculate_activity_active_seconds(activity)
+    )
+    return activity
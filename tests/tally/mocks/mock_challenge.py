@@ -0,0 +1,87 @@
+from typing import List
+import datetime
+import random
+from peewee import chunked
+
+from tally.models.db import Activity, Team, User
+from tests.tally.mocks.mock_activity import create_activity
+from tests.tally.mocks.mock_team import create_team
+from tests.tally.mocks.mock_user import create_user
+
+
+WORKOUT_TYPES = ["Run", "Ride", "Walk", "Yoga", "Weight Training", "Other"]
+
+
+class MockChallenge:
+    def __init__(
+        self, teams: List[Team], users: List[User], activities: List[Activity]
+    ):
+        self.teams = teams
+        self.users = users
+        self.activities = activities
+
+    def save(self, batch_size: int = 100):
+        with Activity._meta.database.atomic():
+            for model, instances in [
+                (Team, self.teams),
+                (User, self.users),
+                (Activity, self.activities),
+            ]:
+                for batch in chunked(instances, batch_size):
+                    model.insert_many(
+                        [instance.__data__ for instance in batch]
+                    ).execute()
+
+
+def create_challenge(
+    team_count: int,
+    user_count: int,
+    day_count: int,
+    activities_per_day: float,
+    start_date: datetime.date = datetime.date(2023, 1, 1),
+    seed: int = 0,
+) -> MockChallenge:
+    """
+    Create a synthetic challenge. The same arguments always create the same
+    challenge.
+
+    :param activities_per_day: Average number of activities per user per day.
+    """
+    rng = random.Random(seed)
+    teams = [
+        create_team(id=f"team{index}", name=f"Team {index}")
+        for index in range(team_count)
+    ]
+    users = [
+        create_user(
+            id=f"user{index}",
+            name=f"User {index}",
+            team=teams[rng.randrange(team_count)].id,
+        )
+        for index in range(user_count)
+    ]
+
+    activity_count = round(user_count * day_count * activities_per_day)
+    start_time = datetime.datetime.combine(
+        start_date, datetime.time.min, datetime.timezone.utc
+    )
+    activities = []
+    for index in range(activity_count):
+        workout_type = rng.choice(WORKOUT_TYPES)
+        elapsed_seconds = rng.randrange(5, 180) * 60
+        activities.append(
+            create_activity(
+                id=f"activity{index}",
+                user=users[rng.randrange(user_count)].id,
+                start_time=(
+                    start_time
+                    + datetime.timedelta(seconds=rng.randrange(day_count * 86400))
+                ).isoformat(),
+                elapsed_seconds=elapsed_seconds,
+                moving_seconds=rng.randrange(elapsed_seconds // 2, elapsed_seconds + 1),
+                title=f"{workout_type} {index}",
+                workout_type=workout_type,
+            )
+        )
+
+    return MockChallenge(teams, users, activities)
@@ -0,0 +1,61 @@
+from unittest.mock import patch
+
+from tally.actions.recompute.recalculate import recalculate_activity_active_seconds
+from tally.actions.score.score_cache import get_data_version
+from tally.models.db import Activity, DailyScoreState
+from tests.tally.mocks.mock_activity import create_activity
+from tests.tally.mocks.mock_team import create_team
+from tests.tally.mocks.mock_user import create_user
+
+
+def save_activities():
+    create_team(id="team1", name="Test Team").save(force_insert=True)
+    create_user(id="user1", name="Test User", team="team1").save(force_insert=True)
+    create_activity(
+        id="run",
+        user="user1",
+        elapsed_seconds=3600,
+        moving_seconds=3000,
+        workout_type="Run",
+    ).save(force_insert=True)
+    create_activity(
+        id="swim",
+        user="user1",
+        elapsed_seconds=2400,
+        moving_seconds=1800,
+        workout_type="Swim",
+    ).save(force_insert=True)
+
+
+def get_active_seconds():
+    return dict(Activity.select(Activity.id, Activity.active_seconds).tuples())
+
+
+class TestRecalculateActivityActiveSeconds:
+    def test_active_seconds_stored_on_write(self, mock_db):
+        """Test that activities are saved with their effective active seconds"""
+        save_activities()
+
+        assert get_active_seconds() == {"run": 3000, "swim": 2400}
+
+    def test_unchanged_policy(self, mock_db):
+        """Test that nothing is invalidated when no active seconds change"""
+        save_activities()
+        data_version = get_data_version()
+
+        assert recalculate_activity_active_seconds() == 0
+        assert get_data_version() == data_version
+
+    def test_changed_policy(self, mock_db):
+        """Test that a new moving time policy updates the stored column"""
+        save_activities()
+        DailyScoreState.create(start_date="2023-01-01", time_zone="UTC")
+        data_version = get_data_version()
+
+        with patch("tally.utils.activity.MOVING_TIME_ACTIVITY_TYPES", ["Swim"]):
+            changed_count = recalculate_activity_active_seconds()
+
+        assert changed_count == 2
+        assert get_active_seconds() == {"run": 3600, "swim": 1800}
+        assert DailyScoreState.select().count() == 0
+        assert get_data_version() != data_version
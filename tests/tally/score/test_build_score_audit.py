@@ -0,0 +1,143 @@
+import datetime
+import random
+import pytest
+
+from tally.actions.score.score_audit import build_score_audit
+from tally.actions.score.point_schedule import PointSchedule, PointScheduleRules
+from tally.actions.score.score_config import ScoreConfig
+from tally.actions.score.vectorized_score import get_aggregated_team_cumulative_score
+from tally.models.db import Team, User
+from tests.tally.mocks.mock_team import create_team
+from tests.tally.mocks.mock_user import create_user
+from tests.tally.mocks.mock_activity import create_activity
+
+
+@pytest.fixture
+def init_teams_and_users(mock_db):
+    """Create a team with two users and a team with a single user"""
+    for team_id in ["team1", "team2"]:
+        create_team(id=team_id, name=f"Team {team_id}").save(force_insert=True)
+
+    create_user(id="user1", name="Alice", team="team1").save(force_insert=True)
+    create_user(id="user2", name="Bob", team="team1").save(force_insert=True)
+    create_user(id="user3", name="Charlie", team="team2").save(force_insert=True)
+    yield
+
+
+def get_users():
+    return list(User.select(User, Team).join(Team))
+
+
+class TestBuildScoreAudit:
+    def test_no_activities_returns_empty_breakdown(self, mock_db, init_teams_and_users):
+        """Test that users and teams without activities have no audited days"""
+        config = ScoreConfig(
+            datetime.date(2023, 1, 1), datetime.date(2023, 1, 31), "UTC"
+        )
+
+        audit = build_score_audit(get_users(), config)
+
+        assert audit.get_user_day_audits("user1") == []
+        assert audit.get_team_day_audits("team1") == []
+        assert audit.get_team_day_audits("unknown") == []
+
+    def test_user_day_provenance(self, mock_db, init_teams_and_users):
+        """Test that each user day lists its activities and streak bonus"""
+        for day in range(1, 8):
+            create_activity(
+                id=f"a{day}",
+                user="user1",
+                start_time=f"2023-01-0{day}T10:00:00+00:00",
+                elapsed_seconds=1800,
+                workout_type="Other",
+            ).save(force_insert=True)
+        create_activity(
+            id="b7",
+            user="user1",
+            start_time="2023-01-07T18:00:00+00:00",
+            elapsed_seconds=1800,
+            workout_type="Other",
+        ).save(force_insert=True)
+        config = ScoreConfig(
+            datetime.date(2023, 1, 1), datetime.date(2023, 1, 31), "UTC"
+        )
+
+        user_day_audits = build_score_audit(get_users(), config).get_user_day_audits(
+            "user1"
+        )
+
+        assert [audit.date.day for audit in user_day_audits] == list(range(1, 8))
+        assert user_day_audits[0].activity_ids == ("a1",)
+        assert user_day_audits[0].bonus_points == 0
+        last_day = user_day_audits[-1]
+        assert last_day.activity_ids == ("a7", "b7")
+        assert last_day.active_seconds == 3600
+        assert last_day.streak == 7
+        assert last_day.bonus_points == 5
+        assert last_day.get_points() == last_day.points + 5
+
+    def test_team_bonus_reason(self, mock_db, init_teams_and_users):
+        """Test that a team day records the bonus for all members being active"""
+        for user_id in ["user1", "user2"]:
+            create_activity(
+                user=user_id,
+                start_time="2023-01-02T10:00:00+00:00",
+                elapsed_seconds=3600,
+                workout_type="Other",
+            ).save(force_insert=True)
+        create_activity(
+            user="user1",
+            start_time="2023-01-03T10:00:00+00:00",
+            elapsed_seconds=3600,
+            workout_type="Other",
+        ).save(force_insert=True)
+        config = ScoreConfig(
+            datetime.date(2023, 1, 1), datetime.date(2023, 1, 31), "UTC"
+        )
+
+        team_day_audits = build_score_audit(get_users(), config).get_team_day_audits(
+            "team1"
+        )
+
+        assert [
+            (audit.date.day, audit.active_user_count, audit.bonus_points)
+            for audit in team_day_audits
+        ] == [(2, 2, 5), (3, 1, 0)]
+
+    @pytest.mark.parametrize("overlap_mode", ["flag", "clip"])
+    def test_team_points_match_team_scores(
+        self, mock_db, init_teams_and_users, overlap_mode
+    ):
+        """Test that the audited points of each team add up to its score"""
+        User.update(time_zone="Asia/Tokyo").where(User.id == "user2").execute()
+        rng = random.Random(19)
+        base_time = datetime.datetime(2023, 3, 1, tzinfo=datetime.timezone.utc)
+        for user_id in ["user1", "user2", "user3"]:
+            for _ in range(150):
+                create_activity(
+                    user=user_id,
+                    start_time=(
+                        base_time
+                        + datetime.timedelta(minutes=rng.randrange(30 * 24 * 60))
+                    ).isoformat(),
+                    elapsed_seconds=rng.randrange(1, 100) * 60,
+                    workout_type=rng.choice(["Run", "Yoga", "Other"]),
+                ).save(force_insert=True)
+        config = ScoreConfig(
+            datetime.date(2023, 3, 3),
+            datetime.date(2023, 3, 25),
+            "Europe/London",
+            PointSchedule(PointScheduleRules(overlap_mode=overlap_mode)),
+        )
+        users = get_users()
+
+        audit = build_score_audit(users, config)
+        team_scores = get_aggregated_team_cumulative_score(users, config)
+
+        assert {
+            team_score.team.id: sum(
+                team_day_audit.get_points()
+                for team_day_audit in audit.get_team_day_audits(team_score.team.id)
+            )
+            for team_score in team_scores
+        } == {team_score.team.id: team_score.points for team_score in team_scores}
@@ -0,0 +1,92 @@
+import datetime
+import random
+import pytest
+
+from tally.actions.score.score_index import build_score_index
+from tally.actions.score.vectorized_score import (
+    ScoreMatrix,
+    get_aggregated_team_cumulative_score,
+    get_user_points_matrix,
+)
+from tally.actions.score.user_active_time import query_user_day_active_seconds
+from tally.actions.score.score_config import ScoreConfig
+from tally.models.db import Team, User
+from tests.tally.mocks.mock_activity import create_activity
+from tests.tally.mocks.mock_config import create_config
+from tests.tally.mocks.mock_team import create_team
+from tests.tally.mocks.mock_user import create_user
+
+
+CHALLENGE_START_DATE = datetime.date(2023, 6, 1)
+TIME_ZONE = "Europe/Berlin"
+
+
+@pytest.fixture
+def config(mock_db):
+    """Create a challenge with long streaks and some gaps"""
+    config = create_config(start_date=CHALLENGE_START_DATE, time_zone=TIME_ZONE)
+    config.save()
+    for team_id in ["team1", "team2", "team3"]:
+        create_team(id=team_id, name=f"Team {team_id}").save(force_insert=True)
+    for index in range(6):
+        create_user(
+            id=f"user{index}", name=f"User {index}", team=f"team{index % 3 + 1}"
+        ).save(force_insert=True)
+
+    rng = random.Random(5)
+    for index in range(6):
+        for day in range(30):
+            # Most days are active so that streaks cross most window starts
+            if rng.random() < 0.85:
+                create_activity(
+                    user=f"user{index}",
+                    start_time=f"{CHALLENGE_START_DATE + datetime.timedelta(days=day)}T10:00:00+00:00",
+                    elapsed_seconds=rng.choice([10, 25, 45, 70, 130]) * 60,
+                    workout_type="Other",
+                ).save(force_insert=True)
+    yield config
+
+
+class TestBuildScoreIndex:
+    def test_windows_match_aggregated_team_score(self, config):
+        """Test arbitrary windows against scoring each window separately"""
+        score_index = build_score_index(config)
+        users = list(User.select(User, Team).join(Team))
+        rng = random.Random(6)
+
+        windows = [(0, 29), (0, 6), (7, 13), (14, 40), (29, 29), (31, 35), (10, 5)]
+        windows += [(rng.randrange(30), rng.randrange(35)) for _ in range(20)]
+        for first_day, last_day in windows:
+            start_date = CHALLENGE_START_DATE + datetime.timedelta(days=first_day)
+            end_date = CHALLENGE_START_DATE + datetime.timedelta(days=last_day)
+
+            result = score_index.get_team_cumulative_score(start_date, end_date)
+            expected = get_aggregated_team_cumulative_score(
+                users, ScoreConfig(start_date, end_date, TIME_ZONE)
+            )
+
+            assert [(s.team.id, s.points) for s in result] == [
+                (s.team.id, s.points) for s in expected
+            ], f"Window {start_date} to {end_date}"
+
+    def test_user_points_match_window_matrix(self, config):
+        """Test user points of a window that starts in the middle of streaks"""
+        score_index = build_score_index(config)
+        start_date = CHALLENGE_START_DATE + datetime.timedelta(days=9)
+        end_date = CHALLENGE_START_DATE + datetime.timedelta(days=24)
+        score_config = ScoreConfig(start_date, end_date, TIME_ZONE)
+        matrix = ScoreMatrix(score_index.matrix.users, score_config)
+        matrix.add_user_day_rows(list(query_user_day_active_seconds(score_config)))
+
+        result = score_index.get_user_points(start_date, end_date)
+
+        assert result.tolist() == get_user_points_matrix(matrix).sum(axis=1).tolist()
+
+    def test_window_before_challenge_start(self, config):
+        """Test that windows cannot start before the challenge"""
+        score_index = build_score_index(config)
+
+        with pytest.raises(ValueError):
+            score_index.get_team_points(
+                CHALLENGE_START_DATE - datetime.timedelta(days=1), CHALLENGE_START_DATE
+            )
@@ -0,0 +1,46 @@
+import datetime
+from unittest.mock import patch
+
+from tally.actions.score.period_score import calculate_team_cumulative_score
+from tally.actions.score.streaming_score import get_streaming_team_cumulative_score
+from tally.actions.score.vectorized_score import get_aggregated_team_cumulative_score
+from tally.actions.score.score_config import ScoreConfig
+from tally.models.db import Config, Team, User
+from tests.tally.mocks.mock_challenge import create_challenge
+from tests.tally.mocks.mock_config import create_config
+
+
+START_DATE = datetime.date(2023, 3, 1)
+
+
+class TestCalculateTeamCumulativeScore:
+    def test_later_period_is_streamed(self, mock_db):
+        """Test that a period after the challenge start uses the streaming path"""
+        create_config(start_date="2023-03-01").save(force_insert=True)
+        create_challenge(
+            team_count=3,
+            user_count=9,
+            day_count=14,
+            activities_per_day=1.5,
+            start_date=START_DATE,
+            seed=6,
+        ).save()
+        users = list(User.select(User, Team).join(Team))
+        challenge_config = Config.select().first()
+        config = ScoreConfig(
+            START_DATE + datetime.timedelta(days=4),
+            START_DATE + datetime.timedelta(days=13),
+            "UTC",
+        )
+
+        with patch(
+            "tally.actions.score.period_score.get_streaming_team_cumulative_score",
+            wraps=get_streaming_team_cumulative_score,
+        ) as mock_streaming_score:
+            result = calculate_team_cumulative_score(users, challenge_config, config)
+
+        mock_streaming_score.assert_called_once_with(users, config)
+        expected = get_aggregated_team_cumulative_score(users, config)
+        assert {s.team.id: s.points for s in result} == {
+            s.team.id: s.points for s in expected
+        }
@@ -0,0 +1,99 @@
+import pytest
+
+from tally.actions.score.activity_overlap import get_activity_overlaps
+from tests.tally.mocks.mock_activity import create_activity
+from tests.tally.mocks.mock_team import create_team
+from tests.tally.mocks.mock_user import create_user
+
+
+@pytest.fixture
+def init_users_and_teams(mock_db):
+    team = create_team(id="team1", name="Test Team")
+    team.save(force_insert=True)
+    create_user(id="user1", name="Test User", team=team.id).save(force_insert=True)
+    create_user(id="user2", name="Test User 2", team=team.id).save(force_insert=True)
+    yield
+
+
+def to_comparable(overlaps):
+    return [
+        (
+            overlap.user_id,
+            overlap.activity_id,
+            overlap.overlapping_activity_id,
+            overlap.overlap_seconds,
+        )
+        for overlap in overlaps
+    ]
+
+
+class TestGetActivityOverlaps:
+    def test_duplicate_recording(self, mock_db, init_users_and_teams):
+        """Test the same workout recorded on a watch and a phone"""
+        create_activity(
+            id="watch",
+            user="user1",
+            start_time="2023-01-01T10:00:00+00:00",
+            elapsed_seconds=3600,
+        ).save(force_insert=True)
+        create_activity(
+            id="phone",
+            user="user1",
+            start_time="2023-01-01T10:01:00+00:00",
+            elapsed_seconds=3500,
+        ).save(force_insert=True)
+
+        assert to_comparable(get_activity_overlaps()) == [
+            ("user1", "phone", "watch", 3500)
+        ]
+
+    def test_adjacent_and_other_user_activities(self, mock_db, init_users_and_teams):
+        """Test that back to back activities and other users do not overlap"""
+        create_activity(
+            id="first",
+            user="user1",
+            start_time="2023-01-01T10:00:00+00:00",
+            elapsed_seconds=1800,
+        ).save(force_insert=True)
+        create_activity(
+            id="second",
+            user="user1",
+            start_time="2023-01-01T10:30:00+00:00",
+            elapsed_seconds=1800,
+        ).save(force_insert=True)
+        create_activity(
+            id="other_user",
+            user="user2",
+            start_time="2023-01-01T10:15:00+00:00",
+            elapsed_seconds=1800,
+        ).save(force_insert=True)
+
+        assert get_activity_overlaps() == []
+
+    def test_overlap_with_furthest_reaching_activity(
+        self, mock_db, init_users_and_teams
+    ):
+        """Test that overlaps are found against any earlier activity"""
+        create_activity(
+            id="long",
+            user="user1",
+            start_time="2023-01-01T08:00:00+01:00",
+            elapsed_seconds=4 * 3600,
+        ).save(force_insert=True)
+        create_activity(
+            id="short",
+            user="user1",
+            start_time="2023-01-01T08:00:00+00:00",
+            elapsed_seconds=600,
+        ).save(force_insert=True)
+        create_activity(
+            id="late",
+            user="user1",
+            start_time="2023-01-01T10:30:00+00:00",
+            elapsed_seconds=3600,
+        ).save(force_insert=True)
+
+        assert to_comparable(get_activity_overlaps()) == [
+            ("user1", "short", "long", 600),
+            ("user1", "late", "long", 1800),
+        ]
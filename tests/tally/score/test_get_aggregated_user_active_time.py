@@ -0,0 +1,162 @@
+import datetime
+import random
+import pytest
+
+from tally.actions.score.user_active_time import (
+    get_aggregated_user_active_time,
+    get_user_active_time,
+)
+from tally.actions.score.point_schedule import PointSchedule, PointScheduleRules
+from tally.actions.score.score_config import ScoreConfig
+from tally.models.db import Activity, User
+from tests.tally.mocks.mock_team import create_team
+from tests.tally.mocks.mock_user import create_user
+from tests.tally.mocks.mock_activity import create_activity
+
+
+@pytest.fixture
+def init_users_and_teams(mock_db):
+    team = create_team(id="team1", name="Test Team")
+    team.save(force_insert=True)
+    create_user(id="user1", name="Test User", team=team.id).save(force_insert=True)
+    create_user(id="user2", name="Test User 2", team=team.id).save(force_insert=True)
+    yield
+
+
+def to_comparable(user_active_times):
+    return sorted(
+        (entry.user.id, entry.date, entry.active_seconds) for entry in user_active_times
+    )
+
+
+class TestGetAggregatedUserActiveTime:
+    def test_no_activities_returns_empty_list(self, mock_db, init_users_and_teams):
+        """Test with no activities in the database"""
+        config = ScoreConfig(
+            datetime.date(2023, 1, 1), datetime.date(2023, 1, 31), "UTC"
+        )
+
+        assert get_aggregated_user_active_time(config) == []
+
+    def test_activities_summed_per_user_day(self, mock_db, init_users_and_teams):
+        """Test that activities on the same local day are summed into one row"""
+        for start_time, workout_type in [
+            ("2023-01-15T10:00:00+00:00", "Other"),
+            ("2023-01-15 18:00:00.250000+00:00", "Run"),
+        ]:
+            create_activity(
+                user="user1",
+                start_time=start_time,
+                elapsed_seconds=3600,
+                moving_seconds=1800,
+                workout_type=workout_type,
+            ).save(force_insert=True)
+        config = ScoreConfig(
+            datetime.date(2023, 1, 1), datetime.date(2023, 1, 31), "UTC"
+        )
+
+        result = get_aggregated_user_active_time(config)
+
+        assert len(result) == 1
+        assert result[0].user.id == "user1"
+        assert result[0].date == datetime.date(2023, 1, 15)
+        # Elapsed time for "Other" and moving time for "Run"
+        assert result[0].active_seconds == 3600 + 1800
+
+    def test_start_time_with_non_utc_offset(self, mock_db, init_users_and_teams):
+        """Test start times saved with a local offset, as done by the load action"""
+        create_activity(
+            user="user1",
+            start_time="2023-07-01 00:00:00-07:00",
+            elapsed_seconds=3600,
+            workout_type="Other",
+        ).save(force_insert=True)
+        config = ScoreConfig(
+            datetime.date(2023, 7, 1), datetime.date(2023, 7, 1), "America/Los_Angeles"
+        )
+
+        result = get_aggregated_user_active_time(config)
+
+        assert to_comparable(result) == [("user1", datetime.date(2023, 7, 1), 3600)]
+
+    @pytest.mark.parametrize(
+        "time_zone",
+        ["UTC", "America/Los_Angeles", "Australia/Lord_Howe", "Europe/London"],
+    )
+    def test_matches_get_user_active_time(
+        self, mock_db, init_users_and_teams, time_zone
+    ):
+        """Test that the result matches get_user_active_time across DST changes"""
+        rng = random.Random(7)
+        base_time = datetime.datetime(2023, 3, 20, tzinfo=datetime.timezone.utc)
+        for _ in range(300):
+            create_activity(
+                user=rng.choice(["user1", "user2"]),
+                start_time=(
+                    base_time + datetime.timedelta(seconds=rng.randrange(40 * 86400))
+                ).isoformat(),
+                elapsed_seconds=rng.randrange(1, 7200),
+                moving_seconds=rng.choice([None, rng.randrange(1, 7200)]),
+                workout_type=rng.choice(["Run", "Yoga", "Hike"]),
+            ).save(force_insert=True)
+        config = ScoreConfig(
+            datetime.date(2023, 3, 22), datetime.date(2023, 4, 25), time_zone
+        )
+
+        expected = get_user_active_time(list(Activity.select()), config)
+        result = get_aggregated_user_active_time(config)
+
+        assert to_comparable(result) == to_comparable(expected)
+
+    @pytest.mark.parametrize("overlap_mode", ["flag", "clip"])
+    def test_per_user_time_zones(self, mock_db, init_users_and_teams, overlap_mode):
+        """Test that each user's activities are bucketed in their own time zone"""
+        User.update(time_zone="Asia/Tokyo").where(User.id == "user2").execute()
+        create_user(id="user3", name="Test User 3", team="team1").save(
+            force_insert=True
+        )
+        User.update(time_zone="America/Los_Angeles").where(User.id == "user3").execute()
+        rng = random.Random(9)
+        base_time = datetime.datetime(2023, 3, 20, tzinfo=datetime.timezone.utc)
+        for _ in range(300):
+            create_activity(
+                user=rng.choice(["user1", "user2", "user3"]),
+                start_time=(
+                    base_time + datetime.timedelta(seconds=rng.randrange(20 * 86400))
+                ).isoformat(),
+                elapsed_seconds=rng.randrange(1, 7200),
+                workout_type=rng.choice(["Run", "Yoga"]),
+            ).save(force_insert=True)
+        config = ScoreConfig(
+            datetime.date(2023, 3, 22),
+            datetime.date(2023, 3, 31),
+            "Europe/London",
+            PointSchedule(PointScheduleRules(overlap_mode=overlap_mode)),
+        )
+
+        expected = get_user_active_time(list(Activity.select()), config)
+        result = get_aggregated_user_active_time(config)
+
+        assert to_comparable(result) == to_comparable(expected)
+
+    def test_activity_date_in_user_time_zone(self, mock_db, init_users_and_teams):
+        """Test that the same instant falls on the local date of each user"""
+        User.update(time_zone="Asia/Tokyo").where(User.id == "user2").execute()
+        # 2023-03-31 20:00 in London and 2023-04-01 04:00 in Tokyo
+        for user_id in ["user1", "user2"]:
+            create_activity(
+                user=user_id,
+                start_time="2023-03-31T19:00:00+00:00",
+                elapsed_seconds=600,
+                workout_type="Other",
+            ).save(force_insert=True)
+        config = ScoreConfig(
+            datetime.date(2023, 3, 30), datetime.date(2023, 4, 2), "Europe/London"
+        )
+
+        result = get_aggregated_user_active_time(config)
+
+        assert to_comparable(result) == [
+            ("user1", datetime.date(2023, 3, 31), 600),
+            ("user2", datetime.date(2023, 4, 1), 600),
+        ]
@@ -0,0 +1,67 @@
+import numpy as np
+
+from tally.actions.score.activity_bitmap import (
+    get_all_active_days,
+    pack_active_days,
+    unpack_active_days,
+)
+
+
+class TestGetAllActiveDays:
+    """Test cases for get_all_active_days function."""
+
+    def test_no_groups_returns_empty_array(self):
+        """Test that no groups results in an empty array"""
+        result = get_all_active_days(
+            np.zeros((0, 5), dtype=bool), np.array([], dtype=np.int64), 0
+        )
+        assert result.shape == (0, 5)
+
+    def test_single_member_group_matches_member(self):
+        """Test that a group with one member is active when the member is"""
+        is_active = np.array([[True, False, True]])
+        result = get_all_active_days(is_active, np.array([0]), 1)
+        assert result.tolist() == [[True, False, True]]
+
+    def test_all_members_must_be_active(self):
+        """Test that a day is only set when every member of the group is active"""
+        is_active = np.array(
+            [
+                [True, True, False, True],
+                [False, False, False, True],
+                [True, False, True, True],
+                [True, True, True, False],
+            ]
+        )
+        # Members of each group are not adjacent
+        group_index = np.array([0, 1, 0, 1])
+
+        result = get_all_active_days(is_active, group_index, 2)
+
+        assert result.tolist() == [
+            [True, False, False, True],
+            [False, False, False, False],
+        ]
+
+    def test_matches_row_by_row_check_over_many_days(self):
+        """Test bitmaps spanning multiple 64 bit words against np.all"""
+        rng = np.random.default_rng(0)
+        is_active = rng.random((30, 200)) < 0.9
+        group_index = rng.integers(0, 5, size=30)
+        group_index[:5] = np.arange(5)
+
+        result = get_all_active_days(is_active, group_index, 5)
+
+        for group in range(5):
+            expected = np.all(is_active[group_index == group], axis=0)
+            assert result[group].tolist() == expected.tolist()
+
+    def test_pack_and_unpack_round_trip(self):
+        """Test that unpacking packed bitmaps gives back the original days"""
+        is_active = np.random.default_rng(1).random((3, 130)) < 0.5
+
+        packed = pack_active_days(is_active)
+
+        assert packed.dtype == np.uint64
+        assert packed.shape == (3, 3)
+        assert unpack_active_days(packed, 130).tolist() == is_active.tolist()
@@ -0,0 +1,95 @@
+import datetime
+
+from tally.actions.score import score_cache
+from tally.actions.score.score_cache import (
+    bump_data_version,
+    get_cached_team_cumulative_score,
+    save_cached_team_cumulative_score,
+)
+from tally.actions.score.point_schedule import PointSchedule, PointScheduleRules
+from tally.actions.score.score_config import ScoreConfig
+from tally.actions.score.team_score import TeamCumulativeScore
+from tally.models.db import ScoreCacheEntry, Team, User
+from tests.tally.mocks.mock_team import create_team
+from tests.tally.mocks.mock_user import create_user
+
+
+START_DATE = datetime.date(2023, 1, 1)
+
+
+def create_users():
+    for team_id in ["team1", "team2"]:
+        create_team(id=team_id, name=f"Team {team_id}").save(force_insert=True)
+    create_user(id="user1", name="User 1", team="team1").save(force_insert=True)
+    create_user(id="user2", name="User 2", team="team2").save(force_insert=True)
+    return list(User.select(User, Team).join(Team))
+
+
+def create_score_config(days: int = 6) -> ScoreConfig:
+    return ScoreConfig(
+        START_DATE, START_DATE + datetime.timedelta(days=days), "Europe/London"
+    )
+
+
+def create_team_scores(users):
+    return [
+        TeamCumulativeScore(users[1].team, 12),
+        TeamCumulativeScore(users[0].team, 7),
+    ]
+
+
+class TestGetCachedTeamCumulativeScore:
+    def test_cache_hit(self, mock_db):
+        """Test that a saved period is returned in the same order"""
+        users = create_users()
+        save_cached_team_cumulative_score(
+            create_team_scores(users), create_score_config()
+        )
+
+        result = get_cached_team_cumulative_score(users, create_score_config())
+
+        assert [(s.team.id, s.points) for s in result] == [
+            ("team2", 12),
+            ("team1", 7),
+        ]
+
+    def test_cache_miss_on_different_config(self, mock_db):
+        """Test that the dates and point schedule are part of the key"""
+        users = create_users()
+        save_cached_team_cumulative_score(
+            create_team_scores(users), create_score_config()
+        )
+        other_schedule_config = create_score_config()
+        other_schedule_config.point_schedule = PointSchedule(
+            PointScheduleRules(base_points=2)
+        )
+
+        assert get_cached_team_cumulative_score(users, create_score_config(5)) is None
+        assert get_cached_team_cumulative_score(users, other_schedule_config) is None
+
+    def test_cache_miss_after_data_change(self, mock_db):
+        """Test that bumping the data version invalidates cached scores"""
+        users = create_users()
+        save_cached_team_cumulative_score(
+            create_team_scores(users), create_score_config()
+        )
+
+        bump_data_version()
+
+        assert get_cached_team_cumulative_score(users, create_score_config()) is None
+
+    def test_evicts_least_recently_used(self, mock_db, monkeypatch):
+        """Test that the cache is bounded and keeps recently read entries"""
+        monkeypatch.setattr(score_cache, "SCORE_CACHE_MAX_ENTRIES", 2)
+        users = create_users()
+        team_scores = create_team_scores(users)
+        save_cached_team_cumulative_score(team_scores, create_score_config(1))
+        save_cached_team_cumulative_score(team_scores, create_score_config(2))
+        get_cached_team_cumulative_score(users, create_score_config(1))
+
+        save_cached_team_cumulative_score(team_scores, create_score_config(3))
+
+        assert ScoreCacheEntry.select().count() == 2
+        assert get_cached_team_cumulative_score(users, create_score_config(1))
+        assert get_cached_team_cumulative_score(users, create_score_config(2)) is None
+        assert get_cached_team_cumulative_score(users, create_score_config(3))
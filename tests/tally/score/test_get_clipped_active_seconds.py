@@ -0,0 +1,106 @@
+import datetime
+import random
+
+from tally.actions.score.activity_overlap import get_clipped_active_seconds
+from tally.actions.score.user_active_time import (
+    get_aggregated_user_active_time,
+    get_user_active_time,
+)
+from tally.actions.score.point_schedule import PointSchedule, PointScheduleRules
+from tally.actions.score.score_config import ScoreConfig
+from tally.models.db import Activity
+from tests.tally.mocks.mock_activity import create_activity
+from tests.tally.mocks.mock_team import create_team
+from tests.tally.mocks.mock_user import create_user
+
+
+CLIP_POINT_SCHEDULE = PointSchedule(PointScheduleRules(overlap_mode="clip"))
+
+
+class TestGetClippedActiveSeconds:
+    def test_clips_covered_time(self):
+        """Test that time covered by an earlier activity is not counted again"""
+        activities = [
+            create_activity(
+                id="watch",
+                user="user1",
+                start_time="2023-01-01T10:00:00+00:00",
+                elapsed_seconds=3600,
+                workout_type="Yoga",
+            ),
+            create_activity(
+                id="phone",
+                user="user1",
+                start_time="2023-01-01T10:30:00+00:00",
+                elapsed_seconds=3600,
+                workout_type="Yoga",
+            ),
+            create_activity(
+                id="inside",
+                user="user1",
+                start_time="2023-01-01T10:40:00+00:00",
+                elapsed_seconds=600,
+                workout_type="Yoga",
+            ),
+            create_activity(
+                id="run",
+                user="user1",
+                start_time="2023-01-01T11:20:00+00:00",
+                elapsed_seconds=3600,
+                moving_seconds=1200,
+                workout_type="Run",
+            ),
+        ]
+
+        assert get_clipped_active_seconds(activities) == {
+            "watch": 3600,
+            "phone": 1800,
+            "inside": 0,
+            # Moving time is only clipped down to the uncovered elapsed time
+            "run": 1200,
+        }
+
+    def test_sql_matches_python_across_window(self, mock_db):
+        """Test that clipping in SQL matches clipping the activities in Python"""
+        create_team(id="team1", name="Test Team").save(force_insert=True)
+        for user_index in range(3):
+            create_user(
+                id=f"user{user_index}", name=f"User {user_index}", team="team1"
+            ).save(force_insert=True)
+        rng = random.Random(11)
+        start_time = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+        for _ in range(150):
+            create_activity(
+                user=f"user{rng.randrange(3)}",
+                start_time=(
+                    start_time + datetime.timedelta(minutes=rng.randrange(10 * 1440))
+                ).isoformat(),
+                elapsed_seconds=rng.randrange(5, 300) * 60,
+                moving_seconds=rng.randrange(1, 300) * 60,
+                workout_type=rng.choice(["Run", "Yoga"]),
+            ).save(force_insert=True)
+        # Starts after the first activities, which can still clip activities
+        # in the window
+        config = ScoreConfig(
+            datetime.date(2023, 1, 3),
+            datetime.date(2023, 1, 8),
+            "America/Denver",
+            CLIP_POINT_SCHEDULE,
+        )
+
+        result = get_aggregated_user_active_time(config)
+        expected = get_user_active_time(list(Activity.select()), config)
+        unclipped = get_aggregated_user_active_time(
+            ScoreConfig(
+                config.score_start_date, config.score_end_date, config.time_zone
+            )
+        )
+
+        def to_comparable(user_active_times):
+            return sorted(
+                (entry.user.id, entry.date, entry.active_seconds)
+                for entry in user_active_times
+            )
+
+        assert to_comparable(result) == to_comparable(expected)
+        assert to_comparable(result) != to_comparable(unclipped)
@@ -0,0 +1,57 @@
+import datetime
+import random
+import numpy as np
+
+from tally.actions.score.standings import get_daily_standings, get_rank_matrix
+from tally.actions.score.vectorized_score import get_aggregated_team_cumulative_score
+from tally.actions.score.score_config import ScoreConfig
+from tally.models.db import User, Team
+from tests.tally.mocks.mock_team import create_team
+from tests.tally.mocks.mock_user import create_user
+from tests.tally.mocks.mock_activity import create_activity
+
+
+class TestGetDailyStandings:
+    def test_matches_cumulative_score_for_each_end_date(self, mock_db):
+        """Test that each day of the standings matches a score ending that day"""
+        for team_id in ["team1", "team2", "team3"]:
+            create_team(id=team_id, name=f"Team {team_id}").save(force_insert=True)
+        for index in range(7):
+            create_user(
+                id=f"user{index}", name=f"User {index}", team=f"team{index % 3 + 1}"
+            ).save(force_insert=True)
+        rng = random.Random(4)
+        for _ in range(150):
+            create_activity(
+                user=f"user{rng.randrange(7)}",
+                start_time=f"{datetime.date(2023, 5, 1) + datetime.timedelta(days=rng.randrange(20))}T15:00:00+00:00",
+                elapsed_seconds=rng.randrange(1, 150) * 60,
+                workout_type="Other",
+            ).save(force_insert=True)
+        users = list(User.select(User, Team).join(Team))
+        start_date = datetime.date(2023, 5, 1)
+        time_zone = "America/Chicago"
+
+        standings = get_daily_standings(
+            users, ScoreConfig(start_date, datetime.date(2023, 5, 20), time_zone)
+        )
+
+        for day_index in range(20):
+            end_date = start_date + datetime.timedelta(days=day_index)
+            expected = get_aggregated_team_cumulative_score(
+                users, ScoreConfig(start_date, end_date, time_zone)
+            )
+            result = standings.get_team_cumulative_score(day_index)
+
+            assert standings.get_date(day_index) == end_date
+            assert [(s.team.id, s.points) for s in result] == [
+                (s.team.id, s.points) for s in expected
+            ]
+
+    def test_rank_matrix_ties(self):
+        """Test that teams with equal points share a rank"""
+        cumulative_points = np.array([[10, 15], [20, 15], [10, 5]])
+
+        ranks = get_rank_matrix(cumulative_points)
+
+        assert ranks.tolist() == [[2, 1], [1, 1], [2, 3]]
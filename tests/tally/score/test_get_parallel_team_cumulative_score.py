@@ -0,0 +1,84 @@
+import datetime
+import random
+import pytest
+from peewee import SqliteDatabase
+
+from tally.actions.score.parallel_score import (
+    get_parallel_team_cumulative_score,
+    get_team_shards,
+)
+from tally.actions.score.vectorized_score import get_aggregated_team_cumulative_score
+from tally.actions.score.score_config import ScoreConfig
+from tally.models.db import ALL_MODELS, Activity, Team, User
+from tests.tally.mocks.mock_activity import create_activity
+from tests.tally.mocks.mock_team import create_team
+from tests.tally.mocks.mock_user import create_user
+
+
+@pytest.fixture
+def file_db(tmp_path):
+    """Bind the models to a database file that worker processes can open"""
+    original_db = User._meta.database
+    test_db = SqliteDatabase(str(tmp_path / "tally.db"))
+    test_db.bind(ALL_MODELS)
+    test_db.connect()
+    test_db.create_tables(ALL_MODELS)
+
+    yield test_db
+
+    test_db.close()
+    original_db.bind(ALL_MODELS)
+
+
+class TestGetParallelTeamCumulativeScore:
+    def test_matches_aggregated_team_score(self, file_db):
+        """Test that sharding teams across processes gives the same result"""
+        rng = random.Random(7)
+        for team_index in range(8):
+            create_team(id=f"team{team_index}", name=f"Team {team_index}").save(
+                force_insert=True
+            )
+        for user_index in range(40):
+            create_user(
+                id=f"user{user_index}",
+                name=f"User {user_index}",
+                team=f"team{rng.randrange(8)}",
+            ).save(force_insert=True)
+        with file_db.atomic():
+            for _ in range(600):
+                create_activity(
+                    user=f"user{rng.randrange(40)}",
+                    start_time=f"{datetime.date(2023, 2, 1) + datetime.timedelta(days=rng.randrange(28))}T18:00:00+00:00",
+                    elapsed_seconds=rng.randrange(1, 150) * 60,
+                    workout_type="Other",
+                ).save(force_insert=True)
+        users = list(User.select(User, Team).join(Team))
+        config = ScoreConfig(
+            datetime.date(2023, 2, 1), datetime.date(2023, 2, 28), "Asia/Tokyo"
+        )
+
+        result = get_parallel_team_cumulative_score(users, config, worker_count=3)
+        expected = get_aggregated_team_cumulative_score(users, config)
+
+        assert Activity.select().count() == 600
+        assert [(s.team.id, s.points) for s in result] == [
+            (s.team.id, s.points) for s in expected
+        ]
+
+    def test_team_shards_are_balanced(self, mock_db):
+        """Test that teams are spread across shards by user count"""
+        teams = [create_team(id=f"team{index}", name="Team") for index in range(4)]
+        users = [
+            User(id=f"user{index}", name="User", team=teams[team_index])
+            for index, team_index in enumerate([0, 0, 0, 0, 1, 1, 2, 2, 3])
+        ]
+
+        shards = get_team_shards(users, 2)
+
+        assert shards == [["team0", "team3"], ["team1", "team2"]]
+        assert get_team_shards(users, 10) == [
+            ["team0"],
+            ["team1"],
+            ["team2"],
+            ["team3"],
+        ]
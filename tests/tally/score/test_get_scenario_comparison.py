@@ -0,0 +1,132 @@
+import datetime
+
+from tally.actions.score.scenario_score import get_scenario_comparison
+from tally.actions.score.vectorized_score import get_aggregated_team_cumulative_score
+from tally.actions.score.point_schedule import (
+    DEFAULT_POINT_SCHEDULE,
+    PointSchedule,
+    PointScheduleRules,
+    PointThreshold,
+)
+from tally.actions.score.score_config import ScoreConfig
+from tally.models.db import Team, User
+from tests.tally.mocks.mock_challenge import create_challenge
+from tests.tally.mocks.mock_config import create_config
+from tests.tally.mocks.mock_team import create_team
+from tests.tally.mocks.mock_user import create_user
+from tests.tally.mocks.mock_activity import create_activity
+
+
+START_DATE = datetime.date(2023, 4, 1)
+SCENARIOS = {
+    "default": DEFAULT_POINT_SCHEDULE,
+    "short_streaks": PointSchedule(
+        PointScheduleRules(streak_interval_days=2, streak_bonus_points=3)
+    ),
+    "team_heavy": PointSchedule(
+        PointScheduleRules(
+            base_points=0,
+            thresholds=[PointThreshold(minutes=1, points=1)],
+            team_bonus_points=50,
+        )
+    ),
+}
+
+
+class TestGetScenarioComparison:
+    def test_matches_scoring_each_schedule(self, mock_db):
+        """Test each scenario against scoring the window with its schedule"""
+        create_challenge(
+            team_count=4,
+            user_count=10,
+            day_count=14,
+            activities_per_day=1.5,
+            start_date=START_DATE,
+            seed=8,
+        ).save()
+        users = list(User.select(User, Team).join(Team))
+        end_date = START_DATE + datetime.timedelta(days=13)
+
+        result = get_scenario_comparison(
+            users, ScoreConfig(START_DATE, end_date, "Asia/Kolkata"), SCENARIOS
+        )
+
+        assert result.scenario_names == list(SCENARIOS)
+        for scenario_index, point_schedule in enumerate(SCENARIOS.values()):
+            expected = get_aggregated_team_cumulative_score(
+                users,
+                ScoreConfig(START_DATE, end_date, "Asia/Kolkata", point_schedule),
+            )
+            team_points = {
+                team.id: points
+                for team, points in zip(
+                    result.teams, result.team_points[:, scenario_index]
+                )
+            }
+            assert team_points == {s.team.id: s.points for s in expected}
+
+    def test_ranks_per_scenario(self, mock_db):
+        """Test that teams are ranked separately in each scenario"""
+        create_challenge(
+            team_count=3,
+            user_count=9,
+            day_count=7,
+            activities_per_day=1.0,
+            start_date=START_DATE,
+            seed=2,
+        ).save()
+        users = list(User.select(User, Team).join(Team))
+
+        result = get_scenario_comparison(
+            users,
+            ScoreConfig(START_DATE, START_DATE + datetime.timedelta(days=6), "UTC"),
+            SCENARIOS,
+        )
+
+        for scenario_index in range(len(SCENARIOS)):
+            points = result.team_points[:, scenario_index]
+            ranks = result.team_ranks[:, scenario_index]
+            for team_index in range(len(result.teams)):
+                assert ranks[team_index] == 1 + sum(points > points[team_index])
+        first_scenario_points = result.team_points[result.get_team_order(), 0]
+        assert list(first_scenario_points) == sorted(
+            first_scenario_points, reverse=True
+        )
+
+    def test_scores_each_overlap_mode_on_its_own_active_time(self, mock_db):
+        """Test that a clip scenario does not count overlapping time twice"""
+        create_config(start_date="2023-04-01").save(force_insert=True)
+        create_team(id="team1", name="Team 1").save(force_insert=True)
+        create_user(id="user1", name="Alice", team="team1").save(force_insert=True)
+        # The same workout recorded on two devices
+        for activity_id in ["activity1", "activity2"]:
+            create_activity(
+                id=activity_id,
+                user="user1",
+                start_time="2023-04-02T10:00:00+00:00",
+                elapsed_seconds=3600,
+                workout_type="Yoga",
+            ).save(force_insert=True)
+        users = list(User.select(User, Team).join(Team))
+        config = ScoreConfig(START_DATE, START_DATE + datetime.timedelta(days=6), "UTC")
+        scenarios = {
+            "current": DEFAULT_POINT_SCHEDULE,
+            "clip": PointSchedule(PointScheduleRules(overlap_mode="clip")),
+        }
+
+        result = get_scenario_comparison(users, config, scenarios)
+
+        for scenario_index, point_schedule in enumerate(scenarios.values()):
+            expected = get_aggregated_team_cumulative_score(
+                users,
+                ScoreConfig(
+                    config.score_start_date,
+                    config.score_end_date,
+                    config.time_zone,
+                    point_schedule,
+                ),
+            )
+            assert list(result.team_points[:, scenario_index]) == [
+                score.points for score in expected
+            ]
+        assert list(result.team_points[0]) == [15, 13]
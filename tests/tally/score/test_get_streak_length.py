@@ -0,0 +1,50 @@
+import pytest
+
+from tally.actions.score.activity_bitmap import (
+    get_active_day_bitmap,
+    get_streak_length,
+)
+
+
+class TestGetStreakLength:
+    """Test cases for get_streak_length function."""
+
+    def test_empty_bitmap_returns_zero(self):
+        """Test that a user with no active days has no streak"""
+        assert get_streak_length(0, 0) == 0
+        assert get_streak_length(0, 100) == 0
+
+    def test_inactive_day_returns_zero(self):
+        """Test that the streak is 0 on a day without activity"""
+        bitmap = get_active_day_bitmap([0, 1, 3])
+        assert get_streak_length(bitmap, 2) == 0
+
+    def test_streak_from_first_day(self):
+        """Test streaks that start on day 0 of the bitmap"""
+        bitmap = get_active_day_bitmap(range(10))
+        for day in range(10):
+            assert get_streak_length(bitmap, day) == day + 1
+
+    def test_streak_restarts_after_gap(self):
+        """Test that a missed day restarts the streak"""
+        bitmap = get_active_day_bitmap([0, 1, 2, 4, 5])
+        assert [get_streak_length(bitmap, day) for day in range(6)] == [
+            1,
+            2,
+            3,
+            0,
+            1,
+            2,
+        ]
+
+    def test_later_days_do_not_affect_streak(self):
+        """Test that only days up to the given day are counted"""
+        bitmap = get_active_day_bitmap([3, 4, 5, 6, 7])
+        assert get_streak_length(bitmap, 4) == 2
+
+    @pytest.mark.parametrize("start_day", [0, 60, 63, 64, 200])
+    def test_long_streak_across_word_boundaries(self, start_day):
+        """Test streaks spanning more than 64 days"""
+        bitmap = get_active_day_bitmap(range(start_day, start_day + 150))
+        assert get_streak_length(bitmap, start_day + 149) == 150
+        assert get_streak_length(bitmap, start_day + 63) == 64
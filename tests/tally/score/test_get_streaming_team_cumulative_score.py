@@ -0,0 +1,130 @@
+import datetime
+import pytest
+
+from tally.actions.score.streaming_score import get_streaming_team_cumulative_score
+from tally.actions.score.vectorized_score import get_aggregated_team_cumulative_score
+from tally.actions.score.user_active_time import get_user_active_time
+from tally.actions.score.user_score import get_user_daily_score
+from tally.actions.score.team_score import (
+    get_team_cumulative_score,
+    get_team_daily_score,
+)
+from tally.actions.score.point_schedule import (
+    PointSchedule,
+    PointScheduleRules,
+    PointThreshold,
+)
+from tally.actions.score.score_config import ScoreConfig
+from tally.models.db import Activity, Team, User
+from tests.tally.mocks.mock_challenge import create_challenge
+
+
+START_DATE = datetime.date(2023, 3, 1)
+
+
+class TestGetStreamingTeamCumulativeScore:
+    def test_matches_object_pipeline(self, mock_db):
+        """Test that the streaming pipeline gives the same result as the lists"""
+        create_challenge(
+            team_count=5,
+            user_count=30,
+            day_count=21,
+            activities_per_day=1.5,
+            start_date=START_DATE,
+            seed=3,
+        ).save()
+        users = list(User.select(User, Team).join(Team))
+        config = ScoreConfig(
+            START_DATE, START_DATE + datetime.timedelta(days=20), "America/New_York"
+        )
+
+        result = get_streaming_team_cumulative_score(users, config)
+        user_daily_scores = get_user_daily_score(
+            get_user_active_time(Activity.select(), config)
+        )
+        expected = get_team_cumulative_score(
+            get_team_daily_score(user_daily_scores, users), users
+        )
+
+        assert [(s.team.id, s.points) for s in result] == [
+            (s.team.id, s.points) for s in expected
+        ]
+
+    def test_custom_point_schedule(self, mock_db):
+        """Test that the point schedule of the config is used by every stage"""
+        create_challenge(
+            team_count=3,
+            user_count=6,
+            day_count=14,
+            activities_per_day=2.0,
+            start_date=START_DATE,
+            seed=4,
+        ).save()
+        users = list(User.select(User, Team).join(Team))
+        point_schedule = PointSchedule(
+            PointScheduleRules(
+                base_minutes=20,
+                base_points=3,
+                thresholds=[PointThreshold(minutes=45, points=4)],
+                streak_interval_days=2,
+                streak_bonus_points=1,
+                team_bonus_points=10,
+            )
+        )
+        config = ScoreConfig(
+            START_DATE,
+            START_DATE + datetime.timedelta(days=13),
+            "UTC",
+            point_schedule,
+        )
+
+        result = get_streaming_team_cumulative_score(users, config)
+        expected = get_aggregated_team_cumulative_score(users, config)
+
+        assert [(s.team.id, s.points) for s in result] == [
+            (s.team.id, s.points) for s in expected
+        ]
+
+    def test_no_activities(self, mock_db):
+        """Test that teams without activities are included with no points"""
+        create_challenge(
+            team_count=2, user_count=4, day_count=7, activities_per_day=0
+        ).save()
+        users = list(User.select(User, Team).join(Team))
+        config = ScoreConfig(START_DATE, START_DATE, "UTC")
+
+        result = get_streaming_team_cumulative_score(users, config)
+
+        assert sorted((s.team.id, s.points) for s in result) == [
+            ("team0", 0),
+            ("team1", 0),
+        ]
+
+    @pytest.mark.parametrize("overlap_mode", ["flag", "clip"])
+    def test_matches_aggregated_engine(self, mock_db, overlap_mode):
+        """Test overlap modes and user time zones against the matrix engine"""
+        create_challenge(
+            team_count=4,
+            user_count=12,
+            day_count=14,
+            activities_per_day=2.5,
+            start_date=START_DATE,
+            seed=11,
+        ).save()
+        User.update(time_zone="Asia/Tokyo").where(
+            User.id.in_(["user1", "user5"])
+        ).execute()
+        users = list(User.select(User, Team).join(Team))
+        config = ScoreConfig(
+            START_DATE + datetime.timedelta(days=3),
+            START_DATE + datetime.timedelta(days=12),
+            "Europe/London",
+            PointSchedule(PointScheduleRules(overlap_mode=overlap_mode)),
+        )
+
+        result = get_streaming_team_cumulative_score(users, config)
+        expected = get_aggregated_team_cumulative_score(users, config)
+
+        assert {s.team.id: s.points for s in result} == {
+            s.team.id: s.points for s in expected
+        }
@@ -283,3 +283,28 @@ class TestGetTeamDailyScore:
         assert (
             total_points == expected_total
         ), f"Expected {expected_total}, got {total_points}"
+
+    def test_large_team_running_totals(self, mock_db):
+        """Test a team with 10k members, where all but one are active"""
+        from tally.models.db import User
+
+        team = create_team(id="team1", name="Team Alpha")
+        users = [
+            User(id=f"user{index}", name=f"User {index}", team=team)
+            for index in range(10000)
+        ]
+        user_daily_scores = [
+            UserDailyScore(user=user, date=date(2023, 1, 15), points=2)
+            for user in users[1:]
+        ] + [UserDailyScore(user=users[0], date=date(2023, 1, 15), points=0)]
+
+        result = get_team_daily_score(user_daily_scores, users)
+
+        assert len(result) == 1
+        assert result[0].active_user_count == 9999
+        assert result[0].get_points() == 2 * 9999
+
+        result[0].add_user_score(
+            UserDailyScore(user=users[0], date=date(2023, 1, 15), points=1)
+        )
+        assert result[0].get_points() == 2 * 9999 + 1 + 5
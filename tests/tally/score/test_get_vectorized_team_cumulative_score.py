@@ -0,0 +1,262 @@
+import datetime
+import random
+import pytest
+
+from tally.actions.score.vectorized_score import (
+    get_aggregated_team_cumulative_score,
+    get_vectorized_team_cumulative_score,
+)
+from tally.actions.score.user_active_time import get_user_active_time
+from tally.actions.score.user_score import get_user_daily_score
+from tally.actions.score.team_score import (
+    get_team_daily_score,
+    get_team_cumulative_score,
+)
+from tally.actions.score.score_config import ScoreConfig
+from tally.models.db import Activity, User, Team
+from tests.tally.mocks.mock_team import create_team
+from tests.tally.mocks.mock_user import create_user
+from tests.tally.mocks.mock_activity import create_activity
+
+
+@pytest.fixture
+def init_teams_and_users(mock_db):
+    """Create two teams with two users each and a team with a single user"""
+    for team_id in ["team1", "team2", "team3"]:
+        create_team(id=team_id, name=f"Team {team_id}").save(force_insert=True)
+
+    create_user(id="user1", name="Alice", team="team1").save(force_insert=True)
+    create_user(id="user2", name="Bob", team="team1").save(force_insert=True)
+    create_user(id="user3", name="Charlie", team="team2").save(force_insert=True)
+    create_user(id="user4", name="Diana", team="team2").save(force_insert=True)
+    create_user(id="user5", name="Eve", team="team3").save(force_insert=True)
+    yield
+
+
+def get_pipeline_team_cumulative_score(config: ScoreConfig):
+    """Run the object based scoring pipeline used as the reference result"""
+    activities = list(Activity.select().order_by(Activity.start_time.asc()))
+    users = list(User.select(User, Team).join(Team))
+
+    user_active_times = get_user_active_time(activities, config)
+    user_daily_scores = get_user_daily_score(user_active_times)
+    team_daily_scores = get_team_daily_score(user_daily_scores, users)
+    return get_team_cumulative_score(team_daily_scores, users)
+
+
+def get_vectorized_result(config: ScoreConfig):
+    activities = list(Activity.select())
+    users = list(User.select(User, Team).join(Team))
+    return get_vectorized_team_cumulative_score(activities, users, config)
+
+
+def save_daily_activities(user_id: str, start: datetime.date, days: int, minutes: int):
+    for day in range(days):
+        create_activity(
+            user=user_id,
+            start_time=f"{start + datetime.timedelta(days=day)}T12:00:00+00:00",
+            elapsed_seconds=minutes * 60,
+            workout_type="Other",
+        ).save(force_insert=True)
+
+
+class TestGetVectorizedTeamCumulativeScore:
+    """Test cases for get_vectorized_team_cumulative_score function."""
+
+    def test_no_activities_returns_zero_points_for_all_teams(
+        self, mock_db, init_teams_and_users
+    ):
+        """Test that every team is included with zero points"""
+        config = ScoreConfig(
+            datetime.date(2023, 1, 1), datetime.date(2023, 1, 31), "UTC"
+        )
+
+        result = get_vectorized_result(config)
+
+        assert [score.team.id for score in result] == ["team1", "team2", "team3"]
+        assert all(score.points == 0 for score in result)
+
+    def test_empty_users_returns_empty_list(self, mock_db):
+        """Test that no users results in no team scores"""
+        config = ScoreConfig(
+            datetime.date(2023, 1, 1), datetime.date(2023, 1, 31), "UTC"
+        )
+
+        assert get_vectorized_team_cumulative_score([], [], config) == []
+
+    def test_streak_bonus_awarded_every_seven_days(self, mock_db, init_teams_and_users):
+        """Test 14 consecutive 30 minute days award two streak bonuses"""
+        save_daily_activities("user5", datetime.date(2023, 1, 1), 14, 30)
+        config = ScoreConfig(
+            datetime.date(2023, 1, 1), datetime.date(2023, 1, 31), "UTC"
+        )
+
+        result = {
+            score.team.id: score.points for score in get_vectorized_result(config)
+        }
+
+        # 14 days x (5 user points + 5 team bonus) + 2 streak bonuses
+        assert result["team3"] == 14 * 10 + 2 * 5
+
+    def test_team_bonus_requires_all_members_active(
+        self, mock_db, init_teams_and_users
+    ):
+        """Test that the team bonus is only awarded when all members are active"""
+        save_daily_activities("user1", datetime.date(2023, 1, 1), 2, 60)
+        save_daily_activities("user2", datetime.date(2023, 1, 2), 1, 60)
+        config = ScoreConfig(
+            datetime.date(2023, 1, 1), datetime.date(2023, 1, 31), "UTC"
+        )
+
+        result = {
+            score.team.id: score.points for score in get_vectorized_result(config)
+        }
+
+        # 3 user days x 8 points + team bonus on Jan 2 only
+        assert result["team1"] == 3 * 8 + 5
+
+    def test_activities_outside_window_ignored(self, mock_db, init_teams_and_users):
+        """Test that activities before the start or after the end are ignored"""
+        save_daily_activities("user5", datetime.date(2022, 12, 31), 1, 60)
+        save_daily_activities("user5", datetime.date(2023, 2, 1), 1, 60)
+        config = ScoreConfig(
+            datetime.date(2023, 1, 1), datetime.date(2023, 1, 31), "UTC"
+        )
+
+        result = {
+            score.team.id: score.points for score in get_vectorized_result(config)
+        }
+
+        assert result["team3"] == 0
+
+    def test_local_day_boundary_across_daylight_saving_change(
+        self, mock_db, init_teams_and_users
+    ):
+        """Test activities near midnight around a DST change use the local day"""
+        # 2023-03-12 is the spring forward date in America/Los_Angeles.
+        # 07:59 UTC on Mar 12 is 23:59 PST on Mar 11 and 07:30 UTC on Mar 13
+        # is 00:30 PDT on Mar 13.
+        for start_time in [
+            "2023-03-12T07:59:00+00:00",
+            "2023-03-13T07:30:00+00:00",
+        ]:
+            create_activity(
+                user="user5",
+                start_time=start_time,
+                elapsed_seconds=3600,
+                workout_type="Other",
+            ).save(force_insert=True)
+        config = ScoreConfig(
+            datetime.date(2023, 3, 12),
+            datetime.date(2023, 3, 12),
+            "America/Los_Angeles",
+        )
+
+        result = {
+            score.team.id: score.points for score in get_vectorized_result(config)
+        }
+
+        assert result["team3"] == 0
+
+    @pytest.mark.parametrize(
+        "time_zone", ["UTC", "America/Los_Angeles", "Asia/Kolkata", "Europe/London"]
+    )
+    def test_matches_object_pipeline(self, mock_db, init_teams_and_users, time_zone):
+        """Test that the result is identical to the object based pipeline"""
+        rng = random.Random(42)
+        base_time = datetime.datetime(2023, 3, 1, tzinfo=datetime.timezone.utc)
+        for user_id in ["user1", "user2", "user3", "user4", "user5"]:
+            for _ in range(120):
+                create_activity(
+                    user=user_id,
+                    start_time=(
+                        base_time
+                        + datetime.timedelta(minutes=rng.randrange(45 * 24 * 60))
+                    ).isoformat(),
+                    elapsed_seconds=rng.randrange(1, 100) * 60,
+                    moving_seconds=rng.choice([None, rng.randrange(1, 100) * 60]),
+                    workout_type=rng.choice(["Run", "Yoga", "Walk", "Other"]),
+                ).save(force_insert=True)
+        config = ScoreConfig(
+            datetime.date(2023, 3, 3), datetime.date(2023, 4, 10), time_zone
+        )
+
+        expected = get_pipeline_team_cumulative_score(config)
+        result = get_vectorized_result(config)
+
+        assert [(s.team.id, s.points) for s in result] == [
+            (s.team.id, s.points) for s in expected
+        ]
+
+    def test_matches_object_pipeline_with_user_time_zones(
+        self, mock_db, init_teams_and_users
+    ):
+        """Test that users with their own time zone match the object pipeline"""
+        for user_id, time_zone in [
+            ("user2", "Asia/Tokyo"),
+            ("user3", "America/Los_Angeles"),
+            ("user5", "Asia/Tokyo"),
+        ]:
+            User.update(time_zone=time_zone).where(User.id == user_id).execute()
+        rng = random.Random(18)
+        base_time = datetime.datetime(2023, 3, 1, tzinfo=datetime.timezone.utc)
+        for user_id in ["user1", "user2", "user3", "user4", "user5"]:
+            for _ in range(120):
+                create_activity(
+                    user=user_id,
+                    start_time=(
+                        base_time
+                        + datetime.timedelta(minutes=rng.randrange(45 * 24 * 60))
+                    ).isoformat(),
+                    elapsed_seconds=rng.randrange(1, 100) * 60,
+                    workout_type=rng.choice(["Run", "Yoga", "Other"]),
+                ).save(force_insert=True)
+        config = ScoreConfig(
+            datetime.date(2023, 3, 3), datetime.date(2023, 4, 10), "Europe/London"
+        )
+        users = list(User.select(User, Team).join(Team))
+
+        expected = [
+            (s.team.id, s.points) for s in get_pipeline_team_cumulative_score(config)
+        ]
+
+        assert [
+            (s.team.id, s.points) for s in get_vectorized_result(config)
+        ] == expected
+        assert [
+            (s.team.id, s.points)
+            for s in get_aggregated_team_cumulative_score(users, config)
+        ] == expected
+
+
+class TestGetAggregatedTeamCumulativeScore:
+    """Test cases for get_aggregated_team_cumulative_score function."""
+
+    @pytest.mark.parametrize("time_zone", ["UTC", "America/New_York", "Asia/Kolkata"])
+    def test_matches_object_pipeline(self, mock_db, init_teams_and_users, time_zone):
+        """Test that aggregating in SQLite gives the same result as the pipeline"""
+        rng = random.Random(3)
+        base_time = datetime.datetime(2023, 10, 20, tzinfo=datetime.timezone.utc)
+        for user_id in ["user1", "user2", "user3", "user4", "user5"]:
+            for _ in range(100):
+                create_activity(
+                    user=user_id,
+                    start_time=(
+                        base_time
+                        + datetime.timedelta(minutes=rng.randrange(30 * 24 * 60))
+                    ).isoformat(),
+                    elapsed_seconds=rng.randrange(1, 100) * 60,
+                    workout_type=rng.choice(["Run", "Yoga"]),
+                ).save(force_insert=True)
+        config = ScoreConfig(
+            datetime.date(2023, 10, 22), datetime.date(2023, 11, 15), time_zone
+        )
+
+        expected = get_pipeline_team_cumulative_score(config)
+        result = get_aggregated_team_cumulative_score(
+            list(User.select(User, Team).join(Team)), config
+        )
+
+        assert [(s.team.id, s.points) for s in result] == [
+            (s.team.id, s.points) for s in expected
+        ]
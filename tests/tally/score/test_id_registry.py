@@ -0,0 +1,24 @@
+from tally.actions.score.id_registry import IdRegistry
+
+
+class TestIdRegistry:
+    def test_ids_are_numbered_in_order_of_first_appearance(self):
+        """Test that each ID gets the next index once and keeps it"""
+        registry = IdRegistry(["user2", "user1"])
+
+        assert registry.add("user3") == 2
+        assert registry.add("user1") == 1
+        assert len(registry) == 3
+        assert [registry.get_id(index) for index in range(3)] == [
+            "user2",
+            "user1",
+            "user3",
+        ]
+
+    def test_unknown_id(self):
+        """Test that an ID that was not added has index -1"""
+        registry = IdRegistry(["user1"])
+
+        assert registry.get_index("user2") == -1
+        assert "user2" not in registry
+        assert "user1" in registry
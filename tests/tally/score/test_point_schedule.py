@@ -0,0 +1,76 @@
+import datetime
+import numpy as np
+
+from tally.actions.score.materialized_score import (
+    is_daily_score_materialized,
+    rebuild_daily_scores,
+)
+from tally.actions.score.point_schedule import (
+    DEFAULT_POINT_SCHEDULE,
+    PointSchedule,
+    PointScheduleRules,
+    PointThreshold,
+    get_point_schedule,
+    save_point_schedule,
+)
+from tests.tally.mocks.mock_config import create_config
+
+
+CUSTOM_RULES = PointScheduleRules(
+    base_minutes=30,
+    base_points=2,
+    thresholds=[
+        PointThreshold(minutes=20, points=3),
+        PointThreshold(minutes=45, points=4),
+    ],
+    streak_interval_days=3,
+    streak_bonus_points=10,
+    team_bonus_points=1,
+)
+
+
+class TestPointSchedule:
+    def test_array_matches_scalar(self):
+        """Test that the array evaluation matches the scalar evaluation"""
+        active_seconds = np.arange(0, 10 * 3600, 17, dtype=np.int64)
+
+        for point_schedule in [DEFAULT_POINT_SCHEDULE, PointSchedule(CUSTOM_RULES)]:
+            assert point_schedule.get_user_points_array(active_seconds).tolist() == [
+                point_schedule.get_user_points(seconds)
+                for seconds in active_seconds.tolist()
+            ]
+
+    def test_custom_rules(self):
+        """Test points and bonus points of a custom schedule"""
+        point_schedule = PointSchedule(CUSTOM_RULES)
+
+        assert point_schedule.get_user_points(19 * 60 + 59) == 0
+        assert point_schedule.get_user_points(20 * 60) == 3
+        # 3 full half hours plus both thresholds
+        assert point_schedule.get_user_points(90 * 60) == 3 * 2 + 3 + 4
+        assert point_schedule.get_user_bonus_points(3) == 10
+        assert point_schedule.get_user_bonus_points(7) == 0
+        assert point_schedule.get_user_bonus_points_array(
+            np.array([0, 3, 6, 7])
+        ).tolist() == [0, 10, 10, 0]
+        assert point_schedule.get_team_bonus_points(2, 2) == 1
+        assert point_schedule.get_team_bonus_points(0, 0) == 0
+
+    def test_default_schedule_without_saved_rules(self, mock_db):
+        """Test that the default schedule is used when none has been saved"""
+        assert get_point_schedule() is DEFAULT_POINT_SCHEDULE
+        assert not save_point_schedule(PointScheduleRules())
+
+    def test_saving_new_rules_invalidates_daily_scores(self, mock_db):
+        """Test that a changed schedule is loaded and triggers a rebuild"""
+        config = create_config(start_date=datetime.date(2023, 1, 1))
+        config.save()
+        rebuild_daily_scores(config)
+
+        assert save_point_schedule(CUSTOM_RULES)
+        assert get_point_schedule().rules == CUSTOM_RULES
+        assert not is_daily_score_materialized(config)
+
+        rebuild_daily_scores(config)
+        assert not save_point_schedule(CUSTOM_RULES)
+        assert is_daily_score_materialized(config)
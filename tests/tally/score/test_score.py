@@ -0,0 +1,94 @@
+from unittest.mock import MagicMock, patch
+import pytest
+
+from tally.actions.score.score import score
+from tests.tally.mocks.mock_config import create_config
+from tests.tally.mocks.mock_team import create_team
+from tests.tally.mocks.mock_user import create_user
+from tests.tally.mocks.mock_activity import create_activity
+
+
+@pytest.fixture
+def init_challenge(mock_db):
+    create_config(start_date="2023-01-01").save(force_insert=True)
+    for team_id in ["team1", "team2"]:
+        create_team(id=team_id, name=f"Team {team_id}").save(force_insert=True)
+    create_user(id="user1", name="Alice", team="team1").save(force_insert=True)
+    create_user(id="user2", name="Bob", team="team2").save(force_insert=True)
+    create_activity(
+        user="user1",
+        start_time="2023-01-02T10:00:00+00:00",
+        elapsed_seconds=3600,
+        workout_type="Other",
+    ).save(force_insert=True)
+    yield
+
+
+def mock_answers(answers: list) -> MagicMock:
+    """Prompt mock whose ask() returns the answers in order."""
+    prompt = MagicMock()
+    prompt.return_value.ask.side_effect = answers
+    return prompt
+
+
+class TestScore:
+    def test_saves_scores_of_each_period(self, mock_db, init_challenge, tmp_path):
+        """Test that the score action saves the first and a further period"""
+        dates = ["2023-01-01", "2023-01-10", "2023-01-01", "2023-01-05"]
+        confirms = [
+            # Save the daily standings of the first period
+            True,
+            # No score breakdown
+            False,
+            # Calculate another period
+            True,
+            # No daily standings, no score breakdown, no further period
+            False,
+            False,
+            False,
+        ]
+        file_names = iter(["scores.csv", "standings.csv", "period_scores.csv"])
+
+        with (
+            patch("questionary.text", mock_answers(dates)),
+            patch("questionary.confirm", mock_answers(confirms)),
+            patch(
+                "tally.actions.score.save_score.prompt_save_file",
+                side_effect=lambda *args: str(tmp_path / next(file_names)),
+            ),
+        ):
+            score()
+
+        assert (tmp_path / "scores.csv").read_text(encoding="utf-8").splitlines() == [
+            "Team,Points",
+            "Team team1,13",
+            "Team team2,0",
+        ]
+        assert (tmp_path / "standings.csv").exists()
+        assert (tmp_path / "period_scores.csv").read_text(
+            encoding="utf-8"
+        ).splitlines() == ["Team,Points", "Team team1,13", "Team team2,0"]
+
+    def test_rejects_period_before_challenge_start(
+        self, mock_db, init_challenge, tmp_path, capsys
+    ):
+        """Test that a further period cannot start before the challenge"""
+        dates = ["2023-01-01", "2023-01-10", "2022-12-25", "2023-01-05"]
+        # No standings, no breakdown, another period, then no further period
+        confirms = [False, False, True, False]
+
+        with (
+            patch("questionary.text", mock_answers(dates)),
+            patch("questionary.confirm", mock_answers(confirms)),
+            patch(
+                "tally.actions.score.save_score.prompt_save_file",
+                return_value=str(tmp_path / "scores.csv"),
+            ) as prompt_save_file,
+        ):
+            score()
+
+        assert (
+            "The start date cannot be before the challenge start date (2023-01-01)"
+            in capsys.readouterr().out
+        )
+        prompt_save_file.assert_called_once()
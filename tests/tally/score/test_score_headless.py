@@ -0,0 +1,100 @@
+import datetime
+import json
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+import tally
+from tally.actions.score.headless_score import score_headless
+from tests.tally.mocks.mock_config import create_config
+from tests.tally.mocks.mock_team import create_team
+from tests.tally.mocks.mock_user import create_user
+from tests.tally.mocks.mock_activity import create_activity
+
+
+@pytest.fixture
+def init_challenge(mock_db):
+    create_config(start_date="2023-01-01").save(force_insert=True)
+    for team_id in ["team1", "team2"]:
+        create_team(id=team_id, name=f"Team {team_id}").save(force_insert=True)
+    create_user(id="user1", name="Alice", team="team1").save(force_insert=True)
+    create_user(id="user2", name="Bob", team="team2").save(force_insert=True)
+    create_activity(
+        user="user1",
+        start_time="2023-01-02T10:00:00+00:00",
+        elapsed_seconds=3600,
+        workout_type="Other",
+    ).save(force_insert=True)
+    yield
+
+
+class TestScoreHeadless:
+    def test_no_config_returns_false(self, mock_db, tmp_path):
+        """Test that nothing is written without an active challenge"""
+        output_path = tmp_path / "scores.csv"
+
+        assert not score_headless(output_path=str(output_path))
+        assert not output_path.exists()
+
+    def test_end_date_before_start_date_returns_false(
+        self, mock_db, init_challenge, tmp_path
+    ):
+        """Test that an empty score period is rejected"""
+        output_path = tmp_path / "scores.csv"
+
+        assert not score_headless(
+            datetime.date(2023, 1, 5), datetime.date(2023, 1, 1), str(output_path)
+        )
+        assert not output_path.exists()
+
+    def test_writes_csv(self, mock_db, init_challenge, tmp_path):
+        """Test that the team scores are saved as CSV"""
+        output_path = tmp_path / "scores.csv"
+
+        assert score_headless(
+            datetime.date(2023, 1, 1), datetime.date(2023, 1, 10), str(output_path)
+        )
+
+        assert output_path.read_text(encoding="utf-8").splitlines() == [
+            "Team,Points",
+            "Team team1,13",
+            "Team team2,0",
+        ]
+
+    def test_writes_json_to_stdout(self, mock_db, init_challenge, capsys):
+        """Test that the team scores are written to stdout without other output"""
+        assert score_headless(
+            datetime.date(2023, 1, 1), datetime.date(2023, 1, 10), None, "json"
+        )
+
+        assert json.loads(capsys.readouterr().out) == {
+            "score_start_date": "2023-01-01",
+            "score_end_date": "2023-01-10",
+            "teams": [
+                {"id": "team1", "name": "Team team1", "points": 13},
+                {"id": "team2", "name": "Team team2", "points": 0},
+            ],
+        }
+
+    def test_does_not_import_interactive_libraries(self, tmp_path):
+        """Test that headless scoring does not load the prompt or GUI libraries"""
+        source_path = Path(tally.__file__).parent.parent
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys\n"
+                "import tally.main, tally.actions.score.headless_score\n"
+                "import tally.actions.initialize.create_tables\n"
+                "print(sorted(m for m in ('questionary', 'tkinter', 'selenium') "
+                "if m in sys.modules))",
+            ],
+            cwd=tmp_path,
+            env={"PYTHONPATH": str(source_path)},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        assert result.stdout.strip() == "[]"
@@ -0,0 +1,166 @@
+import datetime
+import random
+import pytest
+
+from tally.actions.score.materialized_score import (
+    get_materialized_team_cumulative_score,
+    is_daily_score_materialized,
+    rebuild_daily_scores,
+    update_daily_scores,
+    update_team_rosters,
+)
+from tally.actions.score.vectorized_score import get_aggregated_team_cumulative_score
+from tally.actions.score.score_config import ScoreConfig
+from tally.models.db import Activity, Team, TeamDayScore, User, UserDayScore
+from tests.tally.mocks.mock_activity import create_activity
+from tests.tally.mocks.mock_config import create_config
+from tests.tally.mocks.mock_team import create_team
+from tests.tally.mocks.mock_user import create_user
+
+
+CHALLENGE_START_DATE = datetime.date(2023, 3, 1)
+TIME_ZONE = "America/Los_Angeles"
+
+
+@pytest.fixture
+def config(mock_db):
+    """Create a challenge config with two teams of two users"""
+    config = create_config(start_date=CHALLENGE_START_DATE, time_zone=TIME_ZONE)
+    config.save()
+    for team_id in ["team1", "team2"]:
+        create_team(id=team_id, name=f"Team {team_id}").save(force_insert=True)
+    create_user(id="user1", name="Alice", team="team1").save(force_insert=True)
+    create_user(id="user2", name="Bob", team="team1").save(force_insert=True)
+    create_user(id="user3", name="Charlie", team="team2").save(force_insert=True)
+    create_user(id="user4", name="Diana", team="team2").save(force_insert=True)
+    yield config
+
+
+def save_activity(id: str, user: str, date: datetime.date, minutes: int) -> Activity:
+    activity = create_activity(
+        id=id,
+        user=user,
+        # 20:00 UTC is the same date in America/Los_Angeles
+        start_time=f"{date}T20:00:00+00:00",
+        elapsed_seconds=minutes * 60,
+        workout_type="Other",
+    )
+    Activity.replace(**activity.__data__).execute()
+    return activity
+
+
+def save_random_activities(rng: random.Random, count: int):
+    for index in range(count):
+        save_activity(
+            f"activity{index}",
+            rng.choice(["user1", "user2", "user3", "user4"]),
+            CHALLENGE_START_DATE + datetime.timedelta(days=rng.randrange(30)),
+            rng.randrange(10, 150),
+        )
+
+
+def get_daily_score_rows():
+    user_rows = [
+        (s.user_id, s.date, s.active_seconds, s.streak, s.points)
+        for s in UserDayScore.select().order_by(UserDayScore.user, UserDayScore.date)
+    ]
+    team_rows = [
+        (s.team_id, s.date, s.points, s.active_user_count, s.bonus_points)
+        for s in TeamDayScore.select().order_by(TeamDayScore.team, TeamDayScore.date)
+    ]
+    return user_rows, team_rows
+
+
+def get_rebuilt_daily_score_rows(config):
+    rebuild_daily_scores(config)
+    return get_daily_score_rows()
+
+
+class TestUpdateDailyScores:
+    def test_update_skipped_when_not_materialized(self, config):
+        """Test that nothing is written before the daily scores are built"""
+        save_activity("activity1", "user1", CHALLENGE_START_DATE, 60)
+
+        update_daily_scores([("user1", CHALLENGE_START_DATE)], config)
+
+        assert not is_daily_score_materialized(config)
+        assert get_daily_score_rows() == ([], [])
+
+    def test_rebuild_matches_aggregated_team_score(self, config):
+        """Test that summing the materialized tables gives the engine result"""
+        save_random_activities(random.Random(1), 200)
+        rebuild_daily_scores(config)
+        users = list(User.select(User, Team).join(Team))
+        score_config = ScoreConfig(
+            CHALLENGE_START_DATE, datetime.date(2023, 3, 20), TIME_ZONE
+        )
+
+        result = get_materialized_team_cumulative_score(users, score_config)
+        expected = get_aggregated_team_cumulative_score(users, score_config)
+
+        assert [(s.team.id, s.points) for s in result] == [
+            (s.team.id, s.points) for s in expected
+        ]
+
+    def test_incremental_update_matches_rebuild(self, config):
+        """Test inserts, gap fills and moved activities against a full rebuild"""
+        rng = random.Random(2)
+        save_random_activities(rng, 60)
+        rebuild_daily_scores(config)
+
+        changed_user_dates = set()
+        for index in range(40):
+            user_id = rng.choice(["user1", "user2", "user3", "user4"])
+            date = CHALLENGE_START_DATE + datetime.timedelta(days=rng.randrange(30))
+            # Reuse some IDs so existing activities are moved to another day
+            activity_id = f"activity{rng.randrange(60)}" if index % 4 == 0 else None
+            if activity_id:
+                existing = Activity.get(Activity.id == activity_id)
+                changed_user_dates.add(
+                    (
+                        existing.user_id,
+                        datetime.date.fromisoformat(existing.start_time[:10]),
+                    )
+                )
+            save_activity(
+                activity_id or f"new{index}", user_id, date, rng.randrange(0, 150)
+            )
+            changed_user_dates.add((user_id, date))
+
+            update_daily_scores(changed_user_dates, config)
+            updated_rows = get_daily_score_rows()
+
+            assert updated_rows == get_rebuilt_daily_score_rows(config)
+            assert updated_rows[0], "Expected user day scores to be saved"
+
+    def test_filling_gap_extends_later_streak(self, config):
+        """Test that filling a missing day updates the streak of later days"""
+        for day in [0, 1, 2, 4, 5, 6]:
+            save_activity(
+                f"activity{day}",
+                "user1",
+                CHALLENGE_START_DATE + datetime.timedelta(days=day),
+                30,
+            )
+        rebuild_daily_scores(config)
+
+        gap_date = CHALLENGE_START_DATE + datetime.timedelta(days=3)
+        save_activity("activity3", "user1", gap_date, 30)
+        update_daily_scores([("user1", gap_date)], config)
+
+        last_day = UserDayScore.get(
+            (UserDayScore.user == "user1")
+            & (UserDayScore.date == CHALLENGE_START_DATE + datetime.timedelta(days=6))
+        )
+        assert last_day.streak == 7
+        assert last_day.points == 5 + 5
+
+    def test_update_team_rosters_after_user_changes_team(self, config):
+        """Test that moving a user updates the team bonus of both teams"""
+        save_random_activities(random.Random(3), 80)
+        rebuild_daily_scores(config)
+
+        User.update(team="team2").where(User.id == "user2").execute()
+        update_team_rosters(["team1", "team2"], config)
+
+        assert get_daily_score_rows() == get_rebuilt_daily_score_rows(config)
@@ -0,0 +1,108 @@
+from unittest.mock import MagicMock, patch
+import json
+import pytest
+
+from tally.services.strava import StravaService
+from tests.tally.mocks.mock_club_feed import get_raw_club_feed
+
+
+@pytest.fixture
+def mock_driver():
+    driver = MagicMock()
+    driver.get_cookies.return_value = [
+        {"name": "_strava4_session", "value": "session123"},
+        {"name": "sp", "value": "abc"},
+    ]
+    driver.execute_script.return_value = "Test Browser"
+    with (
+        patch("tally.services.strava.webdriver.Chrome", return_value=driver),
+        patch("tally.services.strava.ChromeDriverManager"),
+        patch("tally.services.strava.Service"),
+        patch("tally.services.strava.WebDriverWait"),
+    ):
+        yield driver
+
+
+@pytest.fixture
+def mock_pool_manager():
+    with patch("tally.services.strava.urllib3.PoolManager") as pool_manager:
+        yield pool_manager
+
+
+class TestGetClubFeed:
+    def test_http_mode_reads_json_with_session_cookies(
+        self, mock_driver, mock_pool_manager
+    ):
+        """Test that feed pages are requested with the cookies of the browser"""
+        http_client = mock_pool_manager.return_value
+        http_client.request.return_value = MagicMock(
+            status=200, data=get_raw_club_feed().encode("utf-8")
+        )
+        strava_service = StravaService(http_pool_size=3)
+
+        feed = strava_service.get_club_feed("club1", "1700000000")
+
+        assert feed.pagination.hasMore is True
+        headers = mock_pool_manager.call_args.kwargs["headers"]
+        assert headers["Cookie"] == "_strava4_session=session123; sp=abc"
+        assert headers["User-Agent"] == "Test Browser"
+        assert mock_pool_manager.call_args.kwargs["maxsize"] == 3
+        url = http_client.request.call_args.args[1]
+        assert url.startswith("https://www.strava.com/clubs/club1/feed?")
+        assert "cursor=1700000000" in url
+        # The browser is only used to log in
+        mock_driver.get.assert_called_once_with("https://www.strava.com/login")
+
+    def test_http_mode_raises_on_expired_session(self, mock_driver, mock_pool_manager):
+        """Test that a redirect to the login page is reported as a failure"""
+        mock_pool_manager.return_value.request.return_value = MagicMock(
+            status=302, data=b""
+        )
+        strava_service = StravaService()
+
+        with pytest.raises(Exception, match="club1"):
+            strava_service.get_club_feed("club1")
+
+    def test_browser_mode_loads_pages_in_browser(self, mock_driver, mock_pool_manager):
+        """Test that the browser fetch mode does not create an HTTP client"""
+        mock_driver.find_element.return_value.text = get_raw_club_feed()
+        strava_service = StravaService(fetch_mode="browser")
+
+        feed = strava_service.get_club_feed("club1")
+
+        assert feed.pagination.hasMore is True
+        mock_pool_manager.assert_not_called()
+        assert mock_driver.get.call_args.args[0].startswith(
+            "https://www.strava.com/clubs/club1/feed?"
+        )
+
+    def test_script_mode_fetches_pages_in_one_round_trip(
+        self, mock_driver, mock_pool_manager
+    ):
+        """Test that several pages are fetched with a single script execution"""
+        mock_driver.execute_async_script.return_value = [
+            {"status": 200, "body": json.loads(get_raw_club_feed())},
+            {"status": 200, "body": json.loads(get_raw_club_feed())},
+        ]
+        strava_service = StravaService(fetch_mode="script")
+
+        feeds = strava_service.get_club_feeds([("club1", None), ("club2", "1700")])
+
+        assert [feed.pagination.hasMore for feed in feeds] == [True, True]
+        mock_driver.execute_async_script.assert_called_once()
+        urls = mock_driver.execute_async_script.call_args.args[1]
+        assert urls[0].startswith("https://www.strava.com/clubs/club1/feed?")
+        assert "cursor=1700" in urls[1]
+        mock_driver.find_element.assert_not_called()
+        mock_pool_manager.assert_not_called()
+
+    def test_script_mode_raises_on_failed_page(self, mock_driver, mock_pool_manager):
+        """Test that a failed page in a batch is reported with its club"""
+        mock_driver.execute_async_script.return_value = [
+            {"status": 200, "body": json.loads(get_raw_club_feed())},
+            {"status": 0, "body": None, "error": "TypeError: Failed to fetch"},
+        ]
+        strava_service = StravaService(fetch_mode="script")
+
+        with pytest.raises(Exception, match="club2"):
+            strava_service.get_club_feeds([("club1", None), ("club2", None)])
@@ -0,0 +1,22 @@
+from unittest.mock import patch
+import gc
+import pytest
+
+from tally.services.strava import StravaService
+
+
+class TestStravaService:
+    @pytest.mark.filterwarnings("error::pytest.PytestUnraisableExceptionWarning")
+    def test_failed_browser_start_is_raised_alone(self):
+        """Test that cleaning up a service whose browser failed does not fail"""
+        with (
+            patch(
+                "tally.services.strava.webdriver.Chrome",
+                side_effect=Exception("Chrome not found"),
+            ),
+            patch("tally.services.strava.ChromeDriverManager"),
+            patch("tally.services.strava.Service"),
+        ):
+            with pytest.raises(Exception, match="Chrome not found"):
+                StravaService()
+        gc.collect()
@@ -0,0 +1,82 @@
+from unittest.mock import patch
+import threading
+import pytest
+
+from tally.services.rate_limiter import TokenBucket
+
+
+class FakeClock:
+    """Monotonic clock that only advances when the rate limiter sleeps"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_clock():
+    clock = FakeClock()
+    with (
+        patch("tally.services.rate_limiter.time.monotonic", clock.monotonic),
+        patch("tally.services.rate_limiter.time.sleep", clock.sleep),
+    ):
+        yield clock
+
+
+class TestTokenBucket:
+    def test_invalid_rate_or_capacity_raises(self):
+        """Test that the rate and capacity must allow at least one request"""
+        with pytest.raises(ValueError):
+            TokenBucket(0)
+        with pytest.raises(ValueError):
+            TokenBucket(10, capacity=0)
+
+    def test_first_request_does_not_wait(self, fake_clock):
+        """Test that a full bucket lets the first request through immediately"""
+        TokenBucket(12).acquire()
+
+        assert fake_clock.sleeps == []
+
+    def test_requests_are_spaced_by_the_rate(self, fake_clock):
+        """Test that requests after the first wait for the next token"""
+        rate_limiter = TokenBucket(12)
+
+        for _ in range(4):
+            rate_limiter.acquire()
+
+        assert fake_clock.now == pytest.approx(15)
+
+    def test_capacity_allows_a_burst(self, fake_clock):
+        """Test that a bucket with a larger capacity allows a burst of requests"""
+        rate_limiter = TokenBucket(60, capacity=3)
+
+        for _ in range(3):
+            rate_limiter.acquire()
+        assert fake_clock.now == 0
+        rate_limiter.acquire()
+
+        assert fake_clock.now == pytest.approx(1)
+
+    def test_shared_by_threads(self):
+        """Test that concurrent threads take one token each within the budget"""
+        rate_limiter = TokenBucket(6000, capacity=5)
+        acquired = []
+
+        def acquire():
+            rate_limiter.acquire()
+            acquired.append(1)
+
+        threads = [threading.Thread(target=acquire) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert len(acquired) == 10
@@ -14,7 +14,7 @@ from tests.tally.mocks.mock_club_feed import (
 
 
 class TestGetActivities:
-    @patch("tally.actions.track.activity.time.sleep")
+    @patch("tally.services.rate_limiter.time.sleep")
     def test_filter_out_activities_not_by_user_in_team(self, mock_sleep, mock_db):
         # Create a team with one user in the database
         team = create_team(id="team1", name="Test Team")
@@ -54,7 +54,7 @@ class TestGetActivities:
         # Verify that get_club_feed was called with the correct team id
         mock_strava_service.get_club_feed.assert_called_once_with("team1", None)
 
-    @patch("tally.actions.track.activity.time.sleep")
+    @patch("tally.services.rate_limiter.time.sleep")
     def test_include_activities_from_users_in_team(self, mock_sleep, mock_db):
         # Create a team with one user in the database
         team = create_team(id="team1", name="Test Team")
@@ -0,0 +1,77 @@
+from datetime import datetime, timezone
+
+from tally.actions.track.checkpoint import (
+    complete_track_checkpoint,
+    get_track_after_dates,
+    reset_track_checkpoints,
+    start_track_checkpoints,
+)
+from tally.models.db import TrackCheckpoint
+from tests.tally.mocks.mock_team import create_team
+
+
+CHALLENGE_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def save_teams():
+    for team_id in ["team1", "team2"]:
+        create_team(id=team_id, name=f"Team {team_id}").save(force_insert=True)
+
+
+class TestGetTrackAfterDates:
+    def test_untracked_teams_use_default(self, mock_db):
+        """Test that teams without a checkpoint are fetched back to the default"""
+        save_teams()
+
+        assert get_track_after_dates(["team1", "team2"], CHALLENGE_START) == {
+            "team1": CHALLENGE_START,
+            "team2": CHALLENGE_START,
+        }
+
+    def test_completed_team_uses_its_checkpoint(self, mock_db):
+        """Test that each team resumes from its own checkpoint"""
+        save_teams()
+        start_track_checkpoints(["team1", "team2"])
+        complete_track_checkpoint("team1", 1706745600)
+
+        after_dates = get_track_after_dates(["team1", "team2"], CHALLENGE_START)
+
+        assert after_dates == {
+            "team1": datetime(2024, 2, 1, tzinfo=timezone.utc),
+            "team2": CHALLENGE_START,
+        }
+        assert TrackCheckpoint.get_by_id("team2").status == "running"
+
+    def test_interrupted_run_keeps_previous_checkpoint(self, mock_db):
+        """Test that starting a run does not move the checkpoint of a team"""
+        save_teams()
+        complete_track_checkpoint("team1", 1706745600)
+        start_track_checkpoints(["team1"])
+
+        checkpoint = TrackCheckpoint.get_by_id("team1")
+        assert checkpoint.status == "running"
+        assert get_track_after_dates(["team1"], CHALLENGE_START) == {
+            "team1": datetime(2024, 2, 1, tzinfo=timezone.utc)
+        }
+
+    def test_checkpoint_never_moves_back(self, mock_db):
+        """Test that a feed without newer entries keeps the checkpoint"""
+        save_teams()
+        complete_track_checkpoint("team1", 1706745600)
+        complete_track_checkpoint("team1", None)
+        complete_track_checkpoint("team1", 1706000000)
+
+        assert TrackCheckpoint.get_by_id("team1").updated_at == 1706745600
+
+    def test_reset_checkpoints(self, mock_db):
+        """Test that reset teams are fetched back to the default again"""
+        save_teams()
+        complete_track_checkpoint("team1", 1706745600)
+        complete_track_checkpoint("team2", 1706745600)
+
+        reset_track_checkpoints(["team1"])
+
+        assert get_track_after_dates(["team1", "team2"], CHALLENGE_START) == {
+            "team1": CHALLENGE_START,
+            "team2": datetime(2024, 2, 1, tzinfo=timezone.utc),
+        }
@@ -0,0 +1,236 @@
+from unittest.mock import MagicMock
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List
+import threading
+import time
+import pytest
+
+from tally.actions.track.activity import (
+    FEED_PAGE_BUFFER_SIZE,
+    ClubFeedPage,
+    iterate_club_feed_pages,
+)
+from tally.services.strava import StravaService
+from tests.tally.mocks.mock_club_feed import (
+    create_cursor_data,
+    create_feed_response_pagination,
+    create_feed_response,
+    create_feed_activity,
+    create_feed_entry_single_activity,
+)
+
+
+def create_club_feed(club_id: str, cursor: str | None):
+    return create_feed_response(
+        entries=[
+            create_feed_entry_single_activity(
+                activity=create_feed_activity(id=f"{club_id}-{cursor}")
+            )
+        ]
+    )
+
+
+def get_club_activity_ids(pages: Iterable[ClubFeedPage]) -> Dict[str, List[str]]:
+    club_activity_ids = {}
+    for page in pages:
+        club_activity_ids.setdefault(page.club_id, []).extend(
+            activity.id for activity in page.activities
+        )
+    return club_activity_ids
+
+
+AFTER_DATE = datetime.now(timezone.utc)
+
+
+class TestIterateClubFeedPages:
+    def test_returns_feed_activities_by_club(self):
+        """Test that the activities of each club are kept separate"""
+        mock_strava_service = MagicMock(spec=StravaService)
+        mock_strava_service.get_club_feed.side_effect = create_club_feed
+
+        result = iterate_club_feed_pages(
+            mock_strava_service,
+            dict.fromkeys(["club1", "club2", "club3"], AFTER_DATE),
+            requests_per_minute=60000,
+        )
+
+        assert get_club_activity_ids(result) == {
+            "club1": ["club1-None"],
+            "club2": ["club2-None"],
+            "club3": ["club3-None"],
+        }
+
+    def test_fetches_clubs_concurrently(self):
+        """Test that club feeds are requested at the same time"""
+        mock_strava_service = MagicMock(spec=StravaService)
+        barrier = threading.Barrier(3, timeout=5)
+
+        def get_club_feed(club_id: str, cursor: str | None):
+            # Only returns once all three clubs are being fetched
+            barrier.wait()
+            return create_club_feed(club_id, cursor)
+
+        mock_strava_service.get_club_feed.side_effect = get_club_feed
+
+        result = iterate_club_feed_pages(
+            mock_strava_service,
+            dict.fromkeys(["club1", "club2", "club3"], AFTER_DATE),
+            requests_per_minute=60000,
+        )
+
+        assert sorted(page.club_id for page in result) == [
+            "club1",
+            "club2",
+            "club3",
+        ]
+
+    def test_requests_share_the_rate_limit(self):
+        """Test that requests of all clubs are spaced by one rate limiter"""
+        mock_strava_service = MagicMock(spec=StravaService)
+        request_times = []
+
+        def get_club_feed(club_id: str, cursor: str | None):
+            request_times.append(time.monotonic())
+            return create_club_feed(club_id, cursor)
+
+        mock_strava_service.get_club_feed.side_effect = get_club_feed
+
+        list(
+            iterate_club_feed_pages(
+                mock_strava_service,
+                dict.fromkeys(["club1", "club2", "club3", "club4"], AFTER_DATE),
+                requests_per_minute=1200,
+            )
+        )
+
+        request_times.sort()
+        intervals = [b - a for a, b in zip(request_times, request_times[1:])]
+        assert len(request_times) == 4
+        assert min(intervals) >= 0.04
+
+    def test_failed_club_raises(self):
+        """Test that a failure to fetch any club is raised"""
+        mock_strava_service = MagicMock(spec=StravaService)
+
+        def get_club_feed(club_id: str, cursor: str | None):
+            if club_id == "club2":
+                raise Exception(f"Failed to get activities for club {club_id}")
+            return create_club_feed(club_id, cursor)
+
+        mock_strava_service.get_club_feed.side_effect = get_club_feed
+
+        with pytest.raises(Exception, match="club2"):
+            list(
+                iterate_club_feed_pages(
+                    mock_strava_service,
+                    dict.fromkeys(["club1", "club2", "club3"], AFTER_DATE),
+                    requests_per_minute=60000,
+                )
+            )
+
+    def test_each_club_stops_at_its_own_after_date(self):
+        """Test that pagination of a club stops once it reaches its after date"""
+        mock_strava_service = MagicMock(spec=StravaService)
+        now = int(AFTER_DATE.timestamp())
+
+        def get_club_feed(club_id: str, cursor: int | None):
+            page = 0 if cursor is None else (now - cursor) // 100
+            return create_feed_response(
+                entries=[
+                    create_feed_entry_single_activity(
+                        cursor_data=create_cursor_data(
+                            updated_at=now - 100 * (page + 1)
+                        ),
+                        activity=create_feed_activity(id=f"{club_id}-{page}"),
+                    )
+                ],
+                pagination=create_feed_response_pagination(has_more=True),
+            )
+
+        mock_strava_service.get_club_feed.side_effect = get_club_feed
+
+        result = iterate_club_feed_pages(
+            mock_strava_service,
+            {
+                "club1": datetime.fromtimestamp(now - 150, timezone.utc),
+                "club2": datetime.fromtimestamp(now - 350, timezone.utc),
+            },
+            requests_per_minute=60000,
+        )
+
+        pages = list(result)
+        assert get_club_activity_ids(pages) == {
+            "club1": ["club1-0", "club1-1"],
+            "club2": ["club2-0", "club2-1", "club2-2", "club2-3"],
+        }
+        club2_pages = [page for page in pages if page.club_id == "club2"]
+        assert [page.updated_at for page in club2_pages] == [
+            now - 100,
+            now - 200,
+            now - 300,
+            now - 400,
+        ]
+        # Only the last page of each club has no next cursor
+        assert [page.next_cursor for page in club2_pages] == [
+            now - 100,
+            now - 200,
+            now - 300,
+            None,
+        ]
+
+    def test_resumes_clubs_from_their_cursor(self):
+        """Test that a club with a cursor starts from that page"""
+        mock_strava_service = MagicMock(spec=StravaService)
+        mock_strava_service.get_club_feed.side_effect = create_club_feed
+
+        result = iterate_club_feed_pages(
+            mock_strava_service,
+            dict.fromkeys(["club1", "club2"], AFTER_DATE),
+            requests_per_minute=60000,
+            club_cursors={"club2": 1706745600},
+        )
+
+        assert get_club_activity_ids(result) == {
+            "club1": ["club1-None"],
+            "club2": ["club2-1706745600"],
+        }
+
+    def test_fetching_pauses_while_the_buffer_is_full(self):
+        """Test that no more pages are fetched than the buffer can hold"""
+        mock_strava_service = MagicMock(spec=StravaService)
+        now = int(AFTER_DATE.timestamp())
+        page_count = 3 * FEED_PAGE_BUFFER_SIZE
+
+        def get_club_feed(club_id: str, cursor: int | None):
+            page = 0 if cursor is None else now - cursor
+            return create_feed_response(
+                entries=[
+                    create_feed_entry_single_activity(
+                        cursor_data=create_cursor_data(updated_at=now - page - 1),
+                        activity=create_feed_activity(id=f"{club_id}-{page}"),
+                    )
+                ],
+                pagination=create_feed_response_pagination(
+                    has_more=page + 1 < page_count
+                ),
+            )
+
+        mock_strava_service.get_club_feed.side_effect = get_club_feed
+
+        result = iterate_club_feed_pages(
+            mock_strava_service,
+            {"club1": datetime.fromtimestamp(now - page_count, timezone.utc)},
+            requests_per_minute=60000,
+        )
+        first_page = next(result)
+        # Give the fetching thread time to fill the buffer
+        time.sleep(0.3)
+        fetched_page_count = mock_strava_service.get_club_feed.call_count
+        remaining_pages = list(result)
+
+        assert first_page.activities[0].id == "club1-0"
+        # The buffered pages, the page consumed and the page waiting to be
+        # buffered
+        assert fetched_page_count <= FEED_PAGE_BUFFER_SIZE + 2
+        assert len(remaining_pages) == page_count - 1
+        assert remaining_pages[-1].is_last
@@ -0,0 +1,127 @@
+from unittest.mock import MagicMock
+from datetime import datetime, timezone
+
+from tally.actions.track.activity import iterate_club_feed_pages_in_batches
+from tally.services.strava import StravaService
+from tests.tally.mocks.mock_club_feed import (
+    create_cursor_data,
+    create_feed_response,
+    create_feed_response_pagination,
+    create_feed_activity,
+    create_feed_entry_single_activity,
+)
+
+
+AFTER_DATE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def create_club_feed_page(club_id: str, page: int, has_more: bool):
+    return create_feed_response(
+        entries=[
+            create_feed_entry_single_activity(
+                cursor_data=create_cursor_data(
+                    updated_at=int(AFTER_DATE.timestamp()) + 1000 - page
+                ),
+                activity=create_feed_activity(id=f"{club_id}-{page}"),
+            )
+        ],
+        pagination=create_feed_response_pagination(has_more=has_more),
+    )
+
+
+class TestIterateClubFeedPagesInBatches:
+    def test_fetches_next_pages_of_clubs_together(self):
+        """Test that each round requests the next page of every unfinished club"""
+        page_counts = {"club1": 3, "club2": 1, "club3": 2}
+        requested_pages = []
+
+        def get_club_feeds(feed_pages):
+            requested_pages.append(feed_pages)
+            feeds = []
+            for club_id, cursor in feed_pages:
+                page = sum(
+                    1
+                    for pages in requested_pages
+                    for page in pages
+                    if page[0] == club_id
+                )
+                feeds.append(
+                    create_club_feed_page(club_id, page, page < page_counts[club_id])
+                )
+            return feeds
+
+        mock_strava_service = MagicMock(spec=StravaService)
+        mock_strava_service.get_club_feeds.side_effect = get_club_feeds
+
+        result = iterate_club_feed_pages_in_batches(
+            mock_strava_service,
+            dict.fromkeys(["club1", "club2", "club3"], AFTER_DATE),
+            requests_per_minute=60000,
+        )
+
+        assert [
+            (page.club_id, [activity.id for activity in page.activities])
+            for page in result
+        ] == [
+            ("club1", ["club1-1"]),
+            ("club2", ["club2-1"]),
+            ("club3", ["club3-1"]),
+            ("club1", ["club1-2"]),
+            ("club3", ["club3-2"]),
+            ("club1", ["club1-3"]),
+        ]
+        assert [[club_id for club_id, _ in pages] for pages in requested_pages] == [
+            ["club1", "club2", "club3"],
+            ["club1", "club3"],
+            ["club1"],
+        ]
+        # Later pages continue from the cursor of the previous page
+        assert requested_pages[0][0][1] is None
+        assert requested_pages[1][0][1] == int(AFTER_DATE.timestamp()) + 999
+
+    def test_batches_are_limited_in_size(self):
+        """Test that no more than MAX_CONCURRENT_CLUB_FEEDS pages are batched"""
+        club_ids = [f"club{index}" for index in range(10)]
+        batch_sizes = []
+
+        def get_club_feeds(feed_pages):
+            batch_sizes.append(len(feed_pages))
+            return [
+                create_club_feed_page(club_id, 1, False) for club_id, _ in feed_pages
+            ]
+
+        mock_strava_service = MagicMock(spec=StravaService)
+        mock_strava_service.get_club_feeds.side_effect = get_club_feeds
+
+        result = iterate_club_feed_pages_in_batches(
+            mock_strava_service,
+            dict.fromkeys(club_ids, AFTER_DATE),
+            requests_per_minute=60000,
+        )
+
+        assert sorted(page.club_id for page in result) == sorted(club_ids)
+        assert batch_sizes == [4, 4, 2]
+
+    def test_resumes_clubs_from_their_cursor(self):
+        """Test that the first page of a club with a cursor is requested from it"""
+        requested_pages = []
+
+        def get_club_feeds(feed_pages):
+            requested_pages.extend(feed_pages)
+            return [
+                create_club_feed_page(club_id, 1, False) for club_id, _ in feed_pages
+            ]
+
+        mock_strava_service = MagicMock(spec=StravaService)
+        mock_strava_service.get_club_feeds.side_effect = get_club_feeds
+
+        list(
+            iterate_club_feed_pages_in_batches(
+                mock_strava_service,
+                dict.fromkeys(["club1", "club2"], AFTER_DATE),
+                requests_per_minute=60000,
+                club_cursors={"club2": 1706745600},
+            )
+        )
+
+        assert requested_pages == [("club1", None), ("club2", 1706745600)]
@@ -0,0 +1,61 @@
+from datetime import datetime, timezone
+
+from tally.actions.track.checkpoint import (
+    complete_track_checkpoint,
+    get_track_after_dates,
+    get_track_cursors,
+    save_track_checkpoint_page,
+    start_track_checkpoints,
+)
+from tally.models.db import TrackCheckpoint
+from tests.tally.mocks.mock_team import create_team
+
+
+CHALLENGE_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def save_teams():
+    for team_id in ["team1", "team2"]:
+        create_team(id=team_id, name=f"Team {team_id}").save(force_insert=True)
+
+
+class TestSaveTrackCheckpointPage:
+    def test_interrupted_team_resumes_from_its_cursor(self, mock_db):
+        """Test that the cursor of the next page is kept for the next run"""
+        save_teams()
+        start_track_checkpoints(["team1", "team2"])
+        save_track_checkpoint_page("team1", 1706745600, 1706700000)
+
+        assert get_track_cursors(["team1", "team2"]) == {"team1": 1706700000}
+        # The remaining pages are still fetched back to the previous checkpoint
+        assert get_track_after_dates(["team1"], CHALLENGE_START) == {
+            "team1": CHALLENGE_START
+        }
+        checkpoint = TrackCheckpoint.get_by_id("team1")
+        assert checkpoint.status == "running"
+        assert checkpoint.updated_at is None
+
+    def test_cursor_is_kept_when_the_next_run_starts(self, mock_db):
+        """Test that starting a run does not reset the progress of a team"""
+        save_teams()
+        start_track_checkpoints(["team1"])
+        save_track_checkpoint_page("team1", 1706745600, 1706700000)
+
+        start_track_checkpoints(["team1"])
+
+        assert get_track_cursors(["team1"]) == {"team1": 1706700000}
+
+    def test_completion_uses_the_highest_page_updated_at(self, mock_db):
+        """Test that the first page of an interrupted run moves the checkpoint"""
+        save_teams()
+        start_track_checkpoints(["team1"])
+        save_track_checkpoint_page("team1", 1706745600, 1706700000)
+        save_track_checkpoint_page("team1", 1706700000, 1706600000)
+
+        # The last page is older than the first page of the interrupted run
+        complete_track_checkpoint("team1", 1706600000)
+
+        checkpoint = TrackCheckpoint.get_by_id("team1")
+        assert checkpoint.updated_at == 1706745600
+        assert checkpoint.status == "complete"
+        assert get_track_cursors(["team1"]) == {}
@@ -0,0 +1,227 @@
+from unittest.mock import MagicMock, patch
+from datetime import datetime, timezone
+import threading
+import time
+import pytest
+
+from tally.actions.track.track import track
+from tally.models.db import Activity, Config, TrackCheckpoint
+from tally.actions.track.checkpoint import (
+    save_track_checkpoint_page,
+    start_track_checkpoints,
+)
+from tests.tally.mocks.mock_config import create_config
+from tests.tally.mocks.mock_team import create_team
+from tests.tally.mocks.mock_user import create_user
+from tests.tally.mocks.mock_club_feed import (
+    create_athlete,
+    create_cursor_data,
+    create_feed_activity,
+    create_feed_entry_single_activity,
+    create_feed_response,
+    create_feed_response_pagination,
+)
+
+
+UPDATED_AT = int(datetime(2024, 1, 10, tzinfo=timezone.utc).timestamp())
+
+
+def create_team_feed(club_id: str, cursor: int | None):
+    return create_feed_response(
+        entries=[
+            create_feed_entry_single_activity(
+                cursor_data=create_cursor_data(updated_at=UPDATED_AT),
+                activity=create_feed_activity(
+                    id=f"{club_id}-activity",
+                    athlete=create_athlete(athlete_id=f"{club_id}-user"),
+                    start_date="2024-01-09T10:00:00Z",
+                ),
+            )
+        ]
+    )
+
+
+@pytest.fixture
+def init_challenge(mock_db):
+    config = create_config(start_date="2024-01-01")
+    config.requests_per_minute = 60000
+    config.save(force_insert=True)
+    for team_id in ["team1", "team2"]:
+        create_team(id=team_id, name=f"Team {team_id}").save(force_insert=True)
+        create_user(id=f"{team_id}-user", name=team_id, team=team_id).save(
+            force_insert=True
+        )
+    yield
+
+
+@pytest.fixture
+def mock_strava_service():
+    strava_service = MagicMock()
+    strava_service.fetch_mode = "http"
+    with (
+        patch("tally.actions.track.track.StravaService", return_value=strava_service),
+        patch("tally.actions.track.track.backup_db"),
+        patch("tally.actions.track.track.update_daily_scores"),
+    ):
+        yield strava_service
+
+
+class TestTrack:
+    def test_saves_activities_and_checkpoints_per_team(
+        self, mock_db, init_challenge, mock_strava_service
+    ):
+        """Test that every team is saved with a completed checkpoint"""
+        mock_strava_service.get_club_feed.side_effect = create_team_feed
+
+        track()
+
+        assert sorted(activity.id for activity in Activity.select()) == [
+            "team1-activity",
+            "team2-activity",
+        ]
+        assert {
+            checkpoint.team_id: (checkpoint.updated_at, checkpoint.status)
+            for checkpoint in TrackCheckpoint.select()
+        } == {
+            "team1": (UPDATED_AT, "complete"),
+            "team2": (UPDATED_AT, "complete"),
+        }
+
+    def test_interrupted_run_keeps_finished_teams(
+        self, mock_db, init_challenge, mock_strava_service
+    ):
+        """Test that teams fetched before a failure are saved and checkpointed"""
+        team1_fetched = threading.Event()
+
+        def get_club_feed(club_id: str, cursor: int | None):
+            if club_id == "team2":
+                # Fail after the feed of team1 has been returned
+                team1_fetched.wait(timeout=5)
+                time.sleep(0.2)
+                raise Exception(f"Failed to get activities for club {club_id}")
+            team1_fetched.set()
+            return create_team_feed(club_id, cursor)
+
+        mock_strava_service.get_club_feed.side_effect = get_club_feed
+
+        with pytest.raises(Exception, match="team2"):
+            track()
+
+        assert [activity.id for activity in Activity.select()] == ["team1-activity"]
+        assert TrackCheckpoint.get_by_id("team1").status == "complete"
+        checkpoint = TrackCheckpoint.get_by_id("team2")
+        assert checkpoint.status == "running"
+        assert checkpoint.updated_at is None
+
+    def test_saves_each_page_before_the_next_one_fails(
+        self, mock_db, init_challenge, mock_strava_service
+    ):
+        """Test that pages saved before a failure in the same team are kept"""
+
+        def get_club_feed(club_id: str, cursor: int | None):
+            if cursor is not None:
+                raise Exception(f"Failed to get activities for club {club_id}")
+            return create_feed_response(
+                entries=create_team_feed(club_id, cursor).entries,
+                pagination=create_feed_response_pagination(has_more=True),
+            )
+
+        mock_strava_service.get_club_feed.side_effect = get_club_feed
+
+        with pytest.raises(Exception, match="Failed to get activities"):
+            track()
+
+        # The first page of at least one team was saved with its progress
+        checkpoints = {
+            checkpoint.team_id: checkpoint
+            for checkpoint in TrackCheckpoint.select().where(
+                TrackCheckpoint.cursor.is_null(False)
+            )
+        }
+        assert checkpoints
+        assert sorted(activity.id for activity in Activity.select()) == sorted(
+            f"{team_id}-activity" for team_id in checkpoints
+        )
+        for checkpoint in checkpoints.values():
+            assert checkpoint.cursor == UPDATED_AT
+            assert checkpoint.run_updated_at == UPDATED_AT
+            assert checkpoint.status == "running"
+
+    def test_resumes_interrupted_team_from_its_cursor(
+        self, mock_db, init_challenge, mock_strava_service
+    ):
+        """Test that an interrupted team continues from the page it stopped at"""
+        start_track_checkpoints(["team1", "team2"])
+        save_track_checkpoint_page("team1", UPDATED_AT, UPDATED_AT - 100)
+        requested_pages = []
+
+        def get_club_feed(club_id: str, cursor: int | None):
+            requested_pages.append((club_id, cursor))
+            return create_team_feed(club_id, cursor)
+
+        mock_strava_service.get_club_feed.side_effect = get_club_feed
+
+        track()
+
+        assert sorted(requested_pages, key=str) == [
+            ("team1", UPDATED_AT - 100),
+            ("team2", None),
+        ]
+        checkpoint = TrackCheckpoint.get_by_id("team1")
+        assert checkpoint.status == "complete"
+        assert checkpoint.updated_at == UPDATED_AT
+        assert checkpoint.cursor is None
+
+    def test_uses_the_fetch_mode_of_the_config(
+        self, mock_db, init_challenge, mock_strava_service
+    ):
+        """Test that the script fetch mode of the config batches the feeds"""
+        Config.update(strava_fetch_mode="script").execute()
+        mock_strava_service.fetch_mode = "script"
+        mock_strava_service.get_club_feeds.side_effect = lambda feed_pages: [
+            create_team_feed(club_id, cursor) for club_id, cursor in feed_pages
+        ]
+
+        with patch(
+            "tally.actions.track.track.StravaService",
+            return_value=mock_strava_service,
+        ) as strava_service_class:
+            track()
+
+        assert strava_service_class.call_args.kwargs["fetch_mode"] == "script"
+        mock_strava_service.get_club_feed.assert_not_called()
+        assert sorted(activity.id for activity in Activity.select()) == [
+            "team1-activity",
+            "team2-activity",
+        ]
+
+    def test_failed_save_stops_fetching(
+        self, mock_db, init_challenge, mock_strava_service
+    ):
+        """Test that the fetching threads stop when saving a page fails"""
+
+        def get_club_feed(club_id: str, cursor: int | None):
+            # Feeds that never end, so only stopping the threads ends them
+            return create_feed_response(
+                entries=create_team_feed(club_id, cursor).entries,
+                pagination=create_feed_response_pagination(has_more=True),
+            )
+
+        mock_strava_service.get_club_feed.side_effect = get_club_feed
+
+        with (
+            patch(
+                "tally.actions.track.track.save_team_activities",
+                side_effect=Exception("Failed to save activities"),
+            ),
+            pytest.raises(Exception, match="Failed to save") as exc_info,
+        ):
+            track()
+
+        # The traceback still references the pages of the failed run
+        assert exc_info.traceback
+        assert not [
+            thread
+            for thread in threading.enumerate()
+            if thread.name.startswith("ThreadPoolExecutor")
+        ]
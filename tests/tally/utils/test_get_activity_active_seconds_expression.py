@@ -0,0 +1,122 @@
+import datetime
+import pytest
+
+from tally.actions.score.materialized_score import (
+    get_materialized_team_cumulative_score,
+    rebuild_daily_scores,
+)
+from tally.actions.score.point_schedule import PointSchedule, PointScheduleRules
+from tally.actions.score.score_config import ScoreConfig
+from tally.actions.score.score_index import build_score_index
+from tally.actions.score.streaming_score import get_streaming_team_cumulative_score
+from tally.actions.score.team_score import (
+    get_team_cumulative_score,
+    get_team_daily_score,
+)
+from tally.actions.score.user_active_time import get_user_active_time
+from tally.actions.score.user_score import get_user_daily_score
+from tally.actions.score.vectorized_score import get_aggregated_team_cumulative_score
+from tally.models.db import Activity, Config, Team, User
+from tally.utils.activity import get_activity_active_seconds_expression
+from tests.tally.mocks.mock_activity import create_activity
+from tests.tally.mocks.mock_config import create_config
+from tests.tally.mocks.mock_team import create_team
+from tests.tally.mocks.mock_user import create_user
+
+
+START_DATE = datetime.date(2023, 1, 1)
+END_DATE = datetime.date(2023, 1, 7)
+
+
+@pytest.fixture
+def init_challenge(mock_db):
+    create_config(start_date=START_DATE.isoformat()).save(force_insert=True)
+    create_team(id="team1", name="Team 1").save(force_insert=True)
+    create_user(id="user1", name="Alice", team="team1").save(force_insert=True)
+    create_activity(
+        id="activity1",
+        user="user1",
+        start_time="2023-01-02T10:00:00+00:00",
+        elapsed_seconds=7200,
+        moving_seconds=3600,
+        workout_type="Run",
+    ).save(force_insert=True)
+    create_activity(
+        id="activity2",
+        user="user1",
+        start_time="2023-01-02T10:30:00+00:00",
+        elapsed_seconds=3600,
+        workout_type="Yoga",
+    ).save(force_insert=True)
+    # Activities saved before active seconds were stored have none
+    Activity.update(active_seconds=None).execute()
+    yield
+
+
+class TestGetActivityActiveSecondsExpression:
+    def test_calculates_missing_active_seconds(self, mock_db, init_challenge):
+        """Test that activities without stored active seconds are calculated"""
+        active_seconds = dict(
+            Activity.select(Activity.id, get_activity_active_seconds_expression())
+            .order_by(Activity.id)
+            .tuples()
+        )
+
+        assert active_seconds == {"activity1": 3600, "activity2": 3600}
+
+    def test_stored_active_seconds_are_used(self, mock_db, init_challenge):
+        """Test that stored active seconds take precedence"""
+        Activity.update(active_seconds=60).where(Activity.id == "activity2").execute()
+
+        active_seconds = dict(
+            Activity.select(Activity.id, get_activity_active_seconds_expression())
+            .order_by(Activity.id)
+            .tuples()
+        )
+
+        assert active_seconds == {"activity1": 3600, "activity2": 60}
+
+    @pytest.mark.parametrize("overlap_mode", ["flag", "clip"])
+    def test_engines_agree_without_stored_active_seconds(
+        self, mock_db, init_challenge, overlap_mode
+    ):
+        """Test that the SQL engines score the activities like the object pipeline"""
+        users = list(User.select(User, Team).join(Team))
+        config = ScoreConfig(
+            START_DATE,
+            END_DATE,
+            "UTC",
+            PointSchedule(PointScheduleRules(overlap_mode=overlap_mode)),
+        )
+        expected = get_team_cumulative_score(
+            get_team_daily_score(
+                get_user_daily_score(
+                    get_user_active_time(Activity.select(), config),
+                    config.point_schedule,
+                ),
+                users,
+                config.point_schedule,
+            ),
+            users,
+        )[0].points
+        assert expected > 0
+
+        challenge_config: Config = Config.select().first()
+        rebuild_daily_scores(challenge_config)
+        assert {
+            "aggregated": get_aggregated_team_cumulative_score(users, config)[0].points,
+            "streaming": get_streaming_team_cumulative_score(users, config)[0].points,
+        } == {"aggregated": expected, "streaming": expected}
+        if overlap_mode == "flag":
+            # The challenge point schedule is the default one, with flagged
+            # overlaps
+            assert (
+                get_materialized_team_cumulative_score(users, config)[0].points
+                == expected
+            )
+            assert (
+                build_score_index(challenge_config)
+                .get_team_cumulative_score(START_DATE, END_DATE)[0]
+                .points
+                == expected
+            )
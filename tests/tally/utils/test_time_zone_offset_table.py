@@ -0,0 +1,91 @@
+import datetime
+import numpy as np
+import pytest
+import pytz
+
+from tally.utils.time_zone import TimeZoneOffsetTable
+
+
+TIME_ZONES = [
+    "UTC",
+    "America/Los_Angeles",
+    "Europe/London",
+    "Australia/Lord_Howe",
+    "America/Havana",
+]
+
+
+def get_pytz_local_date(timestamp: int, time_zone: str) -> datetime.date:
+    return datetime.datetime.fromtimestamp(timestamp, pytz.timezone(time_zone)).date()
+
+
+def get_sample_timestamps() -> np.ndarray:
+    start = int(datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc).timestamp())
+    end = int(datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc).timestamp())
+    return np.arange(start, end, 1800 + 7, dtype=np.int64)
+
+
+class TestTimeZoneOffsetTable:
+    @pytest.mark.parametrize("time_zone", TIME_ZONES)
+    def test_local_date_matches_pytz(self, time_zone):
+        """Test local dates over a year of timestamps against pytz"""
+        table = TimeZoneOffsetTable(time_zone)
+
+        for timestamp in get_sample_timestamps()[::5].tolist():
+            assert table.get_local_date(timestamp) == get_pytz_local_date(
+                timestamp, time_zone
+            )
+
+    @pytest.mark.parametrize("time_zone", TIME_ZONES)
+    def test_local_day_numbers_match_scalar(self, time_zone):
+        """Test that the array conversion matches the scalar conversion"""
+        table = TimeZoneOffsetTable(time_zone)
+        timestamps = get_sample_timestamps()
+
+        day_numbers = table.get_local_day_numbers(timestamps)
+
+        assert day_numbers.tolist() == [
+            table.get_local_day_number(timestamp) for timestamp in timestamps.tolist()
+        ]
+
+    def test_local_date_at_transition(self):
+        """Test timestamps on either side of a daylight saving time change"""
+        table = TimeZoneOffsetTable("America/Los_Angeles")
+        # 2023-11-05 01:59:59 PDT is followed by 01:00:00 PST
+        transition = int(
+            datetime.datetime(2023, 11, 5, 9, tzinfo=datetime.timezone.utc).timestamp()
+        )
+
+        assert table.get_utc_offset(transition - 1) == -7 * 3600
+        assert table.get_utc_offset(transition) == -8 * 3600
+        # 23:30 PST is still on the 5th, which is 07:30 UTC on the 6th
+        assert table.get_local_date(transition + 22.5 * 3600) == datetime.date(
+            2023, 11, 5
+        )
+
+    @pytest.mark.parametrize("time_zone", TIME_ZONES)
+    def test_start_of_day_matches_pytz(self, time_zone):
+        """Test the start of every day of a year against pytz localize"""
+        table = TimeZoneOffsetTable(time_zone)
+
+        for day in range(365):
+            date = datetime.date(2023, 1, 1) + datetime.timedelta(days=day)
+            expected = pytz.timezone(time_zone).localize(
+                datetime.datetime.combine(date, datetime.time.min)
+            )
+            result = table.get_start_of_day(date)
+
+            assert result == expected
+            assert str(result) == str(expected)
+
+    def test_transitions_are_limited_to_range(self):
+        """Test that transitions are returned for the requested range only"""
+        table = TimeZoneOffsetTable("Europe/London")
+        start = int(datetime.datetime(2023, 3, 1).timestamp())
+        end = int(datetime.datetime(2023, 5, 1).timestamp())
+
+        transitions = table.get_transitions(start, end)
+
+        assert transitions[0] == (start, 0)
+        assert [offset for _, offset in transitions] == [0, 3600]
+        assert all(start <= timestamp < end for timestamp, _ in transitions)